@@ -0,0 +1,3 @@
+"""
+Componentes compartidos por las suites de pruebas de integración y E2E.
+"""
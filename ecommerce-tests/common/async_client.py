@@ -0,0 +1,184 @@
+"""
+Cliente HTTP asíncrono (asyncio + aiohttp) compartido por las suites.
+
+Contraparte de http_client.SessionPool: mantiene una ClientSession por servicio
+de SERVICES_CONFIG con un límite de conexiones propio, de modo que un único
+proceso pueda mantener cientos de solicitudes en vuelo contra el API Gateway.
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import aiohttp
+
+from common.json_codec import loads
+
+# Valores por defecto de los límites de conexión por servicio
+DEFAULT_ASYNC_POOL_CONFIG = {
+    "limit_per_service": 100,
+    "service_limits": {},
+}
+
+
+class AsyncResponse:
+    """
+    Respuesta ya leída de una solicitud asíncrona.
+
+    Expone la misma interfaz básica que requests.Response (status_code, text,
+    headers, elapsed y json()) para que las aserciones existentes sigan
+    funcionando.
+    El JSON se decodifica una sola vez y se guarda en caché.
+    """
+
+    _NOT_DECODED = object()
+
+    def __init__(
+        self, status_code, headers, content, url, encoding="utf-8", elapsed=None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.encoding = encoding
+        # Igual que en requests: tiempo hasta recibir los headers de la respuesta
+        self.elapsed = elapsed or timedelta(0)
+        self._json = self._NOT_DECODED
+
+    @property
+    def text(self):
+        """Cuerpo de la respuesta decodificado como texto."""
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        """Cuerpo de la respuesta decodificado como JSON (en caché)."""
+        if self._json is self._NOT_DECODED:
+            self._json = loads(self.content)
+        return self._json
+
+
+class AsyncSessionPool:
+    """
+    Conjunto de sesiones aiohttp, una por servicio configurado.
+
+    Las sesiones quedan ligadas al event loop en el que se crean; si el loop
+    cambia (por ejemplo, entre pruebas de pytest-asyncio) se crean de nuevo.
+    """
+
+    def __init__(self, services_config, pool_config=None):
+        """
+        Args:
+            services_config (dict): SERVICES_CONFIG de la suite.
+            pool_config (dict, optional): Límites de conexión (ver DEFAULT_ASYNC_POOL_CONFIG).
+        """
+        self.services_config = services_config
+        self.pool_config = {**DEFAULT_ASYNC_POOL_CONFIG, **(pool_config or {})}
+        self._sessions = {}
+        self._locks = {}
+        self._loop = None
+
+    def connection_limit(self, service_name):
+        """
+        Obtiene el límite de conexiones simultáneas de un servicio.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+
+        Returns:
+            int: Número máximo de conexiones abiertas hacia el servicio.
+        """
+        return self.pool_config["service_limits"].get(
+            service_name, self.pool_config["limit_per_service"]
+        )
+
+    def _bind_loop(self):
+        """Descarta sesiones y locks creados en un event loop anterior."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._sessions = {}
+            self._locks = {}
+            self._loop = loop
+
+    def lock(self, name):
+        """
+        Obtiene un asyncio.Lock con nombre ligado al loop actual.
+
+        Args:
+            name (str): Nombre del lock (ej: 'auth').
+
+        Returns:
+            asyncio.Lock: Lock compartido por las corrutinas del loop.
+        """
+        self._bind_loop()
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[name] = lock
+        return lock
+
+    def session(self, service_name):
+        """
+        Obtiene la sesión asociada a un servicio en el loop actual.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+
+        Returns:
+            aiohttp.ClientSession: Sesión del servicio.
+        """
+        if service_name not in self.services_config:
+            raise ValueError(
+                f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(self.services_config.keys())}"
+            )
+
+        self._bind_loop()
+        session = self._sessions.get(service_name)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit(service_name))
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[service_name] = session
+        return session
+
+    async def request(self, service_name, method, url, timeout=None, **kwargs):
+        """
+        Realiza una solicitud usando la sesión del servicio y lee el cuerpo.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+            method (str): Método HTTP.
+            url (str): URL completa.
+            timeout (float | tuple, optional): Timeout total en segundos, o una
+                tupla (conexión, lectura) como en requests.
+            **kwargs: Argumentos adicionales para aiohttp.ClientSession.request.
+
+        Returns:
+            AsyncResponse: Respuesta con el cuerpo ya leído.
+        """
+        session = self.session(service_name)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            kwargs["timeout"] = aiohttp.ClientTimeout(
+                sock_connect=connect, sock_read=read
+            )
+        elif timeout:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        start = time.perf_counter()
+        async with session.request(method, url, **kwargs) as response:
+            elapsed = timedelta(seconds=time.perf_counter() - start)
+            content = await response.read()
+            return AsyncResponse(
+                response.status,
+                dict(response.headers),
+                content,
+                str(response.url),
+                response.charset or "utf-8",
+                elapsed,
+            )
+
+    async def close(self):
+        """Cierra todas las sesiones abiertas en el loop actual."""
+        sessions = self._sessions
+        self._sessions = {}
+        for session in sessions.values():
+            await session.close()
@@ -0,0 +1,219 @@
+"""
+Gestión del token JWT compartido entre procesos de prueba.
+
+El token se guarda en memoria y en un archivo de caché protegido con un lock
+de archivo, de modo que todos los workers de pytest-xdist reutilizan el mismo
+token y solo uno de ellos llama a /app/api/authenticate. El token se renueva
+antes de que expire según el claim `exp`.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from filelock import FileLock
+
+# Vigencia asumida para tokens sin claim `exp` (en segundos)
+DEFAULT_TOKEN_TTL = 300
+
+
+def decode_jwt_expiry(token):
+    """
+    Obtiene el instante de expiración (epoch) de un token JWT sin verificarlo.
+
+    Args:
+        token (str): Token JWT.
+
+    Returns:
+        float: Claim `exp` del token, o None si no se puede leer.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def default_cache_path(auth_endpoint, username, cache_dir=None):
+    """
+    Genera la ruta del archivo de caché para un endpoint y usuario.
+
+    Args:
+        auth_endpoint (str): URL de autenticación.
+        username (str): Usuario de prueba.
+        cache_dir (str, optional): Directorio de la caché. Por defecto, el temporal del sistema.
+
+    Returns:
+        str: Ruta del archivo de caché.
+    """
+    key = hashlib.sha1(f"{auth_endpoint}|{username}".encode()).hexdigest()[:12]
+    return os.path.join(
+        cache_dir or tempfile.gettempdir(), f"ecommerce-tests-jwt-{key}.json"
+    )
+
+
+class TokenManager:
+    """
+    Obtiene, cachea y renueva el token JWT de las pruebas.
+    """
+
+    def __init__(self, cache_path, refresh_margin=60, lock_timeout=60):
+        """
+        Args:
+            cache_path (str): Archivo de caché compartido entre procesos.
+            refresh_margin (float): Segundos antes de `exp` en los que se renueva el token.
+            lock_timeout (float): Espera máxima por el lock de archivo.
+        """
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self.authenticate_calls = 0
+        # thread_local=False: get_token_async() toma el lock en un hilo auxiliar
+        # y lo libera en el del event loop
+        self._file_lock = FileLock(
+            f"{cache_path}.lock", timeout=lock_timeout, thread_local=False
+        )
+        self._thread_lock = threading.Lock()
+        self._token = None
+        self._expires_at = None
+
+    def _is_fresh(self, expires_at):
+        """Indica si un token con esa expiración puede usarse todavía."""
+        return expires_at is not None and time.time() < expires_at - self.refresh_margin
+
+    def _read_cache(self):
+        """Lee el token del archivo de caché si existe y sigue vigente."""
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return False
+
+        if not self._is_fresh(cached.get("expires_at")):
+            return False
+
+        self._token = cached["token"]
+        self._expires_at = cached["expires_at"]
+        return True
+
+    def _store(self, token):
+        """Guarda un token nuevo en memoria y en el archivo de caché."""
+        expires_at = decode_jwt_expiry(token) or time.time() + DEFAULT_TOKEN_TTL
+        self._token = token
+        self._expires_at = expires_at
+
+        # mkstemp crea un archivo nuevo con nombre impredecible y permisos 0600:
+        # en un directorio compartido como /tmp nadie puede anticiparlo
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self.cache_path) or ".",
+            prefix=f"{os.path.basename(self.cache_path)}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                json.dump({"token": token, "expires_at": expires_at}, cache_file)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _acquire_locks(self):
+        """Toma el lock de hilos y el de archivo, en ese orden."""
+        self._thread_lock.acquire()
+        try:
+            self._file_lock.acquire()
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def _release_locks(self):
+        """Libera los locks tomados con _acquire_locks()."""
+        self._file_lock.release()
+        self._thread_lock.release()
+
+    async def _acquire_locks_async(self):
+        """Toma los locks en un hilo auxiliar, sin bloquear el event loop."""
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire_locks))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # El hilo sigue esperando: si llega a tomar los locks, se liberan
+            acquiring.add_done_callback(
+                lambda done: done.cancelled()
+                or done.exception() is not None
+                or self._release_locks()
+            )
+            raise
+
+    def get_token(self, authenticate):
+        """
+        Devuelve un token vigente, autenticándose solo si hace falta.
+
+        Args:
+            authenticate (callable): Función sin argumentos que llama al
+                endpoint de autenticación y devuelve el token.
+
+        Returns:
+            str: Token JWT.
+        """
+        if self._is_fresh(self._expires_at):
+            return self._token
+
+        with self._thread_lock, self._file_lock:
+            if self._is_fresh(self._expires_at) or self._read_cache():
+                return self._token
+
+            self.authenticate_calls += 1
+            self._store(authenticate())
+            return self._token
+
+    async def get_token_async(self, authenticate, lock):
+        """
+        Versión asíncrona de get_token().
+
+        Como en get_token(), el lock de archivo se mantiene durante la
+        autenticación para que solo un proceso llame al endpoint; la espera
+        por el lock ocurre en un hilo auxiliar para no bloquear el event loop.
+
+        Args:
+            authenticate (callable): Corrutina sin argumentos que devuelve el token.
+            lock (asyncio.Lock): Lock que evita autenticaciones simultáneas en el loop.
+
+        Returns:
+            str: Token JWT.
+        """
+        if self._is_fresh(self._expires_at):
+            return self._token
+
+        async with lock:
+            if self._is_fresh(self._expires_at) or self._read_cache():
+                return self._token
+
+            await self._acquire_locks_async()
+            try:
+                # Otro proceso pudo autenticarse mientras se esperaba el lock
+                if self._is_fresh(self._expires_at) or self._read_cache():
+                    return self._token
+
+                self.authenticate_calls += 1
+                self._store(await authenticate())
+                return self._token
+            finally:
+                self._release_locks()
+
+    def invalidate(self):
+        """Descarta el token en memoria y en la caché compartida."""
+        with self._thread_lock, self._file_lock:
+            self._token = None
+            self._expires_at = None
+            try:
+                os.remove(self.cache_path)
+            except FileNotFoundError:
+                pass
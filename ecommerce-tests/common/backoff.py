@@ -0,0 +1,30 @@
+"""
+Cálculo de esperas con backoff exponencial y jitter.
+"""
+
+import random
+
+
+def exponential_backoff(attempt, base_delay, max_delay, factor=2.0, jitter=True):
+    """
+    Calcula la espera antes del siguiente intento.
+
+    Con jitter se usa "equal jitter": la espera se elige al azar entre la mitad
+    y el total del valor exponencial, lo que evita que varios clientes
+    reintenten en el mismo instante sin acortar demasiado la espera mínima.
+
+    Args:
+        attempt (int): Número de intento fallido, empezando en 0.
+        base_delay (float): Espera del primer reintento en segundos.
+        max_delay (float): Espera máxima en segundos.
+        factor (float): Multiplicador aplicado en cada intento.
+        jitter (bool): Si se aplica aleatoriedad a la espera.
+
+    Returns:
+        float: Segundos a esperar.
+    """
+    # Se limita el exponente para evitar desbordamientos en intentos muy altos
+    delay = min(max_delay, base_delay * factor ** min(attempt, 32))
+    if jitter:
+        delay = random.uniform(delay / 2, delay)
+    return delay
@@ -0,0 +1,84 @@
+"""
+Envío concurrente de lotes de solicitudes independientes.
+
+Permite que una prueba cree o consulte varios recursos en una sola ventana de
+ida y vuelta en lugar de hacerlo uno tras otro. Las respuestas se devuelven en
+el mismo orden que las solicitudes y los errores se informan por elemento.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from common.context import submit_in_context
+
+# Solicitudes simultáneas por defecto de un lote
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+class BatchRequestError(Exception):
+    """
+    Error de un lote en el que al menos una solicitud lanzó una excepción.
+
+    Attributes:
+        results (list): Respuesta de cada solicitud, o la excepción que lanzó.
+        errors (dict): {índice: excepción} de las solicitudes fallidas.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        details = ", ".join(f"#{index}: {error!r}" for index, error in errors.items())
+        super().__init__(
+            f"{len(errors)} de {len(results)} solicitudes del lote fallaron ({details})"
+        )
+
+
+def _call(make_request, request):
+    """Ejecuta una solicitud del lote dada como dict o como tupla."""
+    if isinstance(request, dict):
+        return make_request(**request)
+    return make_request(*request)
+
+
+def run_many(make_request, requests, max_concurrency=None, raise_on_error=True):
+    """
+    Ejecuta un lote de solicitudes en paralelo conservando el orden.
+
+    Cada solicitud puede ser un dict con los argumentos de make_request()
+    ({"method": "POST", "endpoint": "/api/carts", "data": {...}}) o una tupla
+    posicional (método, endpoint[, data]). Las solicitudes sin service_name
+    usan el servicio actual del hilo que llama.
+
+    Args:
+        make_request (callable): make_request() de la suite.
+        requests (list): Solicitudes del lote.
+        max_concurrency (int, optional): Solicitudes simultáneas como máximo.
+        raise_on_error (bool): Si es True, lanza BatchRequestError cuando
+            alguna solicitud falla; si es False, la excepción ocupa su posición.
+
+    Returns:
+        list: Respuestas en el mismo orden que `requests`.
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+
+    workers = max(1, min(max_concurrency or DEFAULT_BATCH_CONCURRENCY, len(requests)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            submit_in_context(executor, _call, make_request, request)
+            for request in requests
+        ]
+
+    results = []
+    errors = {}
+    for index, future in enumerate(futures):
+        error = future.exception()
+        if error is not None:
+            errors[index] = error
+            results.append(error)
+        else:
+            results.append(future.result())
+
+    if errors and raise_on_error:
+        raise BatchRequestError(results, errors)
+    return results
@@ -0,0 +1,222 @@
+"""
+Índices hash sobre colecciones para aserciones de pertenencia y diferencias.
+
+En lugar de construir listas de IDs y comprobar `id in lista` (O(n·m)), la
+colección se indexa una sola vez por su clave primaria, simple o compuesta, y
+las comprobaciones se hacen con diccionarios y conjuntos en tiempo lineal.
+"""
+
+from operator import itemgetter
+
+# Clave primaria de cada tipo de recurso; las compuestas son tuplas de campos
+PRIMARY_KEYS = {
+    "users": "userId",
+    "addresses": "addressId",
+    "credentials": "credentialId",
+    "verification_tokens": "verificationTokenId",
+    "categories": "categoryId",
+    "products": "productId",
+    "carts": "cartId",
+    "orders": "orderId",
+    "payments": "paymentId",
+    "favourites": ("userId", "productId", "likeDate"),
+    "shippings": ("orderId", "productId"),
+}
+
+
+def key_getter(key):
+    """
+    Crea la función que extrae la clave de un elemento.
+
+    Args:
+        key (str | tuple): Campo de la clave o tupla de campos (clave compuesta).
+
+    Returns:
+        callable: Función elemento -> clave (tupla en las claves compuestas).
+    """
+    if isinstance(key, str):
+        return itemgetter(key)
+    if len(key) == 1:
+        getter = itemgetter(key[0])
+        return lambda item: (getter(item),)
+    return itemgetter(*key)
+
+
+def resource_keys(resource_type, items):
+    """
+    Obtiene las claves primarias de varios elementos de un tipo de recurso.
+
+    Args:
+        resource_type (str): Tipo de recurso de PRIMARY_KEYS (ej: 'favourites').
+        items (iterable): Elementos con los campos de la clave.
+
+    Returns:
+        set: Claves de los elementos (tuplas en las claves compuestas).
+    """
+    return set(map(key_getter(PRIMARY_KEYS[resource_type]), items))
+
+
+class CollectionIndex:
+    """
+    Índice {clave: elemento} de una colección, construido en una sola pasada.
+    """
+
+    def __init__(self, items, key, only=None):
+        """
+        Args:
+            items (iterable): Elementos de la colección (lista o iter_collection()).
+            key (str | tuple): Clave primaria, simple o compuesta (ver PRIMARY_KEYS).
+            only (iterable, optional): Si se indica, solo se guardan los elementos
+                con estas claves, de modo que la memoria no depende del tamaño
+                de la colección.
+        """
+        self.key = key
+        self._key_of = key_getter(key)
+        key_of = self._key_of
+        if only is None:
+            self._items = {key_of(item): item for item in items}
+        else:
+            wanted = self._normalize_keys(only)
+            self._items = {}
+            for item in items:
+                item_key = key_of(item)
+                if item_key in wanted:
+                    self._items[item_key] = item
+
+    @classmethod
+    def for_resource(cls, resource_type, items, only=None):
+        """
+        Crea el índice de un tipo de recurso usando su clave de PRIMARY_KEYS.
+
+        Args:
+            resource_type (str): Tipo de recurso (ej: 'payments', 'favourites').
+            items (iterable): Elementos de la colección.
+            only (iterable, optional): Claves que interesa conservar.
+
+        Returns:
+            CollectionIndex: Índice de la colección.
+        """
+        return cls(items, PRIMARY_KEYS[resource_type], only)
+
+    def _normalize_keys(self, keys):
+        """Convierte claves compuestas dadas como listas en tuplas."""
+        if isinstance(self.key, str):
+            return set(keys)
+        return {tuple(key) for key in keys}
+
+    def key_of(self, item):
+        """
+        Obtiene la clave de un elemento.
+
+        Args:
+            item (dict): Elemento con los campos de la clave.
+
+        Returns:
+            object: Clave del elemento (tupla en las claves compuestas).
+        """
+        return self._key_of(item)
+
+    def keys_of(self, items):
+        """
+        Obtiene el conjunto de claves de varios elementos.
+
+        Args:
+            items (iterable): Elementos con los campos de la clave.
+
+        Returns:
+            set: Claves de los elementos.
+        """
+        return set(map(self._key_of, items))
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def get(self, key, default=None):
+        """Devuelve el elemento con esa clave, o `default` si no está."""
+        return self._items.get(key, default)
+
+    def values(self):
+        """Elementos indexados."""
+        return self._items.values()
+
+    def missing(self, keys):
+        """
+        Claves esperadas que no están en la colección.
+
+        Args:
+            keys (iterable): Claves esperadas.
+
+        Returns:
+            set: Claves ausentes (vacío si están todas).
+        """
+        return self._normalize_keys(keys) - self._items.keys()
+
+    def diff(self, other):
+        """
+        Compara las claves del índice con otra colección.
+
+        Args:
+            other (CollectionIndex | iterable): Otro índice o un iterable de claves.
+
+        Returns:
+            tuple: (solo en este índice, solo en `other`) como conjuntos.
+        """
+        if isinstance(other, CollectionIndex):
+            other_keys = set(other._items)
+        else:
+            other_keys = self._normalize_keys(other)
+        own_keys = self._items.keys()
+        return own_keys - other_keys, other_keys - own_keys
+
+    def mismatches(self, expected, fields=None):
+        """
+        Compara los elementos esperados con los de la colección.
+
+        Args:
+            expected (iterable): Elementos esperados (dicts con la clave primaria).
+            fields (iterable, optional): Campos a comparar. Por defecto, todos
+                los campos de cada elemento esperado.
+
+        Returns:
+            dict: {clave: motivo}; el motivo es "ausente" o
+                {campo: (esperado, obtenido)}. Vacío si todo coincide.
+        """
+        problems = {}
+        for expected_item in expected:
+            item_key = self._key_of(expected_item)
+            actual = self._items.get(item_key)
+            if actual is None:
+                problems[item_key] = "ausente"
+                continue
+
+            compared = expected_item.keys() if fields is None else fields
+            differences = {
+                field: (expected_item[field], actual.get(field))
+                for field in compared
+                if actual.get(field) != expected_item[field]
+            }
+            if differences:
+                problems[item_key] = differences
+        return problems
+
+    def assert_contains(self, expected, fields=None):
+        """
+        Verifica que todos los elementos esperados estén presentes con esos campos.
+
+        Args:
+            expected (iterable): Elementos esperados (dicts con la clave primaria).
+            fields (iterable, optional): Campos a comparar (ver mismatches()).
+
+        Raises:
+            AssertionError: Con el detalle de las claves ausentes o distintas.
+        """
+        problems = self.mismatches(expected, fields)
+        assert (
+            not problems
+        ), f"Elementos ausentes o distintos en la colección: {problems}"
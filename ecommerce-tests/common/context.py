@@ -0,0 +1,164 @@
+"""
+Contexto de solicitud (servicio actual) seguro para hilos y corrutinas.
+
+El servicio "actual" que usan make_request() y compañía cuando no se indica
+service_name se guarda en una ContextVar en lugar de una variable global, de
+modo que cada hilo o tarea de asyncio tiene su propio valor y un
+setup_method no cambia el servicio con el que habla otro hilo.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+
+class ServiceContext:
+    """
+    Servicio por defecto de las solicitudes, aislado por hilo y por tarea.
+    """
+
+    def __init__(self, services_config, name="current_service"):
+        """
+        Args:
+            services_config (dict): SERVICES_CONFIG de la suite.
+            name (str): Nombre de la ContextVar (solo informativo).
+        """
+        self.services_config = services_config
+        self._current = contextvars.ContextVar(name, default="")
+
+    def validate(self, service_name):
+        """
+        Verifica que un servicio esté configurado.
+
+        Args:
+            service_name (str): Nombre del servicio.
+
+        Raises:
+            ValueError: Si el servicio no existe en SERVICES_CONFIG.
+        """
+        if service_name not in self.services_config:
+            raise ValueError(
+                f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(self.services_config.keys())}"
+            )
+
+    def get(self):
+        """
+        Obtiene el servicio actual del contexto en ejecución.
+
+        Returns:
+            str: Nombre del servicio, o "" si no se ha establecido.
+        """
+        return self._current.get()
+
+    def set(self, service_name):
+        """
+        Establece el servicio actual en el contexto en ejecución.
+
+        Args:
+            service_name (str): Nombre del servicio.
+
+        Returns:
+            contextvars.Token: Token para restaurar el valor anterior con reset().
+        """
+        self.validate(service_name)
+        return self._current.set(service_name)
+
+    def reset(self, token):
+        """Restaura el servicio que había antes de set()."""
+        self._current.reset(token)
+
+    @contextmanager
+    def use(self, service_name):
+        """
+        Usa un servicio como actual solo dentro de un bloque `with`.
+
+        Args:
+            service_name (str): Nombre del servicio.
+        """
+        token = self.set(service_name)
+        try:
+            yield service_name
+        finally:
+            self.reset(token)
+
+    def resolve(self, service_name=None):
+        """
+        Devuelve el servicio indicado o, si es None, el actual.
+
+        Args:
+            service_name (str, optional): Servicio explícito.
+
+        Returns:
+            str: Nombre del servicio a usar.
+        """
+        if service_name is None:
+            return self._current.get()
+        return service_name
+
+
+class ServiceClient:
+    """
+    Cliente explícito ligado a un servicio.
+
+    Evita depender del servicio actual: todas sus solicitudes indican
+    service_name, por lo que puede compartirse entre hilos sin riesgo.
+    """
+
+    def __init__(self, service_name, make_request, make_request_async=None):
+        """
+        Args:
+            service_name (str): Servicio al que se dirigen las solicitudes.
+            make_request (callable): make_request() de la suite.
+            make_request_async (callable, optional): make_request_async() de la suite.
+        """
+        self.service_name = service_name
+        self._make_request = make_request
+        self._make_request_async = make_request_async
+
+    def request(self, method, endpoint, **kwargs):
+        """Realiza una solicitud al servicio del cliente."""
+        return self._make_request(
+            method, endpoint, service_name=self.service_name, **kwargs
+        )
+
+    async def request_async(self, method, endpoint, **kwargs):
+        """Realiza una solicitud asíncrona al servicio del cliente."""
+        if self._make_request_async is None:
+            raise RuntimeError("El cliente no tiene make_request_async configurado")
+        return await self._make_request_async(
+            method, endpoint, service_name=self.service_name, **kwargs
+        )
+
+    def get(self, endpoint, **kwargs):
+        """Realiza una solicitud GET al servicio del cliente."""
+        return self.request("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        """Realiza una solicitud POST al servicio del cliente."""
+        return self.request("POST", endpoint, **kwargs)
+
+    def put(self, endpoint, **kwargs):
+        """Realiza una solicitud PUT al servicio del cliente."""
+        return self.request("PUT", endpoint, **kwargs)
+
+    def delete(self, endpoint, **kwargs):
+        """Realiza una solicitud DELETE al servicio del cliente."""
+        return self.request("DELETE", endpoint, **kwargs)
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """
+    Envía una función a un executor conservando el contexto actual.
+
+    Los hilos de un ThreadPoolExecutor no heredan las ContextVar de quien los
+    usa; con esta función la tarea ve el mismo servicio actual que el hilo
+    que la envió.
+
+    Args:
+        executor (concurrent.futures.Executor): Executor de destino.
+        fn (callable): Función a ejecutar.
+        *args, **kwargs: Argumentos de la función.
+
+    Returns:
+        concurrent.futures.Future: Resultado de la tarea.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -0,0 +1,210 @@
+"""
+Histogramas de latencia de rango dinámico alto (al estilo de HdrHistogram).
+
+Guardar cada latencia en una lista hace que la memoria crezca con el número
+de solicitudes, y ordenar la lista para cada percentil es caro en una carga
+larga. LatencyHistogram agrupa las latencias (en microsegundos) en cubetas
+log-lineales: cada potencia de 2 se divide en sub-cubetas suficientes para
+mantener el error relativo por debajo de 10^-cifras_significativas, de modo
+que p50, p99 o p99.99 se obtienen con esa precisión desde 1 µs hasta una hora.
+
+Solo se guardan las cubetas con cuentas (un dict índice -> cuenta), así que
+el tamaño depende de la dispersión de las latencias y no del número de
+solicitudes. Los histogramas con la misma precisión se combinan sumando
+cuentas (merge), y to_dict()/from_dict() los serializan en forma compacta
+para enviarlos entre procesos.
+"""
+
+import math
+
+# Cifras significativas por defecto: error relativo menor al 0,1 %
+DEFAULT_SIGNIFICANT_FIGURES = 3
+
+# Mayor latencia registrable en microsegundos (1 hora); las mayores se recortan
+DEFAULT_HIGHEST_TRACKABLE = 3_600_000_000
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias combinable.
+
+    No es seguro entre hilos: cada hilo o tarea debe usar el suyo, o
+    protegerlo con un lock.
+    """
+
+    def __init__(
+        self,
+        significant_figures=DEFAULT_SIGNIFICANT_FIGURES,
+        highest_trackable=DEFAULT_HIGHEST_TRACKABLE,
+    ):
+        """
+        Args:
+            significant_figures (int): Precisión, entre 1 y 5 cifras.
+            highest_trackable (int): Mayor valor registrable, en microsegundos.
+        """
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures debe estar entre 1 y 5")
+        self.significant_figures = significant_figures
+        self.highest_trackable = highest_trackable
+
+        # Sub-cubetas por potencia de 2: la menor potencia de 2 >= 2 * 10^cifras
+        self._sub_bucket_magnitude = math.ceil(math.log2(2 * 10**significant_figures))
+        self._half_magnitude = self._sub_bucket_magnitude - 1
+        self._half_count = 1 << self._half_magnitude
+        self._sub_bucket_mask = (1 << self._sub_bucket_magnitude) - 1
+
+        self.counts = {}
+        self.count = 0
+        self._sum = 0
+        self._min = None
+        self._max = 0
+
+    def _index(self, value):
+        """Índice de la cubeta de un valor en microsegundos."""
+        magnitude = (value | self._sub_bucket_mask).bit_length()
+        bucket = magnitude - self._sub_bucket_magnitude
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def _highest_equivalent(self, index):
+        """Mayor valor (µs) que cae en la cubeta de un índice."""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return (sub_bucket << bucket) + (1 << bucket) - 1
+
+    def record(self, seconds, count=1):
+        """
+        Registra una latencia.
+
+        Args:
+            seconds (float): Latencia en segundos.
+            count (int): Veces que se registra.
+        """
+        value = min(max(0, round(seconds * 1_000_000)), self.highest_trackable)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self._sum += value * count
+        if self._min is None or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other):
+        """
+        Suma las cuentas de otro histograma.
+
+        Args:
+            other (LatencyHistogram): Histograma con la misma precisión.
+
+        Returns:
+            LatencyHistogram: Este histograma.
+        """
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Solo se combinan histogramas con la misma precisión")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self._sum += other._sum
+        if other._min is not None and (self._min is None or other._min < self._min):
+            self._min = other._min
+        if other._max > self._max:
+            self._max = other._max
+        return self
+
+    def value_at_percentile(self, value):
+        """
+        Latencia de un percentil (rango más cercano).
+
+        Args:
+            value (float): Percentil entre 0 y 100 (ej: 99.99).
+
+        Returns:
+            float: Segundos, con el error relativo de la precisión del
+                histograma (nunca mayor que el máximo registrado); None si
+                está vacío.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(value / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self._max) / 1_000_000
+        return self._max / 1_000_000
+
+    @property
+    def mean(self):
+        """Media exacta en segundos (None si está vacío)."""
+        return self._sum / self.count / 1_000_000 if self.count else None
+
+    @property
+    def min(self):
+        """Latencia mínima registrada, en segundos (None si está vacío)."""
+        return self._min / 1_000_000 if self._min is not None else None
+
+    @property
+    def max(self):
+        """Latencia máxima registrada, en segundos (None si está vacío)."""
+        return self._max / 1_000_000 if self.count else None
+
+    def summary_ms(self, percentiles):
+        """
+        Resumen en milisegundos: media, percentiles y máximo.
+
+        Args:
+            percentiles (iterable): Percentiles a incluir; la clave de cada uno
+                es 'p' seguido del valor (ej: 'p99.9').
+
+        Returns:
+            dict: Resumen serializable en JSON, o None si está vacío.
+        """
+        if not self.count:
+            return None
+        summary = {"mean": self.mean * 1000}
+        for value in percentiles:
+            summary[f"p{value:g}"] = self.value_at_percentile(value) * 1000
+        summary["max"] = self.max * 1000
+        return summary
+
+    def to_dict(self):
+        """
+        Serializa el histograma en forma compacta.
+
+        Returns:
+            dict: Precisión, totales y las cubetas con cuentas como una lista
+                plana [índice, cuenta, índice, cuenta, ...].
+        """
+        return {
+            "significant_figures": self.significant_figures,
+            "highest_trackable": self.highest_trackable,
+            "count": self.count,
+            "sum": self._sum,
+            "min": self._min,
+            "max": self._max,
+            "counts": [value for item in self.counts.items() for value in item],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruye un histograma serializado con to_dict().
+
+        Args:
+            data (dict): Histograma serializado.
+
+        Returns:
+            LatencyHistogram: Histograma equivalente.
+        """
+        histogram = cls(data["significant_figures"], data["highest_trackable"])
+        flat = data["counts"]
+        histogram.counts = dict(zip(flat[0::2], flat[1::2]))
+        histogram.count = data["count"]
+        histogram._sum = data["sum"]
+        histogram._min = data["min"]
+        histogram._max = data["max"]
+        return histogram
@@ -0,0 +1,337 @@
+"""
+Cliente HTTP compartido por las suites de integración y E2E.
+
+Mantiene una sesión keep-alive por cada servicio de SERVICES_CONFIG, cada una
+con su propio pool de conexiones, para que las solicitudes reutilicen las
+conexiones TCP hacia el API Gateway en lugar de abrir una nueva por llamada.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.json_codec import dumps, loads
+from common.phase_timing import PhaseRecorder, PhaseTimingAdapter
+
+# Valores por defecto del pool de conexiones de cada sesión
+DEFAULT_POOL_CONFIG = {
+    "pool_connections": 4,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    # Mide DNS, conexión, TLS, TTFB y descarga de cada solicitud (ver common.phase_timing)
+    "phase_timing": False,
+}
+
+
+def build_url(service_config, endpoint):
+    """
+    Construye la URL completa de un endpoint para un servicio.
+
+    Args:
+        service_config (dict): Entrada de SERVICES_CONFIG del servicio.
+        endpoint (str): Endpoint relativo (ej: '/api/users' o 'actuator/health').
+
+    Returns:
+        str: URL completa.
+    """
+    if endpoint.startswith("/"):
+        endpoint = endpoint[1:]
+
+    base_url = service_config["url"]
+    path_prefix = service_config["path_prefix"]
+
+    if path_prefix:
+        return f"{base_url}/{path_prefix}/{endpoint}"
+    return f"{base_url}/{endpoint}"
+
+
+def build_headers(service_config, token=None, extra_headers=None):
+    """
+    Genera los headers de una solicitud según la configuración del servicio.
+
+    Args:
+        service_config (dict): Entrada de SERVICES_CONFIG del servicio.
+        token (str, optional): Token JWT para servicios que requieren autenticación.
+        extra_headers (dict, optional): Headers adicionales que sobrescriben los base.
+
+    Returns:
+        dict: Headers para la solicitud.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+
+    if service_config.get("requires_auth", True) and token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    if extra_headers:
+        headers.update(extra_headers)
+
+    return headers
+
+
+def encode_json_body(data):
+    """
+    Codifica el cuerpo JSON de una solicitud con el backend rápido.
+
+    Args:
+        data (object): Datos de la solicitud, o None si no lleva cuerpo.
+
+    Returns:
+        bytes: Cuerpo codificado, o None.
+    """
+    if data is None:
+        return None
+    return dumps(data)
+
+
+class JSONResponse:
+    """
+    Envoltorio de requests.Response que decodifica el JSON una sola vez.
+
+    Las llamadas repetidas a json() devuelven el mismo objeto ya decodificado,
+    por lo que modificarlo afecta a las llamadas siguientes. El resto de
+    atributos (status_code, text, headers, ...) se delegan en la respuesta.
+    """
+
+    _NOT_DECODED = object()
+
+    def __init__(self, response):
+        """
+        Args:
+            response (requests.Response): Respuesta original.
+        """
+        self.response = response
+        self._json = self._NOT_DECODED
+
+    def json(self, **kwargs):
+        """
+        Cuerpo de la respuesta decodificado como JSON (en caché).
+
+        Args:
+            **kwargs: Si se indican, se usa requests.Response.json() sin caché.
+
+        Returns:
+            object: Valor decodificado.
+        """
+        if kwargs:
+            return self.response.json(**kwargs)
+
+        if self._json is self._NOT_DECODED:
+            try:
+                self._json = loads(self.response.content)
+            except ValueError as e:
+                raise requests.exceptions.JSONDecodeError(
+                    getattr(e, "msg", str(e)),
+                    getattr(e, "doc", ""),
+                    getattr(e, "pos", 0),
+                )
+        return self._json
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def __bool__(self):
+        return bool(self.response)
+
+    def __repr__(self):
+        return repr(self.response)
+
+
+class SessionPool:
+    """
+    Conjunto de sesiones keep-alive, una por servicio configurado.
+
+    Las sesiones se crean de forma perezosa la primera vez que se usan y son
+    seguras para compartir entre hilos.
+    """
+
+    def __init__(self, services_config, pool_config=None):
+        """
+        Args:
+            services_config (dict): SERVICES_CONFIG de la suite.
+            pool_config (dict, optional): Tamaños del pool (ver DEFAULT_POOL_CONFIG).
+        """
+        self.services_config = services_config
+        self.pool_config = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+        self._sessions = {}
+        self._closed_stats = {}
+        self._lock = threading.Lock()
+        self.phase_recorder = PhaseRecorder()
+
+    def _create_session(self, service_name):
+        """Crea una sesión con adaptadores HTTP/HTTPS del tamaño configurado."""
+        session = requests.Session()
+        adapter_kwargs = {
+            "pool_connections": self.pool_config["pool_connections"],
+            "pool_maxsize": self.pool_config["pool_maxsize"],
+            "pool_block": self.pool_config["pool_block"],
+        }
+        if self.pool_config["phase_timing"]:
+            adapter = PhaseTimingAdapter(
+                self.phase_recorder, service_name, **adapter_kwargs
+            )
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, service_name):
+        """
+        Obtiene la sesión asociada a un servicio, creándola si no existe.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+
+        Returns:
+            requests.Session: Sesión del servicio.
+        """
+        session = self._sessions.get(service_name)
+        if session is not None:
+            return session
+
+        if service_name not in self.services_config:
+            raise ValueError(
+                f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(self.services_config.keys())}"
+            )
+
+        with self._lock:
+            session = self._sessions.get(service_name)
+            if session is None:
+                session = self._create_session(service_name)
+                self._sessions[service_name] = session
+        return session
+
+    def request(self, service_name, method, url, **kwargs):
+        """
+        Realiza una solicitud usando la sesión del servicio.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+            method (str): Método HTTP.
+            url (str): URL completa.
+            **kwargs: Argumentos adicionales para requests.Session.request.
+
+        Returns:
+            JSONResponse: Respuesta con decodificación JSON en caché.
+        """
+        return JSONResponse(self.session(service_name).request(method, url, **kwargs))
+
+    @staticmethod
+    def _session_stats(session):
+        """Suma los contadores de urllib3 de todos los pools de una sesión."""
+        total_requests = 0
+        new_connections = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+        return {
+            "requests": total_requests,
+            "hits": total_requests - new_connections,
+            "misses": new_connections,
+        }
+
+    def stats(self):
+        """
+        Obtiene los aciertos y fallos del pool de conexiones por servicio.
+
+        Un acierto es una solicitud servida por una conexión reutilizada; un
+        fallo es una solicitud que tuvo que abrir una conexión nueva.
+
+        Returns:
+            dict: {servicio: {"requests": int, "hits": int, "misses": int}}
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+            stats = {name: dict(values) for name, values in self._closed_stats.items()}
+
+        for name, session in sessions.items():
+            stats[name] = merge_pool_stats(
+                {name: stats.get(name, {})}, {name: self._session_stats(session)}
+            )[name]
+        return stats
+
+    def phase_stats(self):
+        """
+        Duraciones por fase de las solicitudes, agrupadas por servicio.
+
+        Returns:
+            dict: Datos de PhaseRecorder.export() (vacío si phase_timing está desactivado).
+        """
+        return self.phase_recorder.export()
+
+    def close(self):
+        """Cierra todas las sesiones conservando sus estadísticas."""
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = {}
+
+        for name, session in sessions.items():
+            self._closed_stats = merge_pool_stats(
+                self._closed_stats, {name: self._session_stats(session)}
+            )
+            session.close()
+
+
+def merge_pool_stats(*stats_list):
+    """
+    Combina estadísticas de pool (por ejemplo, las de varios workers de xdist).
+
+    Args:
+        *stats_list (dict): Estadísticas con el formato de SessionPool.stats().
+
+    Returns:
+        dict: Estadísticas sumadas por servicio.
+    """
+    merged = {}
+    for stats in stats_list:
+        for service, values in stats.items():
+            current = merged.setdefault(
+                service, {"requests": 0, "hits": 0, "misses": 0}
+            )
+            for key in current:
+                current[key] += values.get(key, 0)
+    return merged
+
+
+def format_pool_stats(stats):
+    """
+    Genera las líneas del resumen de reutilización de conexiones.
+
+    Args:
+        stats (dict): Estadísticas con el formato de SessionPool.stats().
+
+    Returns:
+        list: Líneas de texto listas para imprimir.
+    """
+    lines = ["🔌 Reutilización de conexiones HTTP por servicio:"]
+    total = {"requests": 0, "hits": 0, "misses": 0}
+    for service in sorted(stats):
+        values = stats[service]
+        if not values["requests"]:
+            continue
+        ratio = values["hits"] / values["requests"] * 100
+        lines.append(
+            f"  - {service}: {values['requests']} solicitudes, "
+            f"{values['hits']} reutilizadas, {values['misses']} nuevas ({ratio:.1f}% reutilización)"
+        )
+        for key in total:
+            total[key] += values[key]
+
+    if total["requests"]:
+        ratio = total["hits"] / total["requests"] * 100
+        lines.append(
+            f"  Total: {total['requests']} solicitudes, {total['hits']} reutilizadas, "
+            f"{total['misses']} nuevas ({ratio:.1f}% reutilización)"
+        )
+    else:
+        lines.append("  Sin solicitudes registradas")
+    return lines
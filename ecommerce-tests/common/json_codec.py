@@ -0,0 +1,47 @@
+"""
+Codificación y decodificación JSON de las suites.
+
+Usa orjson si está instalado y, si no, el módulo json de la biblioteca
+estándar. Las demás piezas del paquete common deben pasar por aquí en lugar de
+importar json directamente, para que el backend se elija en un único lugar.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+# Backend en uso, útil para mostrarlo en los resúmenes de la sesión
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """
+    Decodifica un documento JSON.
+
+    Args:
+        data (bytes | str): Documento JSON.
+
+    Returns:
+        object: Valor decodificado.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    Codifica un valor como JSON compacto en UTF-8.
+
+    Args:
+        obj (object): Valor a codificar.
+
+    Returns:
+        bytes: Documento JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,208 @@
+"""
+Lectura incremental del arreglo "collection" de las respuestas findAll.
+
+Los endpoints findAll devuelven un único documento {"collection": [...]} sin
+paginación. En lugar de cargarlo completo, estas funciones lo decodifican por
+fragmentos y entregan un elemento cada vez, de modo que la memoria usada no
+crece con el tamaño de la colección y se puede dejar de leer en cuanto se
+encuentra lo que se busca.
+
+Si ijson está instalado se usa como parser; si no, se usa un parser propio
+basado en json.JSONDecoder.raw_decode.
+"""
+
+import codecs
+import json
+import re
+
+try:
+    import ijson
+except ImportError:  # ijson es opcional
+    ijson = None
+
+# Tamaño por defecto de los fragmentos leídos de la respuesta (en bytes)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _ChunkBuffer:
+    """Texto pendiente de decodificar, alimentado por fragmentos de bytes."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def feed(self):
+        """Agrega el siguiente fragmento; devuelve False si ya no hay más."""
+        if self.exhausted:
+            return False
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                # Se descarta lo ya consumido para que el buffer no crezca
+                self.text = self.text[self.pos :] + text
+                self.pos = 0
+                return True
+        self.text = self.text[self.pos :] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.exhausted = True
+        return False
+
+    def peek(self):
+        """Salta espacios y devuelve el siguiente carácter (o "" al final)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.feed():
+                return ""
+
+    def expect(self, chars):
+        """Consume el siguiente carácter, que debe ser uno de `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"JSON inesperado en la posición {self.pos}: se esperaba {chars!r} y se encontró {char!r}"
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodifica el siguiente valor JSON completo."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.feed():
+                    continue
+                raise
+            # Un valor al final del buffer, o un número seguido de "." o "e",
+            # podría continuar en el siguiente fragmento
+            if (
+                end == len(self.text) or self.text[end] in _NUMBER_CHARS
+            ) and self.feed():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks, key="collection"):
+    """
+    Recorre el arreglo `key` de un objeto JSON leído por fragmentos.
+
+    Args:
+        chunks (iterable): Fragmentos del documento (bytes o str).
+        key (str): Clave del objeto raíz que contiene el arreglo.
+
+    Yields:
+        object: Cada elemento del arreglo, en orden.
+
+    Raises:
+        ValueError: Si el documento no es un objeto con un arreglo en `key`.
+    """
+    buffer = _ChunkBuffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        raise ValueError(f"La respuesta no contiene la clave '{key}'")
+
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name != key:
+            # Otras claves del objeto raíz se decodifican y se descartan
+            buffer.value()
+            if buffer.expect(",}") == "}":
+                raise ValueError(f"La respuesta no contiene la clave '{key}'")
+            continue
+
+        buffer.expect("[")
+        if buffer.peek() == "]":
+            return
+        while True:
+            yield buffer.value()
+            if buffer.expect(",]") == "]":
+                return
+
+
+def iter_response_collection(response, key="collection", chunk_size=None):
+    """
+    Recorre el arreglo `key` de una respuesta de requests abierta con stream=True.
+
+    Args:
+        response (requests.Response): Respuesta sin leer.
+        key (str): Clave del objeto raíz que contiene el arreglo.
+        chunk_size (int, optional): Bytes leídos por fragmento.
+
+    Yields:
+        object: Cada elemento del arreglo, en orden.
+    """
+    if ijson is not None:
+        # Se descomprime el contenido (gzip) igual que lo haría iter_content()
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, f"{key}.item", use_float=True)
+        return
+
+    yield from iter_json_array(
+        response.iter_content(chunk_size or DEFAULT_CHUNK_SIZE), key
+    )
+
+
+def _close(iterator):
+    """Cierra un generador (y con él la respuesta HTTP) si se dejó a medias."""
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def find_first(items, predicate):
+    """
+    Devuelve el primer elemento que cumple `predicate` y deja de leer.
+
+    Args:
+        items (iterable): Elementos (por ejemplo, de iter_collection()).
+        predicate (callable): Función que recibe un elemento y devuelve bool.
+
+    Returns:
+        object: Elemento encontrado, o None.
+    """
+    iterator = iter(items)
+    try:
+        for item in iterator:
+            if predicate(item):
+                return item
+        return None
+    finally:
+        _close(iterator)
+
+
+def missing_ids(items, id_field, ids):
+    """
+    Busca un conjunto de IDs en una colección, deteniéndose al encontrarlos todos.
+
+    Args:
+        items (iterable): Elementos (por ejemplo, de iter_collection()).
+        id_field (str): Campo con el ID de cada elemento (ej: 'cartId').
+        ids (iterable): IDs que se esperan en la colección.
+
+    Returns:
+        set: IDs que no aparecieron (vacío si estaban todos).
+    """
+    pending = set(ids)
+    if not pending:
+        return pending
+    iterator = iter(items)
+    try:
+        for item in iterator:
+            pending.discard(item.get(id_field))
+            if not pending:
+                break
+    finally:
+        _close(iterator)
+    return pending
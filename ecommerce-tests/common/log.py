@@ -0,0 +1,206 @@
+"""
+Registro estructurado del arnés de pruebas.
+
+Sustituye los print() del camino de cada solicitud por un logger con niveles:
+- Consola: los mismos mensajes legibles de siempre, filtrados por nivel. Los
+  de cada solicitud son DEBUG, de modo que solo se muestran en modo detallado.
+- Archivo JSONL (opcional): un registro estructurado por línea, acumulado en
+  memoria y escrito por bloques en lugar de en cada llamada.
+
+Los mensajes usan el formato diferido de logging (`log.debug("%s %s", a, b)`):
+si el nivel está desactivado la llamada termina sin formatear nada.
+"""
+
+import logging
+import os
+import sys
+from logging.handlers import MemoryHandler
+
+from common.json_codec import dumps
+
+# Logger raíz del arnés; los de cada suite cuelgan de él (ej: 'ecommerce_tests.e2e')
+ROOT_LOGGER = "ecommerce_tests"
+
+# Valores por defecto de la configuración del registro
+DEFAULT_LOG_CONFIG = {
+    "console_level": "INFO",
+    "jsonl_path": None,
+    "jsonl_level": "DEBUG",
+    "buffer_size": 512,
+}
+
+# Atributos estándar de LogRecord que no se copian como campos adicionales
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    Escribe en el sys.stdout vigente en cada momento.
+
+    pytest reemplaza sys.stdout para capturar la salida de cada prueba; así
+    los mensajes se capturan igual que los print() a los que sustituyen.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class JSONLFormatter(logging.Formatter):
+    """
+    Convierte cada registro en una línea JSON.
+
+    Además del mensaje ya formateado se guarda la plantilla y sus argumentos,
+    para poder agrupar los registros por evento sin analizar el texto.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": str(record.msg),
+            "message": record.getMessage(),
+            "worker": _worker_tag(),
+        }
+        if record.args:
+            entry["args"] = [_plain(arg) for arg in _args_of(record)]
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = _plain(value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return dumps(entry).decode("utf-8")
+
+
+def _args_of(record):
+    """Argumentos del mensaje como secuencia (logging admite también un dict)."""
+    if isinstance(record.args, dict):
+        return [record.args]
+    return record.args
+
+
+def _plain(value):
+    """Convierte un valor en algo serializable a JSON."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    return str(value)
+
+
+def _worker_tag():
+    """Identificador del worker de xdist actual ('master' sin xdist)."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def _level(value):
+    """Convierte un nivel dado como nombre ('debug', 'INFO') o número."""
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Nivel de registro desconocido: {value}")
+    return level
+
+
+def jsonl_path_for_worker(path):
+    """
+    Archivo JSONL propio del worker de xdist, para que no se intercalen líneas.
+
+    Args:
+        path (str): Ruta configurada (ej: 'logs/run.jsonl').
+
+    Returns:
+        str: La misma ruta sin xdist, o 'logs/run.gw0.jsonl' en el worker gw0.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{worker}{extension or '.jsonl'}"
+
+
+def configure_logging(config=None):
+    """
+    Configura los destinos del logger del arnés. Puede llamarse varias veces:
+    cada llamada reemplaza la configuración anterior.
+
+    Args:
+        config (dict, optional): Claves de DEFAULT_LOG_CONFIG:
+            console_level: nivel de la consola ('DEBUG' muestra cada solicitud).
+            jsonl_path: archivo JSONL; None lo desactiva.
+            jsonl_level: nivel de los registros del archivo JSONL.
+            buffer_size: registros acumulados antes de escribir el archivo.
+
+    Returns:
+        logging.Logger: Logger raíz del arnés.
+    """
+    config = {**DEFAULT_LOG_CONFIG, **(config or {})}
+    logger = logging.getLogger(ROOT_LOGGER)
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+        # MemoryHandler.close() vacía el buffer pero no cierra el archivo
+        target = getattr(handler, "target", None)
+        if target is not None:
+            target.close()
+
+    console = _StdoutHandler()
+    console.setLevel(_level(config["console_level"]))
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console)
+    levels = [console.level]
+
+    if config["jsonl_path"]:
+        path = jsonl_path_for_worker(config["jsonl_path"])
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        target = logging.FileHandler(path, encoding="utf-8")
+        target.setFormatter(JSONLFormatter())
+        # Los errores se escriben de inmediato; el resto, por bloques
+        buffered = MemoryHandler(
+            config["buffer_size"], flushLevel=logging.ERROR, target=target
+        )
+        buffered.setLevel(_level(config["jsonl_level"]))
+        logger.addHandler(buffered)
+        levels.append(buffered.level)
+
+    # El nivel del logger es el más bajo de sus destinos: por debajo de él las
+    # llamadas se descartan antes de crear el registro
+    logger.setLevel(min(levels))
+    logger.propagate = False
+    return logger
+
+
+def get_logger(name=None):
+    """
+    Obtiene un logger del arnés.
+
+    Args:
+        name (str, optional): Sufijo del logger (ej: 'integration').
+
+    Returns:
+        logging.Logger: Logger 'ecommerce_tests' o 'ecommerce_tests.<name>'.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}" if name else ROOT_LOGGER)
+
+
+def flush_logs():
+    """Escribe los registros JSONL que sigan en memoria."""
+    for handler in logging.getLogger(ROOT_LOGGER).handlers:
+        handler.flush()
@@ -0,0 +1,362 @@
+"""
+Medición por fases de las solicitudes del cliente HTTP compartido.
+
+Transporte instrumentado opcional para SessionPool: los pools de urllib3 usan
+conexiones que miden cada fase de la solicitud:
+- dns: resolución del nombre del host (solo en conexiones nuevas).
+- connect: establecimiento de la conexión TCP (solo en conexiones nuevas).
+- tls: handshake TLS (solo en conexiones HTTPS nuevas; no aparece en HTTP).
+- ttfb: desde que se empieza a enviar la solicitud hasta recibir los headers
+  de la respuesta; es el tiempo de procesamiento del gateway y del servicio.
+- download: lectura del cuerpo de la respuesta. Con stream=True solo cuenta
+  el tiempo dentro de las lecturas del socket (no el de quien procesa los
+  fragmentos) y las fases se registran al agotarse el cuerpo o al cerrarse
+  la respuesta.
+
+Las fases se agregan por servicio de SERVICES_CONFIG, lo que permite separar
+los problemas de red o de reutilización de conexiones del tiempo de servidor.
+
+Con un proxy HTTP(S) (HTTP_PROXY/HTTPS_PROXY) las fases dns y connect son las
+del proxy, y en HTTPS la fase tls incluye el túnel CONNECT. Las solicitudes a
+través de un proxy SOCKS no se miden.
+"""
+
+import math
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+# Fases medidas, en el orden en que ocurren
+PHASES = ("dns", "connect", "tls", "ttfb", "download")
+
+# Fases de la última respuesta recibida en cada hilo
+_last_phases = threading.local()
+
+
+class _PhaseTimingMixin:
+    """Mide las fases de cada solicitud de una conexión de urllib3."""
+
+    _phase_setup = None
+    _phase_connected_at = None
+    _phase_request_start = None
+
+    def _new_conn(self):
+        """Resuelve el host (fase dns) y abre el socket (fase connect)."""
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                self._dns_host, self.port, 0, socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            # urllib3 genera el error de resolución con su tipo habitual
+            return super()._new_conn()
+        resolved = time.perf_counter()
+
+        # Se conecta a las direcciones ya resueltas, en orden, como haría
+        # create_connection() con el nombre del host
+        dns_host = self._dns_host
+        candidates = list(dict.fromkeys(address[4][0] for address in addresses))
+        try:
+            for index, address in enumerate(candidates):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if index == len(candidates) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+        self._phase_setup = {
+            "dns": resolved - start,
+            "connect": time.perf_counter() - resolved,
+        }
+        return sock
+
+    def connect(self):
+        """Abre la conexión; en HTTPS, el resto del tiempo es el handshake TLS."""
+        start = time.perf_counter()
+        super().connect()
+        self._phase_connected_at = time.perf_counter()
+        setup = self._phase_setup
+        if setup is not None and isinstance(self, HTTPSConnection):
+            elapsed = self._phase_connected_at - start
+            setup["tls"] = max(0.0, elapsed - setup["dns"] - setup["connect"])
+
+    def request(self, *args, **kwargs):
+        self._phase_request_start = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        received = time.perf_counter()
+
+        # En HTTP la conexión se abre dentro de request(): el TTFB empieza al
+        # terminar de conectar
+        start = self._phase_request_start or received
+        if self._phase_connected_at is not None and self._phase_connected_at > start:
+            start = self._phase_connected_at
+
+        setup, self._phase_setup = self._phase_setup, None
+        phases = {"dns": 0.0, "connect": 0.0, **(setup or {})}
+        phases["ttfb"] = received - start
+        phases["reused"] = setup is None
+        _last_phases.value = phases
+        return response
+
+
+class InstrumentedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    """Conexión HTTP que mide las fases de cada solicitud."""
+
+
+class InstrumentedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    """Conexión HTTPS que mide las fases de cada solicitud."""
+
+
+class InstrumentedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = InstrumentedHTTPConnection
+
+
+class InstrumentedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = InstrumentedHTTPSConnection
+
+
+# Pools de urllib3 que usan las conexiones instrumentadas
+INSTRUMENTED_POOL_CLASSES = {
+    "http": InstrumentedHTTPConnectionPool,
+    "https": InstrumentedHTTPSConnectionPool,
+}
+
+
+class _StreamDownloadTimer:
+    """
+    Mide la descarga de una respuesta leída con stream=True.
+
+    Envuelve las lecturas de response.raw para acumular solo el tiempo de
+    lectura, y registra las fases una única vez, cuando el cuerpo se agota o
+    cuando se cierra la respuesta (lo que ocurra primero).
+    """
+
+    def __init__(self, adapter, response, phases):
+        self.adapter = adapter
+        self.phases = phases
+        self.elapsed = 0.0
+        self.recorded = False
+
+        raw = self._raw = response.raw
+        self._read = raw.read
+        self._read_chunked = getattr(raw, "read_chunked", None)
+        self._close = response.close
+        raw.read = self.read
+        if self._read_chunked is not None:
+            raw.read_chunked = self.read_chunked
+        response.close = self.close
+
+    def read(self, amt=None, *args, **kwargs):
+        start = time.perf_counter()
+        data = self._read(amt, *args, **kwargs)
+        self.elapsed += time.perf_counter() - start
+        # urllib3 deja de leer cuando el socket se agota, sin una lectura vacía
+        if amt is None or not data or self._raw.closed:
+            self.finish()
+        return data
+
+    def read_chunked(self, *args, **kwargs):
+        chunks = self._read_chunked(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            self.elapsed += time.perf_counter() - start
+            if chunk is None:
+                self.finish()
+                return
+            yield chunk
+
+    def close(self):
+        try:
+            self._close()
+        finally:
+            self.finish()
+
+    def finish(self):
+        """Registra las fases con la descarga acumulada hasta ahora."""
+        if self.recorded:
+            return
+        self.recorded = True
+        self.phases["download"] = self.elapsed
+        self.adapter.recorder.record(self.adapter.service_name, self.phases)
+
+
+class PhaseRecorder:
+    """
+    Duraciones de cada fase, agrupadas por servicio.
+    """
+
+    def __init__(self):
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def record(self, service_name, phases):
+        """
+        Registra las fases de una solicitud.
+
+        Args:
+            service_name (str): Servicio de SERVICES_CONFIG.
+            phases (dict): Segundos por fase y "reused" (bool).
+        """
+        with self._lock:
+            entry = self._services.get(service_name)
+            if entry is None:
+                entry = self._services[service_name] = _empty_entry()
+            entry["requests"] += 1
+            if not phases["reused"]:
+                entry["new_connections"] += 1
+            for phase in PHASES:
+                value = phases.get(phase)
+                # dns, connect y tls solo cuentan en las conexiones nuevas
+                if value is not None and (
+                    phase in ("ttfb", "download") or not phases["reused"]
+                ):
+                    entry["phases"][phase].append(value)
+
+    def export(self):
+        """
+        Copia de los datos registrados, con tipos simples (para xdist).
+
+        Returns:
+            dict: {servicio: {"requests", "new_connections", "phases": {fase: [segundos]}}}
+        """
+        with self._lock:
+            return {
+                service: {
+                    "requests": entry["requests"],
+                    "new_connections": entry["new_connections"],
+                    "phases": {
+                        phase: list(values) for phase, values in entry["phases"].items()
+                    },
+                }
+                for service, entry in self._services.items()
+            }
+
+
+def _empty_entry():
+    """Registro vacío de un servicio."""
+    return {
+        "requests": 0,
+        "new_connections": 0,
+        "phases": {phase: [] for phase in PHASES},
+    }
+
+
+def merge_phase_stats(*exports):
+    """
+    Combina los datos de varios PhaseRecorder (por ejemplo, de workers de xdist).
+
+    Args:
+        *exports (dict): Resultados de PhaseRecorder.export().
+
+    Returns:
+        dict: Datos combinados por servicio.
+    """
+    merged = {}
+    for export in exports:
+        for service, entry in export.items():
+            current = merged.setdefault(service, _empty_entry())
+            current["requests"] += entry["requests"]
+            current["new_connections"] += entry["new_connections"]
+            for phase, values in entry["phases"].items():
+                current["phases"].setdefault(phase, []).extend(values)
+    return merged
+
+
+def _p95(values):
+    """Percentil 95 por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(0.95 * len(ordered))) - 1]
+
+
+def format_phase_stats(stats):
+    """
+    Genera las líneas del resumen de fases por servicio.
+
+    Args:
+        stats (dict): Datos con el formato de PhaseRecorder.export().
+
+    Returns:
+        list: Líneas de texto (vacía si no hay datos).
+    """
+    if not stats:
+        return []
+    lines = ["🔬 Fases de las solicitudes por servicio (media / p95 en ms):"]
+    for service in sorted(stats):
+        entry = stats[service]
+        if not entry["requests"]:
+            continue
+        parts = []
+        for phase in PHASES:
+            values = entry["phases"].get(phase)
+            if values:
+                mean = sum(values) / len(values) * 1000
+                parts.append(f"{phase} {mean:.1f}/{_p95(values) * 1000:.1f}")
+        lines.append(
+            f"  - {service}: {entry['requests']} solicitudes, "
+            f"{entry['new_connections']} conexiones nuevas | {', '.join(parts)}"
+        )
+    return lines
+
+
+class PhaseTimingAdapter(HTTPAdapter):
+    """
+    Adaptador de requests que usa las conexiones instrumentadas y registra
+    las fases de cada solicitud para un servicio.
+
+    Las fases de la última solicitud quedan también en response.phase_timings.
+    """
+
+    def __init__(self, recorder, service_name, **kwargs):
+        """
+        Args:
+            recorder (PhaseRecorder): Registro de fases compartido.
+            service_name (str): Servicio al que pertenece la sesión.
+            **kwargs: Argumentos de HTTPAdapter (pool_connections, pool_maxsize, ...).
+        """
+        self.recorder = recorder
+        self.service_name = service_name
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(INSTRUMENTED_POOL_CLASSES)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # Los proxies SOCKS usan sus propios pools; esas solicitudes no se miden
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = dict(INSTRUMENTED_POOL_CLASSES)
+        return manager
+
+    def send(self, request, stream=False, **kwargs):
+        _last_phases.value = None
+        response = super().send(request, stream=stream, **kwargs)
+        phases = _last_phases.value
+        if phases is None:
+            return response
+
+        response.phase_timings = phases
+        if stream:
+            # La descarga se registra cuando quien lee la respuesta la agota o la cierra
+            _StreamDownloadTimer(self, response, phases)
+            return response
+
+        # requests leería el cuerpo justo después; aquí se mide la descarga
+        start = time.perf_counter()
+        response.content
+        phases["download"] = time.perf_counter() - start
+        self.recorder.record(self.service_name, phases)
+        return response
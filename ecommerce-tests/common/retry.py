@@ -0,0 +1,368 @@
+"""
+Política de reintentos compartida por las suites de integración y E2E.
+
+Decide si una solicitud fallida se repite y cuánto se espera antes:
+- Solo se reintentan errores transitorios: fallos de conexión, timeouts y los
+  estados 429/502/503/504 del gateway.
+- Los métodos no idempotentes (POST) solo se repiten si la solicitud no llegó a
+  enviarse (no se pudo abrir la conexión); repetir un POST que sí llegó podría
+  crear el recurso dos veces.
+- La espera usa backoff exponencial con jitter (common.backoff) y respeta el
+  header Retry-After.
+- Un presupuesto global limita los reintentos a una fracción de las
+  solicitudes del proceso: si un servicio está caído, el presupuesto se agota
+  y las pruebas fallan de inmediato en lugar de esperar en cada reintento.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+
+import aiohttp
+import requests
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+from common.backoff import exponential_backoff
+from common.log import get_logger
+
+# Métodos que se pueden repetir sin efectos adicionales en el servidor
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Valores por defecto de la política
+DEFAULT_RETRY_CONFIG = {
+    # Intentos totales por solicitud, incluido el primero
+    "max_attempts": 3,
+    # Espera del primer reintento y espera máxima (en segundos)
+    "base_delay": 0.5,
+    "max_delay": 4.0,
+    # Estados HTTP transitorios que se reintentan en métodos idempotentes
+    "retry_statuses": (429, 502, 503, 504),
+    # Reintentos permitidos por cada solicitud enviada (0.2 = uno de cada cinco)
+    "budget_ratio": 0.2,
+    # Reintentos disponibles siempre, aunque aún se hayan enviado pocas solicitudes
+    "budget_min_retries": 10,
+}
+
+_log = get_logger("retry")
+
+
+class RetryBudget:
+    """
+    Presupuesto de reintentos compartido por todos los hilos del proceso.
+
+    Se permiten `min_retries + ratio * solicitudes` reintentos en total; cuando
+    se agota, los fallos se devuelven sin reintentar hasta que nuevas
+    solicitudes vuelvan a recargarlo.
+    """
+
+    def __init__(self, ratio, min_retries):
+        """
+        Args:
+            ratio (float): Reintentos permitidos por cada solicitud enviada.
+            min_retries (int): Reintentos disponibles desde el principio.
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Registra una solicitud nueva (su primer intento)."""
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self):
+        """
+        Consume un reintento si queda presupuesto.
+
+        Returns:
+            bool: True si se puede reintentar.
+        """
+        with self._lock:
+            if self.retries < self.min_retries + self.ratio * self.requests:
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def stats(self):
+        """
+        Contadores del presupuesto.
+
+        Returns:
+            dict: {"requests", "retries", "denied"}.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "denied": self.denied,
+            }
+
+
+def merge_retry_stats(*stats):
+    """
+    Suma los contadores de varios presupuestos (por ejemplo, de workers de xdist).
+
+    Args:
+        *stats (dict): Resultados de RetryBudget.stats().
+
+    Returns:
+        dict: Contadores sumados.
+    """
+    merged = {"requests": 0, "retries": 0, "denied": 0}
+    for entry in stats:
+        for key in merged:
+            merged[key] += entry.get(key, 0)
+    return merged
+
+
+def format_retry_stats(stats):
+    """
+    Línea de resumen de los reintentos para el reporte de la terminal.
+
+    Args:
+        stats (dict): Contadores de RetryBudget.stats() o merge_retry_stats().
+
+    Returns:
+        str: Resumen legible.
+    """
+    return (
+        f"🔁 Reintentos: {stats['retries']} de {stats['requests']} solicitudes "
+        f"({stats['denied']} denegados por el presupuesto)"
+    )
+
+
+def _not_sent(error):
+    """Indica si el error ocurrió antes de enviar la solicitud (al conectar)."""
+    if isinstance(
+        error, (requests.exceptions.ConnectTimeout, aiohttp.ClientConnectorError)
+    ):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # requests envuelve el error de urllib3 en MaxRetryError.reason
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return False
+
+
+def _retry_after(response, max_delay):
+    """Espera indicada por el header Retry-After (en segundos), si es numérica."""
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    try:
+        return min(float(value), max_delay) if value is not None else None
+    except ValueError:
+        # Retry-After también admite una fecha HTTP; en ese caso se usa el backoff
+        return None
+
+
+async def _release(response):
+    """Devuelve al pool la conexión de una respuesta asíncrona descartada."""
+    release = getattr(response, "release", None)
+    if release is None:
+        # AsyncResponse ya leyó el cuerpo y liberó su conexión
+        return
+    released = release()
+    if inspect.isawaitable(released):
+        # aiohttp 3.9 devuelve un awaitable vacío
+        await released
+
+
+class RetryPolicy:
+    """
+    Política de reintentos de un cliente HTTP.
+
+    execute() y execute_async() reciben una función sin argumentos que envía
+    la solicitud y la repiten según la política.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        base_delay=0.5,
+        max_delay=4.0,
+        retry_statuses=(429, 502, 503, 504),
+        budget=None,
+        sleep=time.sleep,
+    ):
+        """
+        Args:
+            max_attempts (int): Intentos totales por solicitud (1 desactiva los reintentos).
+            base_delay (float): Espera del primer reintento en segundos.
+            max_delay (float): Espera máxima en segundos.
+            retry_statuses (iterable): Estados HTTP que se reintentan.
+            budget (RetryBudget, optional): Presupuesto global; None no lo limita.
+            sleep (callable): Función de espera de execute().
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.budget = budget
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, config=None):
+        """
+        Crea la política y su presupuesto a partir de un dict de configuración.
+
+        Args:
+            config (dict, optional): Claves de DEFAULT_RETRY_CONFIG.
+
+        Returns:
+            RetryPolicy: Política configurada.
+        """
+        config = {**DEFAULT_RETRY_CONFIG, **(config or {})}
+        return cls(
+            max_attempts=config["max_attempts"],
+            base_delay=config["base_delay"],
+            max_delay=config["max_delay"],
+            retry_statuses=config["retry_statuses"],
+            budget=RetryBudget(config["budget_ratio"], config["budget_min_retries"]),
+        )
+
+    def is_retryable(self, method, response=None, error=None):
+        """
+        Clasifica el resultado de un intento.
+
+        Args:
+            method (str): Método HTTP.
+            response (object, optional): Respuesta recibida.
+            error (Exception, optional): Excepción lanzada.
+
+        Returns:
+            bool: True si el fallo es transitorio y repetir la solicitud es seguro.
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            if _not_sent(error):
+                return True
+            return idempotent and isinstance(
+                error,
+                (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError,
+                ),
+            )
+        return idempotent and response.status_code in self.retry_statuses
+
+    def next_delay(self, method, attempt, response=None, error=None, url=None):
+        """
+        Decide si se reintenta tras un intento fallido.
+
+        Args:
+            method (str): Método HTTP.
+            attempt (int): Intento que acaba de fallar, empezando en 0.
+            response (object, optional): Respuesta recibida.
+            error (Exception, optional): Excepción lanzada.
+            url (str, optional): URL de la solicitud, para los mensajes.
+
+        Returns:
+            float: Segundos a esperar antes de reintentar, o None si no se reintenta.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if not self.is_retryable(method, response, error):
+            return None
+        target = f"{method} {url}" if url else method
+        if self.budget is not None and not self.budget.try_spend():
+            _log.warning(
+                "⛔ Presupuesto de reintentos agotado: %s falla sin reintentar", target
+            )
+            return None
+
+        delay = exponential_backoff(attempt, self.base_delay, self.max_delay)
+        if response is not None:
+            delay = _retry_after(response, self.max_delay) or delay
+        _log.warning(
+            "🔁 Reintentando %s en %.2fs (intento %d de %d): %s",
+            target,
+            delay,
+            attempt + 2,
+            self.max_attempts,
+            error if error is not None else response.status_code,
+        )
+        return delay
+
+    def execute(self, method, send, url=None):
+        """
+        Envía una solicitud aplicando la política.
+
+        Args:
+            method (str): Método HTTP.
+            send (callable): Función sin argumentos que envía la solicitud.
+            url (str, optional): URL de la solicitud, para los mensajes.
+
+        Returns:
+            object: Respuesta del último intento.
+
+        Raises:
+            Exception: La excepción del último intento, si no se reintenta.
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+        attempt = 0
+        while True:
+            try:
+                response = send()
+            except Exception as e:
+                delay = self.next_delay(method, attempt, error=e, url=url)
+                if delay is None:
+                    raise
+            else:
+                delay = self.next_delay(method, attempt, response=response, url=url)
+                if delay is None:
+                    return response
+                response.close()
+            self._sleep(delay)
+            attempt += 1
+
+    async def execute_async(self, method, send, url=None):
+        """
+        Versión asíncrona de execute().
+
+        Args:
+            method (str): Método HTTP.
+            send (callable): Función sin argumentos que devuelve la corrutina
+                que envía la solicitud.
+            url (str, optional): URL de la solicitud, para los mensajes.
+
+        Returns:
+            object: Respuesta del último intento. Si es una respuesta de
+                aiohttp sin leer, las de los intentos descartados se liberan
+                antes de la espera, como close() en execute().
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+        attempt = 0
+        while True:
+            try:
+                response = await send()
+            except Exception as e:
+                delay = self.next_delay(method, attempt, error=e, url=url)
+                if delay is None:
+                    raise
+            else:
+                delay = self.next_delay(method, attempt, response=response, url=url)
+                if delay is None:
+                    return response
+                await _release(response)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        """
+        Contadores del presupuesto de reintentos.
+
+        Returns:
+            dict: {"requests", "retries", "denied"} (en cero si no hay presupuesto).
+        """
+        if self.budget is None:
+            return merge_retry_stats()
+        return self.budget.stats()
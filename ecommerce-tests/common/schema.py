@@ -0,0 +1,212 @@
+"""
+Validación de esquemas de respuesta compilados.
+
+Un esquema ({"userId": int, "firstName": str, ...}) se compila una vez en un
+CompiledSchema que valida todos los elementos de una colección. Las claves y
+los tipos se comprueban por lotes, sin recorrer el esquema campo a campo para
+cada elemento: por cada clave, un itemgetter extrae en C la columna de valores
+de todos los elementos (y falla si a alguno le falta la clave), y de esa
+columna solo se comparan con el esquema los tipos distintos que aparecen. Así
+la validación sigue siendo rápida con colecciones de cientos de miles de
+elementos; el recorrido elemento a elemento solo se hace para localizar el
+índice de un fallo.
+"""
+
+from functools import lru_cache
+from operator import itemgetter, methodcaller
+
+_NONE_TYPE = type(None)
+
+
+class SchemaValidationError(AssertionError):
+    """
+    Un elemento no cumple el esquema.
+
+    Attributes:
+        index (int): Posición del elemento en la colección (None si no es una colección).
+        key (str): Clave que falla, si aplica.
+    """
+
+    def __init__(self, message, index=None, key=None):
+        self.index = index
+        self.key = key
+        location = f" (elemento {index})" if index is not None else ""
+        super().__init__(f"{message}{location}")
+
+
+class CompiledSchema:
+    """
+    Esquema plano {clave: tipo} preparado para validar colecciones completas.
+
+    Los valores None se aceptan para cualquier clave, igual que en
+    validate_response_schema().
+    """
+
+    def __init__(self, schema, optional=()):
+        """
+        Args:
+            schema (dict): {clave: tipo o tupla de tipos}.
+            optional (iterable): Claves que pueden faltar (por ejemplo, en
+                servicios que omiten los campos nulos al serializar).
+        """
+        self.keys = tuple(schema)
+        self.types = tuple(schema.values())
+        self.optional = frozenset(optional)
+        # Una clave opcional ausente se lee como None, que siempre es válido
+        self._columns = tuple(
+            (
+                key,
+                expected,
+                methodcaller("get", key) if key in self.optional else itemgetter(key),
+            )
+            for key, expected in schema.items()
+        )
+
+    def _type_error(self, key, actual, expected):
+        """Mensaje de error para un valor de tipo inesperado."""
+        return f"La clave '{key}' no es del tipo esperado {expected}, es {actual}"
+
+    def _key_error(self, items):
+        """Devuelve (índice, clave, mensaje) del primer elemento al que le falten claves."""
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                return index, None, f"Se esperaba un objeto y se recibió {type(item)}"
+            for key in self.keys:
+                if key not in item and key not in self.optional:
+                    return (
+                        index,
+                        key,
+                        f"La clave '{key}' no está presente en la respuesta",
+                    )
+        return None
+
+    def first_error(self, items):
+        """
+        Busca el primer elemento de una colección que no cumple el esquema.
+
+        Args:
+            items (list): Elementos de la colección.
+
+        Returns:
+            tuple: (índice, clave, mensaje) del fallo, o None si todos son válidos.
+        """
+        if not isinstance(items, list):
+            items = list(items)
+
+        # Se valida por columnas: por cada clave, un único recorrido en C que
+        # extrae los valores y obtiene el conjunto de tipos distintos
+        first_failure = None
+        key_failure = None
+        for key, expected, getter in self._columns:
+            try:
+                column_types = set(map(type, map(getter, items)))
+            except (KeyError, TypeError, AttributeError):
+                # Falta una clave o algún elemento no es un dict (AttributeError
+                # en las columnas opcionales, que se leen con get). Ruta lenta:
+                # se localiza el primer elemento incompleto y las columnas se
+                # siguen revisando solo hasta él, porque un error de tipo en un
+                # elemento anterior es el primer fallo de la colección
+                key_failure = self._key_error(items)
+                items = items[: key_failure[0]]
+                column_types = set(map(type, map(getter, items)))
+
+            invalid_types = {
+                actual
+                for actual in column_types
+                if actual is not _NONE_TYPE and not issubclass(actual, expected)
+            }
+            if not invalid_types:
+                continue
+
+            index = next(
+                index
+                for index, actual in enumerate(map(type, map(getter, items)))
+                if actual in invalid_types
+            )
+            if first_failure is None or index < first_failure[0]:
+                first_failure = (
+                    index,
+                    key,
+                    self._type_error(key, type(items[index][key]), expected),
+                )
+
+        if key_failure is not None and (
+            first_failure is None or key_failure[0] < first_failure[0]
+        ):
+            return key_failure
+        return first_failure
+
+    def validate_items(self, items):
+        """
+        Valida todos los elementos de una colección.
+
+        Args:
+            items (list): Elementos de la colección.
+
+        Raises:
+            SchemaValidationError: En el primer elemento que no cumple el esquema.
+        """
+        error = self.first_error(items)
+        if error is not None:
+            index, key, message = error
+            raise SchemaValidationError(message, index, key)
+
+    def validate(self, data):
+        """
+        Valida una respuesta ya decodificada.
+
+        Acepta {"collection": [...]}, una lista de elementos o un único objeto.
+
+        Args:
+            data (object): Cuerpo JSON de la respuesta.
+
+        Raises:
+            SchemaValidationError: Si algún elemento no cumple el esquema.
+        """
+        if isinstance(data, dict) and "collection" in data:
+            self.validate_items(data["collection"])
+        elif isinstance(data, list):
+            self.validate_items(data)
+        else:
+            error = self.first_error([data])
+            if error is not None:
+                _, key, message = error
+                raise SchemaValidationError(message, key=key)
+
+    def is_valid(self, data):
+        """
+        Indica si una respuesta cumple el esquema, sin lanzar excepciones.
+
+        Args:
+            data (object): Cuerpo JSON de la respuesta.
+
+        Returns:
+            bool: True si todos los elementos cumplen el esquema.
+        """
+        try:
+            self.validate(data)
+        except SchemaValidationError:
+            return False
+        return True
+
+
+@lru_cache(maxsize=128)
+def _compile(items, optional):
+    """Compila un esquema dado como tupla de pares (clave, tipo)."""
+    return CompiledSchema(dict(items), optional)
+
+
+def compile_schema(schema, optional=()):
+    """
+    Compila un esquema, reutilizando el resultado si ya se compiló antes.
+
+    Args:
+        schema (dict | CompiledSchema): {clave: tipo} o un esquema ya compilado.
+        optional (iterable): Claves que pueden faltar en los elementos.
+
+    Returns:
+        CompiledSchema: Validador del esquema.
+    """
+    if isinstance(schema, CompiledSchema):
+        return schema
+    return _compile(tuple(schema.items()), frozenset(optional))
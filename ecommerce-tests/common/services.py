@@ -0,0 +1,45 @@
+"""
+Rutas de los microservicios a través del API Gateway.
+
+Las suites de integración, E2E y de carga llegan a los servicios de negocio
+por el mismo gateway. La tabla se define aquí para que sus rutas no diverjan
+entre suites; cada config.py añade sobre ella sus entradas propias (servicios
+de infraestructura, proxy-client).
+"""
+
+# Servicios de negocio; el gateway los enruta con su nombre como prefijo
+GATEWAY_SERVICES = (
+    "user-service",
+    "product-service",
+    "order-service",
+    "payment-service",
+    "favourite-service",
+    "shipping-service",
+)
+
+
+def gateway_services_config(api_gateway_url):
+    """
+    Construye las entradas de SERVICES_CONFIG que pasan por el API Gateway.
+
+    Args:
+        api_gateway_url (str): URL base del gateway (ej: http://localhost:8222).
+
+    Returns:
+        dict: El propio gateway (sin autenticación) y cada servicio de negocio,
+            con el formato {"url", "requires_auth", "path_prefix"}.
+    """
+    services_config = {
+        "api-gateway": {
+            "url": api_gateway_url,
+            "requires_auth": False,
+            "path_prefix": "",
+        },
+    }
+    for service_name in GATEWAY_SERVICES:
+        services_config[service_name] = {
+            "url": f"{api_gateway_url}/{service_name}",
+            "requires_auth": True,
+            "path_prefix": "",
+        }
+    return services_config
@@ -0,0 +1,341 @@
+"""
+Timeouts por endpoint aprendidos de la latencia de ejecuciones anteriores.
+
+Cada solicitud se agrupa por plantilla de endpoint ("user-service GET
+/api/users/{id}") y su duración se guarda en un archivo de historial
+compartido entre ejecuciones y workers de xdist, separado por destino (la URL
+del API Gateway): las latencias de un entorno local no fijan los timeouts de
+staging ni al revés. Los intentos cortados por el timeout de lectura también
+se registran, con el propio timeout como duración, para que el timeout
+aprendido crezca en lugar de seguir cortando las mismas solicitudes. Al
+iniciar la sesión, el
+timeout de lectura de cada plantilla se calcula una sola vez como un
+percentil alto de su historial multiplicado por un margen, acotado entre un
+mínimo y un máximo. Así, una llamada colgada a /actuator/health se corta en
+un par de segundos y un findAll lento conserva el tiempo que necesita.
+
+Las plantillas sin historial suficiente usan el timeout global de la suite.
+El timeout de conexión no depende del endpoint y se configura aparte. Los
+timeouts adaptativos están desactivados por defecto (ADAPTIVE_TIMEOUTS).
+"""
+
+import json
+import math
+import os
+import re
+import threading
+
+import aiohttp
+import requests
+from filelock import FileLock
+from urllib3.exceptions import ReadTimeoutError
+
+# Valores por defecto de la configuración
+DEFAULT_TIMEOUT_CONFIG = {
+    "enabled": False,
+    "history_path": None,
+    # Destino de las solicitudes (URL del API Gateway); separa el historial por entorno
+    "target": None,
+    "connect_timeout": 3.05,
+    "percentile": 99,
+    "multiplier": 3.0,
+    "min_samples": 20,
+    "max_samples": 500,
+    "floor": 1.0,
+    "ceiling": 30.0,
+}
+
+# Segmentos de ruta que son identificadores (IDs numéricos, fechas, nombres de prueba)
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_template(service_name, method, endpoint):
+    """
+    Obtiene la plantilla de un endpoint, sustituyendo los identificadores.
+
+    Los segmentos de ruta que contienen dígitos se reemplazan por {id}:
+    '/api/favourites/1/2/10-06-2025__16:00:00:000000' se agrupa como
+    '/api/favourites/{id}/{id}/{id}'.
+
+    Args:
+        service_name (str): Nombre del servicio.
+        method (str): Método HTTP.
+        endpoint (str): Endpoint relativo.
+
+    Returns:
+        str: Plantilla, ej: 'user-service GET /api/users/{id}'.
+    """
+    path = endpoint.split("?", 1)[0].strip("/")
+    segments = [
+        "{id}" if _ID_SEGMENT.search(segment) else segment
+        for segment in path.split("/")
+    ]
+    return f"{service_name} {method.upper()} /{'/'.join(segments)}"
+
+
+def is_read_timeout(error):
+    """
+    Indica si un error es un timeout de lectura (la respuesta no llegó a tiempo).
+
+    Los timeouts de conexión no cuentan: no dicen nada de la latencia del
+    endpoint.
+
+    Args:
+        error (Exception): Excepción de requests o aiohttp.
+
+    Returns:
+        bool: True si el intento se cortó esperando la respuesta.
+    """
+    if isinstance(error, requests.exceptions.ReadTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # Al leer en streaming, requests envuelve el ReadTimeoutError de urllib3
+        return bool(error.args) and isinstance(error.args[0], ReadTimeoutError)
+    if isinstance(error, aiohttp.ServerTimeoutError):
+        # aiohttp usa la misma excepción al conectar; solo la distingue el mensaje
+        return not str(error).startswith("Connection timeout")
+    return False
+
+
+def percentile(samples, value):
+    """
+    Percentil por el método del rango más cercano.
+
+    Args:
+        samples (list): Valores (no hace falta que estén ordenados).
+        value (float): Percentil entre 0 y 100.
+
+    Returns:
+        float: Valor del percentil, o None si no hay muestras.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(value / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class AdaptiveTimeouts:
+    """
+    Timeouts (conexión, lectura) por plantilla de endpoint.
+
+    Los timeouts se calculan al crear el objeto y no cambian durante la
+    ejecución; las duraciones nuevas se acumulan en memoria y se añaden al
+    historial con save().
+    """
+
+    def __init__(self, default_timeout, config=None):
+        """
+        Args:
+            default_timeout (float): Timeout de lectura de las plantillas sin historial.
+            config (dict, optional): Claves de DEFAULT_TIMEOUT_CONFIG.
+        """
+        self.config = {**DEFAULT_TIMEOUT_CONFIG, **(config or {})}
+        self.default_timeout = default_timeout
+        self.history_path = self.config["history_path"]
+        self.target = self.config["target"] or "default"
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._read_timeouts = {}
+        if self.config["enabled"] and self.history_path:
+            self._read_timeouts = self._learn(self._load().get(self.target, {}))
+
+    def _load(self):
+        """
+        Lee el historial {destino: {plantilla: [segundos, ...]}}.
+
+        Un archivo inexistente, ilegible o con otro formato (como el de
+        versiones anteriores, sin destino) se trata como vacío.
+        """
+        try:
+            with open(self.history_path, encoding="utf-8") as history_file:
+                history = json.load(history_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(history, dict):
+            return {}
+        return {
+            target: templates
+            for target, templates in history.items()
+            if isinstance(templates, dict)
+        }
+
+    def _learn(self, history):
+        """Calcula el timeout de lectura de cada plantilla con historial suficiente."""
+        config = self.config
+        timeouts = {}
+        for template, samples in history.items():
+            if len(samples) < config["min_samples"]:
+                continue
+            learned = percentile(samples, config["percentile"]) * config["multiplier"]
+            timeouts[template] = round(
+                min(config["ceiling"], max(config["floor"], learned)), 3
+            )
+        return timeouts
+
+    def timeout_for(self, template):
+        """
+        Obtiene los timeouts de una plantilla.
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+
+        Returns:
+            tuple: (timeout de conexión, timeout de lectura) en segundos.
+        """
+        return (
+            self.config["connect_timeout"],
+            self._read_timeouts.get(template, self.default_timeout),
+        )
+
+    def learned(self):
+        """
+        Timeouts de lectura aprendidos del historial.
+
+        Returns:
+            dict: {plantilla: segundos}.
+        """
+        return dict(self._read_timeouts)
+
+    def record(self, template, seconds):
+        """
+        Registra la duración de una solicitud completada.
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+            seconds (float): Duración de la solicitud.
+        """
+        with self._lock:
+            self._samples.setdefault(template, []).append(round(seconds, 4))
+
+    def record_response(self, template, response):
+        """
+        Registra la duración de una respuesta (requests o AsyncResponse).
+
+        Las respuestas 5xx no se registran: suelen ser fallos rápidos del
+        gateway que harían bajar el timeout aprendido.
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+            response (object): Respuesta con status_code y elapsed.
+        """
+        if response.status_code < 500:
+            self.record(template, response.elapsed.total_seconds())
+
+    def record_timeout(self, template):
+        """
+        Registra un intento cortado por el timeout de lectura.
+
+        La muestra es el propio timeout, una cota inferior de la duración
+        real: si los intentos cortados superan la fracción que deja fuera el
+        percentil, el percentil aprendido pasa a ser ese timeout y la
+        siguiente ejecución lo multiplica por el margen.
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+        """
+        self.record(template, self.timeout_for(template)[1])
+
+    def track(self, template, send):
+        """
+        Envuelve la función que envía un intento para registrar sus timeouts.
+
+        Se aplica a cada intento, dentro de la política de reintentos, de modo
+        que también cuentan los timeouts que luego se reintentan.
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+            send (callable): Función sin argumentos que envía la solicitud.
+
+        Returns:
+            callable: Función equivalente a send.
+        """
+
+        def send_and_record():
+            try:
+                return send()
+            except Exception as e:
+                if is_read_timeout(e):
+                    self.record_timeout(template)
+                raise
+
+        return send_and_record
+
+    def track_async(self, template, send):
+        """
+        Versión asíncrona de track().
+
+        Args:
+            template (str): Plantilla de endpoint_template().
+            send (callable): Función sin argumentos que devuelve la corrutina
+                que envía la solicitud.
+
+        Returns:
+            callable: Función equivalente a send.
+        """
+
+        async def send_and_record():
+            try:
+                return await send()
+            except Exception as e:
+                if is_read_timeout(e):
+                    self.record_timeout(template)
+                raise
+
+        return send_and_record
+
+    def save(self):
+        """
+        Añade las duraciones registradas al archivo de historial.
+
+        El archivo se relee bajo un lock de archivo para combinar las muestras
+        de varios workers de xdist; de cada plantilla se conservan solo las
+        max_samples más recientes.
+        """
+        if not self.config["enabled"] or not self.history_path:
+            return
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        if not samples:
+            return
+
+        max_samples = self.config["max_samples"]
+        with FileLock(f"{self.history_path}.lock", timeout=30):
+            history = self._load()
+            templates = history.setdefault(self.target, {})
+            for template, durations in samples.items():
+                templates[template] = (templates.get(template, []) + durations)[
+                    -max_samples:
+                ]
+
+            tmp_path = f"{self.history_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as history_file:
+                json.dump(history, history_file, sort_keys=True)
+            os.replace(tmp_path, self.history_path)
+
+
+def format_timeout_stats(timeouts, verbose=False):
+    """
+    Resumen de los timeouts aprendidos para el reporte de la terminal.
+
+    Args:
+        timeouts (AdaptiveTimeouts): Timeouts de la sesión.
+        verbose (bool): Si es True, incluye el timeout de cada plantilla.
+
+    Returns:
+        str: Resumen legible (varias líneas con verbose).
+    """
+    if not timeouts.config["enabled"]:
+        return "⏱️ Timeouts adaptativos desactivados"
+    learned = timeouts.learned()
+    summary = (
+        f"⏱️ Timeouts aprendidos: {len(learned)} plantillas "
+        f"(el resto usa {timeouts.default_timeout}s; historial: {timeouts.history_path}, "
+        f"destino: {timeouts.target})"
+    )
+    if not verbose:
+        return summary
+    lines = [summary]
+    for template, seconds in sorted(learned.items()):
+        lines.append(f"  {template}: {seconds}s")
+    return "\n".join(lines)
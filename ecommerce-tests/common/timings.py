@@ -0,0 +1,349 @@
+"""
+Registro de la duración de cada solicitud HTTP de las pruebas.
+
+make_request() mide cada llamada con un reloj monótono y la registra con su
+método, plantilla de endpoint, servicio, estado y el node ID de la prueba en
+curso. El node ID se guarda en una variable de contexto, por lo que también
+se asigna bien a las solicitudes hechas desde hilos de make_request_many() y
+desde tareas de asyncio.
+
+Con estos registros las suites ofrecen el fixture request_timings, columnas
+en el reporte HTML de pytest-html y un resumen por endpoint en la terminal.
+Si la solicitud llevaba contexto de traza (common.tracing), el registro
+guarda su trace ID y los reportes enlazan la llamada más lenta con Zipkin.
+"""
+
+import html
+import math
+import threading
+from collections import namedtuple
+from contextvars import ContextVar
+
+# Duración de una solicitud; status es None si la solicitud lanzó una excepción
+# y trace_id es None si no se propagó contexto de traza
+RequestTiming = namedtuple(
+    "RequestTiming",
+    ["method", "template", "service", "status", "duration", "node_id", "trace_id"],
+    defaults=[None],
+)
+
+# Node ID de las solicitudes hechas fuera de una prueba (fixtures de sesión, hooks)
+SESSION_NODE = "(sesión)"
+
+# Endpoints mostrados en los resúmenes, ordenados del más lento al más rápido
+DEFAULT_SUMMARY_LIMIT = 15
+
+_current_node = ContextVar("current_test_node", default=SESSION_NODE)
+
+
+def set_current_node(node_id):
+    """
+    Asocia las solicitudes siguientes a una prueba.
+
+    Args:
+        node_id (str): Node ID de pytest, o None para volver a SESSION_NODE.
+    """
+    _current_node.set(node_id or SESSION_NODE)
+
+
+def current_node():
+    """Node ID de la prueba en curso (SESSION_NODE fuera de una prueba)."""
+    return _current_node.get()
+
+
+class TimingRecorder:
+    """
+    Duraciones de las solicitudes de un proceso, agrupadas por prueba.
+    """
+
+    def __init__(self):
+        self._by_node = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        Recibe cada solicitud en cuanto se registra.
+
+        Lo usa el generador de carga (load/e2e_tasks.py) para medir las
+        solicitudes de las pruebas E2E mientras se ejecutan.
+
+        Args:
+            callback (callable): Función que recibe el RequestTiming; se llama
+                desde el hilo que hizo la solicitud.
+        """
+        self._listeners.append(callback)
+
+    def record(self, method, template, service, status, duration, trace_id=None):
+        """
+        Registra una solicitud de la prueba en curso.
+
+        Args:
+            method (str): Método HTTP.
+            template (str): Plantilla de endpoint (ver common.timeouts.endpoint_template).
+            service (str): Nombre del servicio.
+            status (int): Estado HTTP, o None si la solicitud falló sin respuesta.
+            duration (float): Segundos, medidos con time.perf_counter().
+            trace_id (str, optional): Trace ID propagado en la solicitud.
+        """
+        node_id = _current_node.get()
+        timing = RequestTiming(
+            method, template, service, status, duration, node_id, trace_id
+        )
+        with self._lock:
+            timings = self._by_node.get(node_id)
+            if timings is None:
+                timings = self._by_node[node_id] = []
+            timings.append(timing)
+        for callback in self._listeners:
+            callback(timing)
+
+    def for_node(self, node_id):
+        """
+        Solicitudes de una prueba.
+
+        La lista devuelta es la misma que se sigue llenando, de modo que una
+        prueba ve sus solicitudes a medida que las hace.
+
+        Args:
+            node_id (str): Node ID de pytest.
+
+        Returns:
+            list: RequestTiming de la prueba, en orden.
+        """
+        with self._lock:
+            timings = self._by_node.get(node_id)
+            if timings is None:
+                timings = self._by_node[node_id] = []
+            return timings
+
+    def clear_node(self, node_id):
+        """
+        Descarta las solicitudes registradas de una prueba.
+
+        Args:
+            node_id (str): Node ID de pytest.
+        """
+        with self._lock:
+            self._by_node.pop(node_id, None)
+
+    def all(self):
+        """
+        Todas las solicitudes registradas.
+
+        Returns:
+            list: RequestTiming de todas las pruebas.
+        """
+        with self._lock:
+            return [timing for timings in self._by_node.values() for timing in timings]
+
+    def export(self):
+        """
+        Registros como listas simples, para enviarlos desde un worker de xdist.
+
+        Returns:
+            list: Una lista [method, template, service, status, duration, node_id,
+                trace_id] por solicitud.
+        """
+        return [list(timing) for timing in self.all()]
+
+
+def timings_from_export(rows):
+    """
+    Reconstruye los registros enviados con TimingRecorder.export().
+
+    Args:
+        rows (list): Listas exportadas.
+
+    Returns:
+        list: RequestTiming.
+    """
+    return [RequestTiming(*row) for row in rows]
+
+
+def _percentile(ordered, value):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    rank = max(1, math.ceil(value / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(timings):
+    """
+    Resume las duraciones de un grupo de solicitudes.
+
+    Args:
+        timings (iterable): RequestTiming.
+
+    Returns:
+        dict: {"count", "errors", "total", "mean", "p50", "p95", "max"} en
+            segundos, más "slowest" (la RequestTiming más lenta), o None si no
+            hay solicitudes. "errors" cuenta las respuestas 5xx y las
+            solicitudes sin respuesta.
+    """
+    timings = list(timings)
+    if not timings:
+        return None
+    durations = sorted(timing.duration for timing in timings)
+    total = sum(durations)
+    return {
+        "slowest": max(timings, key=lambda timing: timing.duration),
+        "count": len(durations),
+        "errors": sum(
+            1 for timing in timings if timing.status is None or timing.status >= 500
+        ),
+        "total": total,
+        "mean": total / len(durations),
+        "p50": _percentile(durations, 50),
+        "p95": _percentile(durations, 95),
+        "max": durations[-1],
+    }
+
+
+def summarize_by_endpoint(timings):
+    """
+    Resume las solicitudes por plantilla de endpoint.
+
+    Args:
+        timings (iterable): RequestTiming.
+
+    Returns:
+        list: Pares (plantilla, resumen) ordenados por p95 descendente.
+    """
+    groups = {}
+    for timing in timings:
+        groups.setdefault(timing.template, []).append(timing)
+    summaries = [(template, summarize(group)) for template, group in groups.items()]
+    return sorted(summaries, key=lambda item: item[1]["p95"], reverse=True)
+
+
+def node_summary(timings):
+    """
+    Resumen de las solicitudes de una prueba para adjuntarlo a su reporte.
+
+    Args:
+        timings (list): RequestTiming de la prueba.
+
+    Solo contiene tipos simples, porque pytest-xdist serializa los reportes.
+
+    Returns:
+        dict: summarize() con "slowest" (plantilla de la solicitud más lenta)
+            y "slowest_trace" (su trace ID), o None si la prueba no hizo
+            solicitudes.
+    """
+    summary = summarize(timings)
+    if summary is None:
+        return None
+    slowest = summary["slowest"]
+    summary["slowest"] = slowest.template
+    summary["slowest_trace"] = slowest.trace_id
+    return summary
+
+
+def _ms(seconds):
+    """Segundos como milisegundos enteros."""
+    return f"{seconds * 1000:.0f}"
+
+
+def _trace_anchor(text, trace_id, trace_link):
+    """Texto HTML enlazado a la traza, o solo el texto si no hay enlace."""
+    url = trace_link(trace_id) if trace_link and trace_id else None
+    if url is None:
+        return html.escape(text)
+    return (
+        f'<a href="{html.escape(url)}" target="_blank" '
+        f'title="Traza {trace_id}">{html.escape(text)}</a>'
+    )
+
+
+def format_endpoint_summary(timings, limit=DEFAULT_SUMMARY_LIMIT, trace_link=None):
+    """
+    Tabla de texto con las latencias por endpoint para la terminal.
+
+    Args:
+        timings (iterable): RequestTiming.
+        limit (int): Endpoints mostrados (los más lentos por p95).
+        trace_link (callable, optional): Recibe un trace ID y devuelve la URL
+            de la traza; si se indica, cada endpoint muestra el enlace a su
+            solicitud más lenta.
+
+    Returns:
+        list: Líneas de la tabla (vacía si no hubo solicitudes).
+    """
+    summaries = summarize_by_endpoint(timings)
+    if not summaries:
+        return []
+    lines = [f"{'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}  endpoint"]
+    for template, stats in summaries[:limit]:
+        lines.append(
+            f"{stats['count']:>6} {stats['errors']:>4} {_ms(stats['p50']):>8} "
+            f"{_ms(stats['p95']):>8} {_ms(stats['max']):>8}  {template}"
+        )
+        url = trace_link(stats["slowest"].trace_id) if trace_link else None
+        if url:
+            lines.append(f"{'':>31}  🔗 {url}")
+    if len(summaries) > limit:
+        lines.append(f"  ... y {len(summaries) - limit} endpoints más")
+    return lines
+
+
+def html_header_cells():
+    """Celdas de encabezado de las columnas de tiempos (pytest-html 4)."""
+    return [
+        '<th class="sortable" data-column-type="http-requests">Solicitudes HTTP</th>',
+        '<th class="sortable" data-column-type="http-time">Tiempo HTTP (ms)</th>',
+        "<th>Solicitud más lenta</th>",
+    ]
+
+
+def html_row_cells(summary, trace_link=None):
+    """
+    Celdas de las columnas de tiempos de una prueba (pytest-html 4).
+
+    Args:
+        summary (dict): Resultado de node_summary(), o None.
+        trace_link (callable, optional): Recibe un trace ID y devuelve la URL
+            de la traza; la solicitud más lenta se enlaza con ella.
+
+    Returns:
+        list: Celdas <td>.
+    """
+    if summary is None:
+        return ["<td>0</td>", "<td>0</td>", "<td></td>"]
+    return [
+        f"<td>{summary['count']}</td>",
+        f"<td>{_ms(summary['total'])}</td>",
+        "<td>"
+        + _trace_anchor(summary["slowest"], summary.get("slowest_trace"), trace_link)
+        + "</td>",
+    ]
+
+
+def html_endpoint_summary(timings, limit=DEFAULT_SUMMARY_LIMIT, trace_link=None):
+    """
+    Tabla HTML con las latencias por endpoint para el resumen del reporte.
+
+    Args:
+        timings (iterable): RequestTiming.
+        limit (int): Endpoints mostrados (los más lentos por p95).
+        trace_link (callable, optional): Recibe un trace ID y devuelve la URL
+            de la traza; el máximo de cada endpoint se enlaza con ella.
+
+    Returns:
+        list: Fragmentos HTML (vacía si no hubo solicitudes).
+    """
+    summaries = summarize_by_endpoint(timings)
+    if not summaries:
+        return []
+    rows = "".join(
+        f"<tr><td>{html.escape(template)}</td><td>{stats['count']}</td>"
+        f"<td>{stats['errors']}</td><td>{_ms(stats['p50'])}</td>"
+        f"<td>{_ms(stats['p95'])}</td>"
+        f"<td>{_trace_anchor(_ms(stats['max']), stats['slowest'].trace_id, trace_link)}</td></tr>"
+        for template, stats in summaries[:limit]
+    )
+    return [
+        f"<h3>Latencia por endpoint (los {min(limit, len(summaries))} más lentos por p95)</h3>",
+        "<table><thead><tr><th>Endpoint</th><th>Solicitudes</th><th>Errores</th>"
+        "<th>p50 ms</th><th>p95 ms</th><th>max ms</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>",
+    ]
@@ -0,0 +1,122 @@
+"""
+Propagación de contexto de traza en las solicitudes de las pruebas.
+
+Los servicios envían sus trazas a Zipkin (SPRING_ZIPKIN_BASE_URL en
+docker-compose.yml). Para que una solicitud de una prueba se pueda encontrar
+en Zipkin, cada llamada de make_request() genera un trace ID y lo envía con:
+- Headers B3 (X-B3-TraceId, X-B3-SpanId, X-B3-Sampled).
+- Header W3C traceparent.
+- Header W3C baggage con el node ID de la prueba (test.node_id).
+
+Cada intento (incluidos los reintentos) es un span nuevo dentro de la misma
+traza. El trace ID se guarda con la duración de la solicitud (common.timings),
+de modo que los reportes enlazan cada llamada lenta con su traza en Zipkin.
+"""
+
+import os
+from urllib.parse import quote
+
+from common.timings import current_node
+
+# Valores por defecto de la configuración
+DEFAULT_TRACING_CONFIG = {
+    "enabled": True,
+    # URL de Zipkin accesible desde la máquina que ejecuta las pruebas
+    "zipkin_url": "http://localhost:9411",
+}
+
+# Clave del baggage con el node ID de la prueba
+NODE_BAGGAGE_KEY = "test.node_id"
+
+
+def new_trace_id():
+    """Trace ID aleatorio de 128 bits (32 caracteres hexadecimales)."""
+    return os.urandom(16).hex()
+
+
+def new_span_id():
+    """Span ID aleatorio de 64 bits (16 caracteres hexadecimales)."""
+    return os.urandom(8).hex()
+
+
+def trace_headers(trace_id, span_id=None, node_id=None):
+    """
+    Genera los headers B3 y W3C de un span.
+
+    Args:
+        trace_id (str): Trace ID de 32 caracteres hexadecimales.
+        span_id (str, optional): Span ID; si es None se genera uno nuevo.
+        node_id (str, optional): Node ID de pytest que se envía como baggage.
+
+    Returns:
+        dict: Headers de propagación.
+    """
+    span_id = span_id or new_span_id()
+    headers = {
+        "X-B3-TraceId": trace_id,
+        "X-B3-SpanId": span_id,
+        "X-B3-Sampled": "1",
+        "traceparent": f"00-{trace_id}-{span_id}-01",
+    }
+    if node_id:
+        headers["baggage"] = f"{NODE_BAGGAGE_KEY}={quote(node_id, safe='')}"
+    return headers
+
+
+class Tracer:
+    """
+    Genera los trace IDs de las solicitudes y los enlaces a Zipkin.
+
+    Con la propagación desactivada, new_trace() devuelve None e inject() deja
+    los headers como están.
+    """
+
+    def __init__(self, config=None):
+        """
+        Args:
+            config (dict, optional): Claves de DEFAULT_TRACING_CONFIG.
+        """
+        self.config = {**DEFAULT_TRACING_CONFIG, **(config or {})}
+        self.enabled = self.config["enabled"]
+        self.zipkin_url = (self.config["zipkin_url"] or "").rstrip("/")
+
+    def new_trace(self):
+        """
+        Inicia la traza de una solicitud.
+
+        Returns:
+            str: Trace ID, o None si la propagación está desactivada.
+        """
+        return new_trace_id() if self.enabled else None
+
+    def inject(self, headers, trace_id):
+        """
+        Agrega a los headers un span nuevo de la traza.
+
+        Se llama en cada intento de la solicitud: cada reintento es un span
+        distinto de la misma traza. El node ID es el de la prueba en curso.
+
+        Args:
+            headers (dict): Headers de la solicitud (no se modifican).
+            trace_id (str): Trace ID de new_trace(), o None.
+
+        Returns:
+            dict: Headers con la propagación (los mismos si trace_id es None).
+        """
+        if trace_id is None:
+            return headers
+        return {**headers, **trace_headers(trace_id, node_id=current_node())}
+
+    def trace_url(self, trace_id):
+        """
+        Enlace a la traza en la interfaz de Zipkin.
+
+        Args:
+            trace_id (str): Trace ID, o None.
+
+        Returns:
+            str: URL de la traza, o None sin trace ID o sin URL de Zipkin.
+        """
+        if not trace_id or not self.zipkin_url:
+            return None
+        return f"{self.zipkin_url}/zipkin/traces/{trace_id}"
@@ -3,47 +3,21 @@ Configuración para las pruebas e2e.
 """
 
 import os
+import sys
+from pathlib import Path
+
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.services import gateway_services_config
 
 # URLs de servicios de infraestructura
 API_GATEWAY_URL = os.getenv("API_GATEWAY_URL", "http://localhost:8222")
 
 # Configuración de servicios
 SERVICES_CONFIG = {
-    "api-gateway": {
-        "url": API_GATEWAY_URL,
-        "requires_auth": False,
-        "path_prefix": "",
-    },
-    "user-service": {
-        "url": f"{API_GATEWAY_URL}/user-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
-    "product-service": {
-        "url": f"{API_GATEWAY_URL}/product-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
-    "order-service": {
-        "url": f"{API_GATEWAY_URL}/order-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
-    "payment-service": {
-        "url": f"{API_GATEWAY_URL}/payment-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
-    "favourite-service": {
-        "url": f"{API_GATEWAY_URL}/favourite-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
-    "shipping-service": {
-        "url": f"{API_GATEWAY_URL}/shipping-service",
-        "requires_auth": True,
-        "path_prefix": "",
-    },
+    # API Gateway y servicios de negocio, compartidos con integration y load
+    **gateway_services_config(API_GATEWAY_URL),
     "proxy-client": {
         "url": f"{API_GATEWAY_URL}/proxy-client",
         "requires_auth": True,
@@ -54,9 +28,92 @@ SERVICES_CONFIG = {
 # Configuración de autenticación
 AUTH_ENDPOINT = f"{API_GATEWAY_URL}/app/api/authenticate"
 
-# Tiempo de espera para las solicitudes (en segundos)
+# Caché del token JWT compartida entre workers de pytest-xdist
+TOKEN_CACHE_CONFIG = {
+    # Segundos antes de la expiración (claim exp) en los que se renueva el token
+    "refresh_margin": int(os.getenv("TOKEN_REFRESH_MARGIN", "60")),
+    # Archivo de caché explícito; si no se indica se genera en cache_dir
+    "cache_path": os.getenv("TOKEN_CACHE_PATH"),
+    # Directorio de la caché; por defecto, el temporal del sistema
+    "cache_dir": os.getenv("TOKEN_CACHE_DIR"),
+}
+
+# Tiempo de espera de las solicitudes (en segundos); es el timeout de lectura
+# de los endpoints sin historial de latencia suficiente (ver TIMEOUT_CONFIG)
 REQUEST_TIMEOUT = 15
 
+# Timeouts por plantilla de endpoint aprendidos del historial (ver common/timeouts.py)
+TIMEOUT_CONFIG = {
+    # Desactivados por defecto: con ADAPTIVE_TIMEOUTS=true se aprenden del historial
+    "enabled": os.getenv("ADAPTIVE_TIMEOUTS", "false").lower() == "true",
+    # Historial de latencias compartido entre ejecuciones; por defecto, junto a la suite
+    "history_path": os.getenv("LATENCY_HISTORY_PATH")
+    or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ".latency-history.json",
+    ),
+    # El historial se separa por destino para no mezclar entornos
+    "target": API_GATEWAY_URL,
+    "connect_timeout": float(os.getenv("CONNECT_TIMEOUT", "3.05")),
+    # Timeout de lectura = percentil del historial * multiplicador, entre floor y ceiling
+    "percentile": float(os.getenv("TIMEOUT_PERCENTILE", "99")),
+    "multiplier": float(os.getenv("TIMEOUT_MULTIPLIER", "3")),
+    "floor": float(os.getenv("TIMEOUT_FLOOR", "1")),
+    "ceiling": float(os.getenv("TIMEOUT_CEILING", "30")),
+    # Muestras necesarias para aprender una plantilla y muestras guardadas por plantilla
+    "min_samples": int(os.getenv("TIMEOUT_MIN_SAMPLES", "20")),
+    "max_samples": int(os.getenv("TIMEOUT_MAX_SAMPLES", "500")),
+}
+
+# Pool de conexiones keep-alive por servicio
+HTTP_POOL_CONFIG = {
+    "pool_connections": int(os.getenv("HTTP_POOL_CONNECTIONS", "4")),
+    "pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", "10")),
+    "pool_block": os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true",
+    # Transporte instrumentado: DNS, conexión, TLS, TTFB y descarga por servicio
+    "phase_timing": os.getenv("HTTP_PHASE_TIMING", "false").lower() == "true",
+}
+
+# Política de reintentos de make_request (ver common/retry.py)
+RETRY_CONFIG = {
+    # Intentos totales por solicitud, incluido el primero (1 desactiva los reintentos)
+    "max_attempts": int(os.getenv("RETRY_MAX_ATTEMPTS", "3")),
+    # Backoff exponencial con jitter: espera del primer reintento y espera máxima
+    "base_delay": float(os.getenv("RETRY_BASE_DELAY", "0.5")),
+    "max_delay": float(os.getenv("RETRY_MAX_DELAY", "4")),
+    # Estados transitorios del gateway que se reintentan (solo métodos idempotentes)
+    "retry_statuses": (429, 502, 503, 504),
+    # Presupuesto global: reintentos por solicitud enviada y mínimo siempre disponible
+    "budget_ratio": float(os.getenv("RETRY_BUDGET_RATIO", "0.2")),
+    "budget_min_retries": int(os.getenv("RETRY_BUDGET_MIN", "10")),
+}
+
+# Propagación de contexto de traza hacia Zipkin (ver common/tracing.py)
+TRACING_CONFIG = {
+    # Envía headers B3 y W3C traceparent con el node ID de la prueba como baggage
+    "enabled": os.getenv("TRACE_HEADERS", "true").lower() == "true",
+    # Interfaz de Zipkin para los enlaces de los reportes ("" los desactiva)
+    "zipkin_url": os.getenv("ZIPKIN_URL", "http://localhost:9411"),
+}
+
+# Registro estructurado del arnés (ver common/log.py)
+LOG_CONFIG = {
+    # Nivel de la consola: DEBUG muestra cada solicitud, WARNING solo avisos y errores
+    "console_level": os.getenv("TEST_LOG_LEVEL", "INFO"),
+    # Archivo JSONL con un registro por línea (uno por worker de xdist); vacío lo desactiva
+    "jsonl_path": os.getenv("TEST_LOG_FILE") or None,
+    "jsonl_level": os.getenv("TEST_LOG_FILE_LEVEL", "DEBUG"),
+    # Registros acumulados en memoria antes de escribirlos en el archivo
+    "buffer_size": int(os.getenv("TEST_LOG_BUFFER", "512")),
+}
+
+# Límites de conexiones del cliente asíncrono (por servicio)
+ASYNC_POOL_CONFIG = {
+    "limit_per_service": int(os.getenv("ASYNC_LIMIT_PER_SERVICE", "100")),
+    # Límites específicos, ej: {"favourite-service": 20}
+    "service_limits": {},
+}
+
 # Usuario de prueba para autenticación
 TEST_USER = {
     "username": "selimhorri",
@@ -66,7 +123,14 @@ TEST_USER = {
 # Configuración específica para E2E
 E2E_CONFIG = {
     "cleanup_after_test": True,
-    "max_retries": 3,
-    "retry_delay": 2,
     "test_data_prefix": "e2e_test_",
+    # Hilos para eliminar en paralelo los recursos de un mismo nivel de limpieza
+    "cleanup_workers": int(os.getenv("E2E_CLEANUP_WORKERS", "8")),
+    # "per_test" limpia tras cada prueba; "deferred" registra los recursos y
+    # los elimina todos juntos al final de la sesión
+    "cleanup_mode": os.getenv("E2E_CLEANUP_MODE", "per_test"),
+    # En modo diferido, elimina también restos con test_data_prefix de otras ejecuciones
+    "sweep_leftovers": os.getenv("E2E_SWEEP_LEFTOVERS", "true").lower() == "true",
+    # Solicitudes simultáneas de make_request_many (no debe superar pool_maxsize)
+    "batch_concurrency": int(os.getenv("E2E_BATCH_CONCURRENCY", "8")),
 }
@@ -3,9 +3,15 @@ Configuración global para las pruebas e2e.
 """
 
 import pytest
+import sys
 import uuid
 import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List
+import aiohttp
 import requests
 from config.config import (
     API_GATEWAY_URL,
@@ -14,30 +20,128 @@ from config.config import (
     REQUEST_TIMEOUT,
     SERVICES_CONFIG,
     E2E_CONFIG,
+    HTTP_POOL_CONFIG,
+    ASYNC_POOL_CONFIG,
+    TOKEN_CACHE_CONFIG,
+    LOG_CONFIG,
+    RETRY_CONFIG,
+    TIMEOUT_CONFIG,
+    TRACING_CONFIG,
 )
 
-_jwt_token = None
-_current_service = ""
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.http_client import (
+    SessionPool,
+    build_url,
+    build_headers,
+    encode_json_body,
+    JSONResponse,
+    merge_pool_stats,
+    format_pool_stats,
+)
+from common.async_client import AsyncSessionPool
+from common.auth import TokenManager, default_cache_path
+from common.context import ServiceContext, ServiceClient, submit_in_context
+from common.batch import BatchRequestError, run_many
+from common.json_stream import iter_response_collection, find_first, missing_ids
+from common.collection_index import CollectionIndex
+from common.log import configure_logging, get_logger, flush_logs
+from common.phase_timing import merge_phase_stats, format_phase_stats
+from common.timeouts import (
+    AdaptiveTimeouts,
+    endpoint_template,
+    format_timeout_stats,
+    is_read_timeout,
+)
+from common.timings import (
+    TimingRecorder,
+    set_current_node,
+    node_summary,
+    timings_from_export,
+    format_endpoint_summary,
+    html_header_cells,
+    html_row_cells,
+    html_endpoint_summary,
+)
+from common.retry import RetryPolicy, merge_retry_stats, format_retry_stats
+from common.tracing import Tracer
+
+configure_logging(LOG_CONFIG)
+_log = get_logger("e2e")
+
+_service_context = ServiceContext(SERVICES_CONFIG)
+_session_pool = SessionPool(SERVICES_CONFIG, HTTP_POOL_CONFIG)
+_token_manager = TokenManager(
+    TOKEN_CACHE_CONFIG["cache_path"]
+    or default_cache_path(
+        AUTH_ENDPOINT, TEST_USER["username"], TOKEN_CACHE_CONFIG["cache_dir"]
+    ),
+    refresh_margin=TOKEN_CACHE_CONFIG["refresh_margin"],
+)
+_async_session_pool = AsyncSessionPool(SERVICES_CONFIG, ASYNC_POOL_CONFIG)
+_retry_policy = RetryPolicy.from_config(RETRY_CONFIG)
+_adaptive_timeouts = AdaptiveTimeouts(REQUEST_TIMEOUT, TIMEOUT_CONFIG)
+_request_timings = TimingRecorder()
+_tracer = Tracer(TRACING_CONFIG)
+_worker_pool_stats = []
+_worker_auth_calls = []
+_worker_retry_stats = []
+_worker_request_timings = []
+_worker_phase_stats = []
+_deferred_resources = {}
+_deferred_lock = threading.Lock()
+
+
+def get_session_pool():
+    """Obtiene el pool de sesiones keep-alive compartido por las pruebas."""
+    return _session_pool
+
+
+def get_retry_policy():
+    """Obtiene la política de reintentos de make_request() (con su presupuesto global)."""
+    return _retry_policy
+
+
+def get_adaptive_timeouts():
+    """Obtiene los timeouts por plantilla de endpoint aprendidos del historial."""
+    return _adaptive_timeouts
+
+
+def get_tracer():
+    """Obtiene el generador de contexto de traza y enlaces a Zipkin de make_request()."""
+    return _tracer
+
+
+def get_request_timings():
+    """Obtiene el registro de duraciones de las solicitudes HTTP de este proceso."""
+    return _request_timings
+
+
+def get_service_context():
+    """Obtiene el contexto del servicio actual (propio de cada hilo y tarea)."""
+    return _service_context
 
 
 def set_current_service(service_name):
-    """Establece el servicio actual para las pruebas."""
-    global _current_service
-    if service_name in SERVICES_CONFIG:
-        _current_service = service_name
-    else:
-        raise ValueError(f"Servicio '{service_name}' no está configurado")
+    """Establece el servicio actual para las pruebas en el hilo o tarea actual."""
+    _service_context.set(service_name)
+    _log.debug("🔧 Servicio actual establecido: %s", service_name)
 
 
-def get_auth_token():
-    """Obtiene un token JWT de autenticación."""
-    global _jwt_token
+def service_client(service_name):
+    """Crea un cliente explícito para un servicio, independiente del servicio actual."""
+    _service_context.validate(service_name)
+    return ServiceClient(service_name, make_request, make_request_async)
 
-    if _jwt_token:
-        return _jwt_token
 
+def _authenticate():
+    """Llama al endpoint de autenticación y devuelve un token JWT nuevo."""
     try:
-        response = requests.post(
+        response = _session_pool.request(
+            "api-gateway",
+            "POST",
             AUTH_ENDPOINT,
             json={"username": TEST_USER["username"], "password": TEST_USER["password"]},
             headers={"Content-Type": "application/json", "Accept": "application/json"},
@@ -46,9 +150,9 @@ def get_auth_token():
 
         if response.status_code == 200:
             auth_data = response.json()
-            _jwt_token = auth_data.get("jwtToken")
-            if _jwt_token:
-                return _jwt_token
+            token = auth_data.get("jwtToken")
+            if token:
+                return token
             else:
                 raise Exception(f"Token no encontrado en la respuesta: {auth_data}")
         else:
@@ -60,67 +164,323 @@ def get_auth_token():
         raise Exception(f"Error de conexión al obtener token: {e}")
 
 
+async def _authenticate_async():
+    """Versión asíncrona de _authenticate()."""
+    try:
+        response = await _async_session_pool.request(
+            "api-gateway",
+            "POST",
+            AUTH_ENDPOINT,
+            json={"username": TEST_USER["username"], "password": TEST_USER["password"]},
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            timeout=REQUEST_TIMEOUT,
+        )
+    except aiohttp.ClientError as e:
+        raise Exception(f"Error de conexión al obtener token: {e}")
+
+    if response.status_code != 200:
+        raise Exception(
+            f"Error {response.status_code} al obtener token: {response.text}"
+        )
+
+    auth_data = response.json()
+    token = auth_data.get("jwtToken")
+    if not token:
+        raise Exception(f"Token no encontrado en la respuesta: {auth_data}")
+    return token
+
+
+def get_auth_token():
+    """Obtiene un token JWT compartido entre workers y renovado antes de expirar."""
+    return _token_manager.get_token(_authenticate)
+
+
+async def get_auth_token_async():
+    """Obtiene un token JWT sin bloquear el event loop (comparte caché con get_auth_token)."""
+    return await _token_manager.get_token_async(
+        _authenticate_async, _async_session_pool.lock("auth")
+    )
+
+
+def get_token_manager():
+    """Obtiene el gestor del token JWT (incluye el contador authenticate_calls)."""
+    return _token_manager
+
+
 def make_request(
     method, endpoint, data=None, params=None, headers=None, service_name=None
 ):
     """Realiza una solicitud HTTP al servicio especificado."""
-    if service_name is None:
-        service_name = _current_service
+    service_name = _service_context.resolve(service_name)
 
     service_config = SERVICES_CONFIG.get(service_name)
     if not service_config:
         raise ValueError(f"Servicio '{service_name}' no está configurado")
 
     # Construir URL completa
-    if endpoint.startswith("/"):
-        endpoint = endpoint[1:]
+    url = build_url(service_config, endpoint)
 
-    base_url = service_config["url"]
-    path_prefix = service_config["path_prefix"]
+    # Headers según el servicio
+    token = get_auth_token() if service_config.get("requires_auth", True) else None
+    request_headers = build_headers(service_config, token, headers)
+
+    session = _session_pool.session(service_name)
+    body = encode_json_body(data)
+    trace_id = _tracer.new_trace()
+    _log.debug(
+        "🌐 %s %s (servicio: %s, traza: %s)", method, url, service_name, trace_id
+    )
+
+    method = method.upper()
+    kwargs = {}
+    if method == "GET":
+        kwargs["params"] = params
+    elif method in ("POST", "PUT"):
+        kwargs["data"] = body
+    elif method != "DELETE":
+        raise ValueError(f"Método HTTP no soportado: {method}")
+
+    # Timeouts (conexión, lectura) de la plantilla del endpoint
+    template = endpoint_template(service_name, method, endpoint)
+    timeout = _adaptive_timeouts.timeout_for(template)
+
+    # Reintentos según la política compartida (ver common/retry.py)
+    start = time.perf_counter()
+    try:
+        response = _retry_policy.execute(
+            method,
+            _adaptive_timeouts.track(
+                template,
+                lambda: session.request(
+                    method,
+                    url,
+                    headers=_tracer.inject(request_headers, trace_id),
+                    timeout=timeout,
+                    **kwargs,
+                ),
+            ),
+            url=url,
+        )
+    except requests.exceptions.RequestException as e:
+        _request_timings.record(
+            method,
+            template,
+            service_name,
+            None,
+            time.perf_counter() - start,
+            trace_id,
+        )
+        _log.error("❌ Error en la solicitud a %s (traza: %s): %s", url, trace_id, e)
+        raise
+
+    _request_timings.record(
+        method,
+        template,
+        service_name,
+        response.status_code,
+        time.perf_counter() - start,
+        trace_id,
+    )
+    _adaptive_timeouts.record_response(template, response)
+    return JSONResponse(response)
+
+
+def make_request_many(requests, max_concurrency=None, raise_on_error=True):
+    """
+    Realiza un lote de solicitudes independientes de forma concurrente.
+
+    Las solicitudes son dicts con los argumentos de make_request() o tuplas
+    (método, endpoint[, data]); las respuestas se devuelven en el mismo orden.
+    Si alguna falla se lanza BatchRequestError, salvo con raise_on_error=False.
+    """
+    return run_many(
+        make_request,
+        requests,
+        max_concurrency=max_concurrency or E2E_CONFIG["batch_concurrency"],
+        raise_on_error=raise_on_error,
+    )
+
+
+def register_created(responses, resource_ids, id_field):
+    """
+    Registra para la limpieza los recursos creados por un lote, antes de validarlo.
+
+    Se usa con make_request_many(..., raise_on_error=False): se anota el ID de
+    cada respuesta exitosa y solo después se lanza el error del lote, de modo
+    que una solicitud fallida o una aserción posterior no dejan sin limpiar los
+    recursos que sí se crearon.
+
+    Args:
+        responses (list): Resultado de make_request_many().
+        resource_ids (list): Lista de cleanup_resources del tipo de recurso.
+        id_field (str): Campo con el ID en el cuerpo de la respuesta.
+
+    Raises:
+        BatchRequestError: Si alguna solicitud del lote lanzó una excepción.
+    """
+    errors = {}
+    for index, response in enumerate(responses):
+        if isinstance(response, Exception):
+            errors[index] = response
+        elif response.status_code == 200:
+            resource_id = response.json().get(id_field)
+            if resource_id is not None:
+                resource_ids.append(resource_id)
+    if errors:
+        raise BatchRequestError(responses, errors)
+
+
+def iter_collection(
+    endpoint, params=None, service_name=None, key="collection", chunk_size=None
+):
+    """
+    Recorre la colección de un endpoint findAll elemento a elemento, leyendo la
+    respuesta por fragmentos. Si el recorrido se interrumpe, la conexión se
+    cierra sin leer el resto.
+    """
+    service_name = _service_context.resolve(service_name)
+    service_config = SERVICES_CONFIG.get(service_name)
+    if not service_config:
+        raise ValueError(f"Servicio '{service_name}' no está configurado")
 
-    if path_prefix:
-        url = f"{base_url}/{path_prefix}/{endpoint}"
-    else:
-        url = f"{base_url}/{endpoint}"
+    url = build_url(service_config, endpoint)
+    token = get_auth_token() if service_config.get("requires_auth", True) else None
+    template = endpoint_template(service_name, "GET", endpoint)
+    trace_id = _tracer.new_trace()
+    # La duración cubre la lectura completa (o hasta que se interrumpe el
+    # recorrido); el estado queda en None si la respuesta no llega o se corta
+    start = time.perf_counter()
+    response = None
+    status = None
+    try:
+        response = _session_pool.session(service_name).get(
+            url,
+            headers=_tracer.inject(build_headers(service_config, token), trace_id),
+            params=params,
+            timeout=_adaptive_timeouts.timeout_for(template),
+            stream=True,
+        )
+        status = response.status_code
+        response.raise_for_status()
+        yield from iter_response_collection(response, key, chunk_size)
+    except requests.exceptions.HTTPError:
+        raise
+    except requests.exceptions.RequestException as e:
+        status = None
+        # Un corte por el timeout de lectura cuenta como muestra del endpoint
+        if is_read_timeout(e):
+            _adaptive_timeouts.record_timeout(template)
+        raise
+    finally:
+        if response is not None:
+            response.close()
+            if status is not None:
+                _adaptive_timeouts.record_response(template, response)
+        _request_timings.record(
+            "GET",
+            template,
+            service_name,
+            status,
+            time.perf_counter() - start,
+            trace_id,
+        )
 
-    # Headers según el servicio
-    request_headers = {"Content-Type": "application/json", "Accept": "application/json"}
 
+def find_in_collection(endpoint, predicate, **kwargs):
+    """Devuelve el primer elemento de la colección que cumple `predicate` (o None)."""
+    return find_first(iter_collection(endpoint, **kwargs), predicate)
+
+
+def missing_from_collection(endpoint, id_field, ids, **kwargs):
+    """Devuelve los IDs esperados que no aparecen en la colección (vacío si están todos)."""
+    return missing_ids(iter_collection(endpoint, **kwargs), id_field, ids)
+
+
+def index_collection(endpoint, key, only=None, **kwargs):
+    """
+    Indexa por clave primaria (simple o compuesta) la colección de un endpoint
+    findAll. Con `only` se conservan solo esas claves.
+    """
+    return CollectionIndex(iter_collection(endpoint, **kwargs), key, only)
+
+
+async def make_request_async(
+    method, endpoint, data=None, params=None, headers=None, service_name=None
+):
+    """Realiza una solicitud HTTP asíncrona al servicio especificado."""
+    service_name = _service_context.resolve(service_name)
+
+    service_config = SERVICES_CONFIG.get(service_name)
+    if not service_config:
+        raise ValueError(f"Servicio '{service_name}' no está configurado")
+
+    url = build_url(service_config, endpoint)
+    trace_id = _tracer.new_trace()
+    _log.debug(
+        "🌐 %s %s (servicio: %s, traza: %s)", method, url, service_name, trace_id
+    )
+
+    token = None
     if service_config.get("requires_auth", True):
-        token = get_auth_token()
-        request_headers["Authorization"] = f"Bearer {token}"
+        token = await get_auth_token_async()
+    request_headers = build_headers(service_config, token, headers)
+
+    kwargs = {}
+    if method.upper() == "GET":
+        kwargs["params"] = params
+    elif method.upper() in ("POST", "PUT"):
+        kwargs["data"] = encode_json_body(data)
+    elif method.upper() != "DELETE":
+        raise ValueError(f"Método HTTP no soportado: {method}")
+
+    template = endpoint_template(service_name, method, endpoint)
+    timeout = _adaptive_timeouts.timeout_for(template)
+
+    # Reintentos según la política compartida (ver common/retry.py)
+    start = time.perf_counter()
+    try:
+        response = await _retry_policy.execute_async(
+            method.upper(),
+            _adaptive_timeouts.track_async(
+                template,
+                lambda: _async_session_pool.request(
+                    service_name,
+                    method.upper(),
+                    url,
+                    headers=_tracer.inject(request_headers, trace_id),
+                    timeout=timeout,
+                    **kwargs,
+                ),
+            ),
+            url=url,
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        _request_timings.record(
+            method.upper(),
+            template,
+            service_name,
+            None,
+            time.perf_counter() - start,
+            trace_id,
+        )
+        _log.error("❌ Error en la solicitud a %s (traza: %s): %s", url, trace_id, e)
+        raise
 
-    if headers:
-        request_headers.update(headers)
+    _request_timings.record(
+        method.upper(),
+        template,
+        service_name,
+        response.status_code,
+        time.perf_counter() - start,
+        trace_id,
+    )
+    _adaptive_timeouts.record_response(template, response)
+    return response
 
-    # Realizar solicitud con reintentos
-    for attempt in range(E2E_CONFIG["max_retries"]):
-        try:
-            if method.upper() == "GET":
-                return requests.get(
-                    url, headers=request_headers, params=params, timeout=REQUEST_TIMEOUT
-                )
-            elif method.upper() == "POST":
-                return requests.post(
-                    url, headers=request_headers, json=data, timeout=REQUEST_TIMEOUT
-                )
-            elif method.upper() == "PUT":
-                return requests.put(
-                    url, headers=request_headers, json=data, timeout=REQUEST_TIMEOUT
-                )
-            elif method.upper() == "DELETE":
-                return requests.delete(
-                    url, headers=request_headers, timeout=REQUEST_TIMEOUT
-                )
-            else:
-                raise ValueError(f"Método HTTP no soportado: {method}")
 
-        except requests.exceptions.RequestException as e:
-            if attempt < E2E_CONFIG["max_retries"] - 1:
-                time.sleep(E2E_CONFIG["retry_delay"])
-                continue
-            else:
-                raise
+async def close_async_sessions():
+    """Cierra las sesiones del cliente asíncrono en el loop actual."""
+    await _async_session_pool.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -130,8 +490,11 @@ def setup_e2e_environment():
 
     # Verificar conectividad básica con el API Gateway
     try:
-        response = requests.get(
-            f"{API_GATEWAY_URL}/actuator/health", timeout=REQUEST_TIMEOUT
+        response = _session_pool.request(
+            "api-gateway",
+            "GET",
+            f"{API_GATEWAY_URL}/actuator/health",
+            timeout=REQUEST_TIMEOUT,
         )
         if response.status_code not in [200, 404]:
             pytest.fail("API Gateway no está disponible para las pruebas E2E")
@@ -142,11 +505,20 @@ def setup_e2e_environment():
     yield
     print("\n=== Limpieza del entorno de pruebas E2E ===")
 
+    # Limpieza diferida: todos los recursos registrados en una sola pasada
+    if E2E_CONFIG["cleanup_mode"] == "deferred":
+        resources = pop_deferred_resources()
+        total = sum(len(ids) for ids in resources.values())
+        if total:
+            print(f"🧹 Eliminando {total} recursos registrados durante la sesión")
+            cleanup_test_data(resources)
 
-@pytest.fixture
-def cleanup_resources():
-    """Fixture para limpiar recursos creados durante las pruebas E2E."""
-    created_resources = {
+    _session_pool.close()
+
+
+def new_cleanup_resources() -> Dict[str, List]:
+    """Crea el registro vacío de recursos de una prueba (el valor de cleanup_resources)."""
+    return {
         "users": [],
         "products": [],
         "categories": [],
@@ -160,62 +532,337 @@ def cleanup_resources():
         "verification_tokens": [],
     }
 
-    yield created_resources
 
+def release_cleanup_resources(resources: Dict[str, List]):
+    """Elimina los recursos de una prueba, o los difiere al final de la sesión, según E2E_CONFIG."""
     # Cleanup en orden de dependencias
     if E2E_CONFIG["cleanup_after_test"]:
-        cleanup_test_data(created_resources)
+        if E2E_CONFIG["cleanup_mode"] == "deferred":
+            register_deferred_resources(resources)
+        else:
+            cleanup_test_data(resources)
+
+
+@pytest.fixture
+def cleanup_resources():
+    """Fixture para limpiar recursos creados durante las pruebas E2E."""
+    created_resources = new_cleanup_resources()
+
+    yield created_resources
+
+    release_cleanup_resources(created_resources)
+
+
+def register_deferred_resources(resources: Dict[str, List]):
+    """Registra recursos para eliminarlos al final de la sesión (modo diferido)."""
+    with _deferred_lock:
+        for resource_type, resource_ids in resources.items():
+            _deferred_resources.setdefault(resource_type, []).extend(resource_ids)
+
+
+def pop_deferred_resources() -> Dict[str, List]:
+    """Obtiene y vacía el registro de recursos pendientes de limpieza."""
+    global _deferred_resources
+    with _deferred_lock:
+        resources, _deferred_resources = _deferred_resources, {}
+    # Eliminar duplicados conservando el orden de registro
+    return {
+        resource_type: list(dict.fromkeys(resource_ids))
+        for resource_type, resource_ids in resources.items()
+    }
+
+
+# Niveles de limpieza por dependencias: los recursos de un mismo nivel no
+# dependen entre sí y se eliminan en paralelo; los niveles se procesan en orden.
+CLEANUP_LEVELS = [
+    [
+        ("verification_tokens", "user-service", "api/verificationTokens"),
+        ("addresses", "user-service", "api/address"),
+        ("favourites", "favourite-service", "api/favourites"),
+        ("shippings", "shipping-service", "api/shippings"),
+        ("payments", "payment-service", "api/payments"),
+    ],
+    [
+        ("credentials", "user-service", "api/credentials"),
+        ("orders", "order-service", "api/orders"),
+        ("products", "product-service", "api/products"),
+    ],
+    [
+        ("carts", "order-service", "api/carts"),
+        ("categories", "product-service", "api/categories"),
+        ("users", "user-service", "api/users"),
+    ],
+]
+
+
+def _delete_resource(service_name, endpoint, resource_id):
+    """Elimina un recurso y devuelve el error como texto (o None si tuvo éxito)."""
+    if isinstance(resource_id, tuple):
+        # Para recursos con múltiples IDs (como favourites)
+        delete_url = f"{endpoint}/" + "/".join(map(str, resource_id))
+    else:
+        delete_url = f"{endpoint}/{resource_id}"
+
+    try:
+        response = make_request("DELETE", delete_url, service_name=service_name)
+    except Exception as e:
+        return f"DELETE {delete_url} ({service_name}): {e}"
+
+    if response.status_code >= 400:
+        return f"DELETE {delete_url} ({service_name}): HTTP {response.status_code}"
+    return None
 
 
 def cleanup_test_data(resources: Dict[str, List]):
-    """Limpia los recursos de prueba creados."""
-    cleanup_order = [
-        ("verification_tokens", "api/verificationTokens"),
-        ("credentials", "api/credentials"),
-        ("addresses", "api/address"),
-        ("favourites", "api/favourites"),
-        ("shippings", "api/shippings"),
-        ("payments", "api/payments"),
-        ("orders", "api/orders"),
-        ("carts", "api/carts"),
-        ("products", "api/products"),
-        ("categories", "api/categories"),
-        ("users", "api/users"),
+    """
+    Limpia los recursos de prueba creados.
+
+    Cada nivel de CLEANUP_LEVELS se elimina en paralelo con un pool acotado de
+    E2E_CONFIG["cleanup_workers"] hilos. Los errores se acumulan y se informan
+    al final en lugar de ignorarse.
+
+    Returns:
+        list: Descripción de cada eliminación fallida.
+    """
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=E2E_CONFIG["cleanup_workers"]) as executor:
+        for level in CLEANUP_LEVELS:
+            futures = [
+                submit_in_context(
+                    executor, _delete_resource, service_name, endpoint, resource_id
+                )
+                for resource_type, service_name, endpoint in level
+                for resource_id in resources.get(resource_type, [])
+            ]
+            for future in futures:
+                error = future.result()
+                if error:
+                    errors.append(error)
+
+    if errors:
+        print(f"\n⚠️ {len(errors)} errores durante la limpieza de datos E2E:")
+        for error in errors:
+            print(f"  - {error}")
+
+    return errors
+
+
+# Colecciones revisadas en el barrido de restos:
+# (tipo de recurso, servicio, endpoint, campo ID, campos con el prefijo de prueba).
+# Carritos, favoritos, pagos y envíos no se barren: solo guardan IDs de otros
+# recursos y fechas, sin ningún campo donde las pruebas pongan el prefijo, así
+# que sus restos no se distinguen de los datos reales
+SWEEP_TARGETS = [
+    (
+        "verification_tokens",
+        "user-service",
+        "api/verificationTokens",
+        "verificationTokenId",
+        ["token"],
+    ),
+    ("credentials", "user-service", "api/credentials", "credentialId", ["username"]),
+    ("addresses", "user-service", "api/address", "addressId", ["fullAddress"]),
+    ("users", "user-service", "api/users", "userId", ["firstName", "email"]),
+    ("orders", "order-service", "api/orders", "orderId", ["orderDesc"]),
+    (
+        "products",
+        "product-service",
+        "api/products",
+        "productId",
+        ["productTitle", "sku"],
+    ),
+    (
+        "categories",
+        "product-service",
+        "api/categories",
+        "categoryId",
+        ["categoryTitle"],
+    ),
+]
+
+
+def _find_prefixed_in_collection(service_name, endpoint, id_field, name_fields, prefix):
+    """Devuelve los IDs de una colección cuyos campos de nombre contienen el prefijo."""
+    response = make_request("GET", endpoint, service_name=service_name)
+    if response.status_code != 200:
+        return []
+
+    return [
+        item[id_field]
+        for item in response.json().get("collection", [])
+        if item.get(id_field) is not None
+        and any(prefix in str(item.get(field) or "") for field in name_fields)
     ]
 
-    for resource_type, endpoint in cleanup_order:
-        resource_ids = resources.get(resource_type, [])
-        for resource_id in resource_ids:
+
+def find_prefixed_leftovers(prefix=None) -> Dict[str, List]:
+    """
+    Busca en las colecciones restos de datos de prueba de ejecuciones anteriores.
+
+    Los IDs generados por generate_unique_id() van embebidos en los nombres
+    (ej: 'John_e2e_test_1a2b3c4d'), por lo que se buscan los registros cuyos
+    campos de nombre contienen E2E_CONFIG["test_data_prefix"].
+    """
+    if prefix is None:
+        prefix = E2E_CONFIG["test_data_prefix"]
+
+    leftovers = {}
+    with ThreadPoolExecutor(max_workers=E2E_CONFIG["cleanup_workers"]) as executor:
+        futures = {
+            resource_type: submit_in_context(
+                executor,
+                _find_prefixed_in_collection,
+                service_name,
+                endpoint,
+                id_field,
+                name_fields,
+                prefix,
+            )
+            for resource_type, service_name, endpoint, id_field, name_fields in SWEEP_TARGETS
+        }
+        for resource_type, future in futures.items():
             try:
-                # Determinar el servicio correcto para cada tipo de recurso
-                if resource_type in [
-                    "users",
-                    "addresses",
-                    "credentials",
-                    "verification_tokens",
-                ]:
-                    set_current_service("user-service")
-                elif resource_type in ["products", "categories"]:
-                    set_current_service("product-service")
-                elif resource_type in ["orders", "carts"]:
-                    set_current_service("order-service")
-                elif resource_type == "payments":
-                    set_current_service("payment-service")
-                elif resource_type == "favourites":
-                    set_current_service("favourite-service")
-                elif resource_type == "shippings":
-                    set_current_service("shipping-service")
-
-                # Realizar eliminación
-                if isinstance(resource_id, tuple):
-                    # Para recursos con múltiples IDs (como favourites)
-                    delete_url = f"{endpoint}/" + "/".join(map(str, resource_id))
-                else:
-                    delete_url = f"{endpoint}/{resource_id}"
-
-                make_request("DELETE", delete_url)
-            except Exception:
-                pass  # Ignorar errores de limpieza
+                leftovers[resource_type] = future.result()
+            except Exception as e:
+                print(f"⚠️ No se pudo revisar {resource_type}: {e}")
+    return leftovers
+
+
+def sweep_test_data():
+    """Elimina los restos de datos de prueba encontrados por prefijo."""
+    leftovers = find_prefixed_leftovers()
+    total = sum(len(ids) for ids in leftovers.values())
+    if total:
+        print(f"\n🧹 Barrido final: {total} recursos con prefijo de prueba")
+        return cleanup_test_data(leftovers)
+    return []
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Asocia las solicitudes HTTP de la prueba (setup, llamada y teardown) a su node ID."""
+    set_current_node(item.nodeid)
+    yield
+    set_current_node(None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Adjunta al reporte de cada fase el resumen de las solicitudes de la prueba."""
+    outcome = yield
+    outcome.get_result().request_timing = node_summary(
+        _request_timings.for_node(item.nodeid)
+    )
+
+
+@pytest.fixture
+def request_timings(request):
+    """Solicitudes HTTP (RequestTiming) de la prueba en curso; crece con cada solicitud."""
+    return _request_timings.for_node(request.node.nodeid)
+
+
+def _all_request_timings():
+    """Solicitudes de este proceso y de los workers de xdist."""
+    return _request_timings.all() + _worker_request_timings
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_table_header(cells):
+    """Agrega al reporte HTML las columnas de solicitudes y tiempo HTTP."""
+    cells[3:3] = html_header_cells()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_table_row(report, cells):
+    """Completa las columnas de solicitudes y tiempo HTTP de cada prueba."""
+    cells[3:3] = html_row_cells(
+        getattr(report, "request_timing", None), _tracer.trace_url
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Agrega al resumen del reporte HTML la latencia por endpoint."""
+    postfix.extend(
+        html_endpoint_summary(_all_request_timings(), trace_link=_tracer.trace_url)
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Publica las estadísticas del pool hacia xdist y guarda el historial de latencias."""
+    flush_logs()
+    _adaptive_timeouts.save()
+    workeroutput = getattr(session.config, "workeroutput", None)
+
+    # El barrido por prefijo solo se hace en el proceso principal, cuando ya
+    # terminaron todos los workers, para no borrar datos de pruebas en curso
+    # (ni con --collect-only, que también usa el generador de carga)
+    if (
+        workeroutput is None
+        and not session.config.option.collectonly
+        and E2E_CONFIG["cleanup_mode"] == "deferred"
+        and E2E_CONFIG["sweep_leftovers"]
+    ):
+        try:
+            sweep_test_data()
+        except Exception as e:
+            print(f"⚠️ Error en el barrido final de datos de prueba: {e}")
+
+    if workeroutput is not None:
+        workeroutput["http_pool_stats"] = _session_pool.stats()
+        workeroutput["auth_calls"] = _token_manager.authenticate_calls
+        workeroutput["retry_stats"] = _retry_policy.stats()
+        workeroutput["request_timings"] = _request_timings.export()
+        workeroutput["phase_stats"] = _session_pool.phase_stats()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Recoge las estadísticas del pool, de autenticación y de reintentos de cada worker."""
+    workeroutput = getattr(node, "workeroutput", {})
+    stats = workeroutput.get("http_pool_stats")
+    if stats:
+        _worker_pool_stats.append(stats)
+    _worker_auth_calls.append(workeroutput.get("auth_calls", 0))
+    _worker_retry_stats.append(workeroutput.get("retry_stats", {}))
+    _worker_request_timings.extend(
+        timings_from_export(workeroutput.get("request_timings", []))
+    )
+    _worker_phase_stats.append(workeroutput.get("phase_stats", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Muestra las estadísticas del pool, reintentos, timeouts, latencia por endpoint y fases."""
+    stats = merge_pool_stats(_session_pool.stats(), *_worker_pool_stats)
+    terminalreporter.write_sep("=", "Pool de conexiones HTTP")
+    for line in format_pool_stats(stats):
+        terminalreporter.write_line(line)
+
+    auth_calls = _token_manager.authenticate_calls + sum(_worker_auth_calls)
+    terminalreporter.write_line(f"🔐 Llamadas a {AUTH_ENDPOINT}: {auth_calls}")
+
+    retry_stats = merge_retry_stats(_retry_policy.stats(), *_worker_retry_stats)
+    terminalreporter.write_line(format_retry_stats(retry_stats))
+    terminalreporter.write_line(
+        format_timeout_stats(_adaptive_timeouts, verbose=terminalreporter.verbosity > 1)
+    )
+
+    endpoint_lines = format_endpoint_summary(
+        _all_request_timings(), trace_link=_tracer.trace_url
+    )
+    if endpoint_lines:
+        terminalreporter.write_sep("=", "Latencia por endpoint")
+        for line in endpoint_lines:
+            terminalreporter.write_line(line)
+
+    phase_lines = format_phase_stats(
+        merge_phase_stats(_session_pool.phase_stats(), *_worker_phase_stats)
+    )
+    if phase_lines:
+        terminalreporter.write_sep("=", "Fases de las solicitudes HTTP")
+        for line in phase_lines:
+            terminalreporter.write_line(line)
 
 
 def generate_unique_id():
@@ -3,7 +3,13 @@ Pruebas E2E para el Favourite Service.
 """
 
 import pytest
-from conftest import make_request, set_current_service, generate_unique_id
+from conftest import (
+    make_request,
+    index_collection,
+    set_current_service,
+    generate_unique_id,
+)
+from common.collection_index import PRIMARY_KEYS, resource_keys
 
 
 class TestFavouriteServiceE2E:
@@ -124,18 +130,15 @@ class TestFavouriteServiceE2E:
             assert favourite["userId"] == user_id
             assert favourite["productId"] in products_to_like
 
-        # 3. Listar todos los favoritos y verificar presencia
-        all_favourites_response = make_request("GET", "/api/favourites")
-        assert all_favourites_response.status_code == 200
-        all_favourites = all_favourites_response.json()["collection"]
-
-        # Verificar que nuestros favoritos están en la lista
-        our_favourites = [
-            fav
-            for fav in all_favourites
-            if fav["userId"] == user_id and fav["productId"] in products_to_like
-        ]
-        assert len(our_favourites) >= len(created_favourites)
+        # 3. Listar todos los favoritos y verificar que los nuestros están en la lista
+        our_favourites = index_collection(
+            "/api/favourites",
+            PRIMARY_KEYS["favourites"],
+            only=resource_keys("favourites", created_favourites),
+        )
+        our_favourites.assert_contains(
+            created_favourites, fields=("userId", "productId")
+        )
 
         # 4. Obtener cada favorito individualmente
         for favourite in created_favourites:
@@ -347,19 +350,15 @@ class TestFavouriteServiceE2E:
             assert favourite["productId"] == popular_product_id
             assert favourite["userId"] in user_ids
 
-        # 3. Contar cuántos usuarios marcaron este producto como favorito
-        all_favourites_response = make_request("GET", "/api/favourites")
-        assert all_favourites_response.status_code == 200
-        all_favourites = all_favourites_response.json()["collection"]
-
-        # Filtrar favoritos para nuestro producto popular
-        product_favourites = [
-            fav
-            for fav in all_favourites
-            if fav["productId"] == popular_product_id and fav["userId"] in user_ids
-        ]
-
-        assert len(product_favourites) >= len(created_favourites)
+        # 3. Verificar que todos los favoritos de este producto están en la lista
+        product_favourites = index_collection(
+            "/api/favourites",
+            PRIMARY_KEYS["favourites"],
+            only=resource_keys("favourites", created_favourites),
+        )
+        assert not product_favourites.missing(
+            resource_keys("favourites", created_favourites)
+        )
 
         # 4. Verificar que cada usuario puede acceder a su favorito
         for favourite in created_favourites:
@@ -446,16 +445,12 @@ class TestFavouriteServiceE2E:
             assert favourite["productId"] == favourite_entries[i]["productId"]
 
         # 3. Obtener todos los favoritos del usuario
-        all_favourites_response = make_request("GET", "/api/favourites")
-        assert all_favourites_response.status_code == 200
-        all_favourites = all_favourites_response.json()["collection"]
-
-        user_favourites = [
-            fav
-            for fav in all_favourites
-            if fav["userId"] == user_id and fav["productId"] in [1, 2, 3]
-        ]
-        assert len(user_favourites) >= 3
+        user_favourites = index_collection(
+            "/api/favourites",
+            PRIMARY_KEYS["favourites"],
+            only=resource_keys("favourites", created_favourites),
+        )
+        user_favourites.assert_contains(created_favourites, fields=("likeDate",))
 
         # 4. Actualizar timestamp de uno de los favoritos
         favourite_to_update = created_favourites[1]  # El del medio
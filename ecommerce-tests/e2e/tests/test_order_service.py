@@ -3,7 +3,14 @@ Pruebas E2E para el Order Service.
 """
 
 import pytest
-from conftest import make_request, set_current_service, generate_unique_id
+from conftest import (
+    make_request,
+    make_request_many,
+    register_created,
+    missing_from_collection,
+    set_current_service,
+    generate_unique_id,
+)
 
 
 class TestOrderServiceE2E:
@@ -52,16 +59,8 @@ class TestOrderServiceE2E:
         assert updated_cart["userId"] == 2
         assert updated_cart["cartId"] == cart_id
 
-        # 4. Listar todos los carritos
-        all_carts_response = make_request("GET", "/api/carts")
-        assert all_carts_response.status_code == 200
-        carts_collection = all_carts_response.json()
-        assert "collection" in carts_collection
-        assert isinstance(carts_collection["collection"], list)
-
-        # Verificar que nuestro carrito está en la lista
-        cart_ids = [cart["cartId"] for cart in carts_collection["collection"]]
-        assert cart_id in cart_ids
+        # 4. Listar todos los carritos y verificar que nuestro carrito está en la lista
+        assert not missing_from_collection("/api/carts", "cartId", [cart_id])
 
     def test_e2e_order_from_cart_workflow(self, cleanup_resources):
         """
@@ -124,13 +123,19 @@ class TestOrderServiceE2E:
         # 1. Crear múltiples carritos
         carts_data = [{"userId": 1}, {"userId": 2}, {"userId": 3}]
 
+        cart_responses = make_request_many(
+            [
+                {"method": "POST", "endpoint": "/api/carts", "data": cart_data}
+                for cart_data in carts_data
+            ],
+            raise_on_error=False,
+        )
+        register_created(cart_responses, cleanup_resources["carts"], "cartId")
+
         created_carts = []
-        for cart_data in carts_data:
-            response = make_request("POST", "/api/carts", data=cart_data)
+        for response in cart_responses:
             assert response.status_code == 200
-            cart = response.json()
-            created_carts.append(cart)
-            cleanup_resources["carts"].append(cart["cartId"])
+            created_carts.append(response.json())
 
         # 2. Crear órdenes para cada carrito
         orders_data = [
@@ -151,31 +156,33 @@ class TestOrderServiceE2E:
             },
         ]
 
+        order_responses = make_request_many(
+            [
+                {"method": "POST", "endpoint": "/api/orders", "data": order_data}
+                for order_data in orders_data
+            ],
+            raise_on_error=False,
+        )
+        register_created(order_responses, cleanup_resources["orders"], "orderId")
+
         created_orders = []
-        for order_data in orders_data:
-            response = make_request("POST", "/api/orders", data=order_data)
+        for response in order_responses:
             assert response.status_code == 200
-            order = response.json()
-            created_orders.append(order)
-            cleanup_resources["orders"].append(order["orderId"])
-
-        # 3. Listar todas las órdenes
-        all_orders_response = make_request("GET", "/api/orders")
-        assert all_orders_response.status_code == 200
-        orders_collection = all_orders_response.json()
-        assert "collection" in orders_collection
-        assert isinstance(orders_collection["collection"], list)
+            created_orders.append(response.json())
 
-        # 4. Verificar que todas las órdenes creadas están en la lista
-        all_order_ids = [order["orderId"] for order in orders_collection["collection"]]
-        for created_order in created_orders:
-            assert created_order["orderId"] in all_order_ids
+        # 3-4. Listar todas las órdenes y verificar que las creadas están en la lista
+        missing_orders = missing_from_collection(
+            "/api/orders", "orderId", [order["orderId"] for order in created_orders]
+        )
+        assert not missing_orders, f"Órdenes no encontradas: {missing_orders}"
 
         # 5. Verificar órdenes individualmente
-        for created_order in created_orders:
-            specific_order_response = make_request(
-                "GET", f"/api/orders/{created_order['orderId']}"
-            )
+        specific_order_responses = make_request_many(
+            [("GET", f"/api/orders/{order['orderId']}") for order in created_orders]
+        )
+        for created_order, specific_order_response in zip(
+            created_orders, specific_order_responses
+        ):
             assert specific_order_response.status_code == 200
             retrieved_order = specific_order_response.json()
             assert retrieved_order["orderId"] == created_order["orderId"]
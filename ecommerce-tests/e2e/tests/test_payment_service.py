@@ -3,7 +3,16 @@ Pruebas E2E para el Payment Service.
 """
 
 import pytest
-from conftest import make_request, set_current_service, generate_unique_id
+from conftest import (
+    make_request,
+    make_request_many,
+    register_created,
+    missing_from_collection,
+    index_collection,
+    set_current_service,
+    generate_unique_id,
+)
+from common.collection_index import PRIMARY_KEYS
 
 
 class TestPaymentServiceE2E:
@@ -141,13 +150,16 @@ class TestPaymentServiceE2E:
             },
         ]
 
+        payment_responses = make_request_many(
+            [("POST", "/api/payments", payment_data) for payment_data in payments_data],
+            raise_on_error=False,
+        )
+        register_created(payment_responses, cleanup_resources["payments"], "paymentId")
+
         created_payments = []
-        for payment_data in payments_data:
-            response = make_request("POST", "/api/payments", data=payment_data)
+        for response in payment_responses:
             assert response.status_code == 200
-            payment = response.json()
-            created_payments.append(payment)
-            cleanup_resources["payments"].append(payment["paymentId"])
+            created_payments.append(response.json())
 
         # 2. Procesar cada pago hasta completion
         for i, payment in enumerate(created_payments):
@@ -169,25 +181,22 @@ class TestPaymentServiceE2E:
             assert final_payment["isPayed"] is True
             assert final_payment["paymentStatus"] == "COMPLETED"
 
-        # 3. Listar todos los pagos
-        all_payments_response = make_request("GET", "/api/payments")
-        assert all_payments_response.status_code == 200
-        payments_collection = all_payments_response.json()
-        assert "collection" in payments_collection
-        assert isinstance(payments_collection["collection"], list)
-
-        # 4. Verificar que todos los pagos creados están en la lista
-        all_payment_ids = [
-            payment["paymentId"] for payment in payments_collection["collection"]
-        ]
-        for created_payment in created_payments:
-            assert created_payment["paymentId"] in all_payment_ids
+        # 3-4. Listar todos los pagos y verificar que los creados están en la lista
+        missing_payments = missing_from_collection(
+            "/api/payments",
+            "paymentId",
+            [payment["paymentId"] for payment in created_payments],
+        )
+        assert not missing_payments, f"Pagos no encontrados: {missing_payments}"
 
         # 5. Verificar que todos los pagos están completados
-        for created_payment in created_payments:
-            specific_payment_response = make_request(
-                "GET", f"/api/payments/{created_payment['paymentId']}"
-            )
+        specific_payment_responses = make_request_many(
+            [
+                ("GET", f"/api/payments/{payment['paymentId']}")
+                for payment in created_payments
+            ]
+        )
+        for specific_payment_response in specific_payment_responses:
             assert specific_payment_response.status_code == 200
             retrieved_payment = specific_payment_response.json()
             assert retrieved_payment["isPayed"] is True
@@ -261,19 +270,24 @@ class TestPaymentServiceE2E:
         order_ids = [1, 2, 3]
         payment_statuses = ["NOT_STARTED", "IN_PROGRESS", "NOT_STARTED"]
 
-        created_payments = []
-        for i, order_id in enumerate(order_ids):
-            payment_data = {
+        payments_data = [
+            {
                 "isPayed": False,
                 "paymentStatus": payment_statuses[i],
                 "order": {"orderId": order_id},
             }
+            for i, order_id in enumerate(order_ids)
+        ]
+        payment_responses = make_request_many(
+            [("POST", "/api/payments", payment_data) for payment_data in payments_data],
+            raise_on_error=False,
+        )
+        register_created(payment_responses, cleanup_resources["payments"], "paymentId")
 
-            response = make_request("POST", "/api/payments", data=payment_data)
+        created_payments = []
+        for response in payment_responses:
             assert response.status_code == 200
-            payment = response.json()
-            created_payments.append(payment)
-            cleanup_resources["payments"].append(payment["paymentId"])
+            created_payments.append(response.json())
 
         # 2. Procesar pagos en diferentes estados
         # Procesar los que están en NOT_STARTED
@@ -282,49 +296,47 @@ class TestPaymentServiceE2E:
         ]
         for payment in not_started_payments:
             payment["paymentStatus"] = "IN_PROGRESS"
-            response = make_request("PUT", "/api/payments", data=payment)
+        for response in make_request_many(
+            [("PUT", "/api/payments", payment) for payment in not_started_payments]
+        ):
             assert response.status_code == 200
 
         # 3. Completar todos los pagos que están en IN_PROGRESS
-        all_payments_response = make_request("GET", "/api/payments")
-        assert all_payments_response.status_code == 200
-        all_payments = all_payments_response.json()["collection"]
-
-        # Filtrar solo nuestros pagos creados
+        # Indexar solo nuestros pagos creados
         our_payment_ids = [p["paymentId"] for p in created_payments]
-        our_payments = [p for p in all_payments if p["paymentId"] in our_payment_ids]
+        our_payments = index_collection(
+            "/api/payments", PRIMARY_KEYS["payments"], only=our_payment_ids
+        )
+        assert not our_payments.missing(our_payment_ids)
 
-        for payment in our_payments:
-            if payment["paymentStatus"] == "IN_PROGRESS":
-                payment["isPayed"] = True
-                payment["paymentStatus"] = "COMPLETED"
-                response = make_request("PUT", "/api/payments", data=payment)
-                assert response.status_code == 200
+        in_progress_payments = [
+            p for p in our_payments.values() if p["paymentStatus"] == "IN_PROGRESS"
+        ]
+        for payment in in_progress_payments:
+            payment["isPayed"] = True
+            payment["paymentStatus"] = "COMPLETED"
+        for response in make_request_many(
+            [("PUT", "/api/payments", payment) for payment in in_progress_payments]
+        ):
+            assert response.status_code == 200
 
         # 4. Verificar que todos los pagos están completados
-        for payment_id in our_payment_ids:
-            check_response = make_request("GET", f"/api/payments/{payment_id}")
+        check_responses = make_request_many(
+            [("GET", f"/api/payments/{payment_id}") for payment_id in our_payment_ids]
+        )
+        for check_response in check_responses:
             assert check_response.status_code == 200
             checked_payment = check_response.json()
             assert checked_payment["isPayed"] is True
             assert checked_payment["paymentStatus"] == "COMPLETED"
 
         # 5. Generar "reporte" listando todos los pagos completados
-        final_payments_response = make_request("GET", "/api/payments")
-        assert final_payments_response.status_code == 200
-        final_payments = final_payments_response.json()["collection"]
-
-        # Contar pagos completados de nuestro lote
-        completed_payments = [
-            p
-            for p in final_payments
-            if p["paymentId"] in our_payment_ids and p["paymentStatus"] == "COMPLETED"
-        ]
-
-        # Verificar que todos nuestros pagos están completados
-        assert len(completed_payments) == len(created_payments)
+        final_payments = index_collection(
+            "/api/payments", PRIMARY_KEYS["payments"], only=our_payment_ids
+        )
 
-        # Verificar que cada pago completado tiene isPayed = True
-        for payment in completed_payments:
-            assert payment["isPayed"] is True
-            assert payment["paymentStatus"] == "COMPLETED"
+        # Verificar que todos nuestros pagos están completados y con isPayed = True
+        final_payments.assert_contains(
+            {"paymentId": payment_id, "isPayed": True, "paymentStatus": "COMPLETED"}
+            for payment_id in our_payment_ids
+        )
@@ -3,7 +3,12 @@ Pruebas E2E para el Product Service.
 """
 
 import pytest
-from conftest import make_request, set_current_service, generate_unique_id
+from conftest import (
+    make_request,
+    missing_from_collection,
+    set_current_service,
+    generate_unique_id,
+)
 
 
 class TestProductServiceE2E:
@@ -57,18 +62,10 @@ class TestProductServiceE2E:
         updated_category = update_response.json()
         assert updated_category["categoryTitle"] == f"Updated_Electronics_{unique_id}"
 
-        # 4. Listar todas las categorías
-        all_categories_response = make_request("GET", "/api/categories")
-        assert all_categories_response.status_code == 200
-        categories_collection = all_categories_response.json()
-        assert "collection" in categories_collection
-        assert isinstance(categories_collection["collection"], list)
-
-        # Verificar que nuestra categoría está en la lista
-        category_ids = [
-            cat["categoryId"] for cat in categories_collection["collection"]
-        ]
-        assert category_id in category_ids
+        # 4. Listar todas las categorías y verificar que la nuestra está en la lista
+        assert not missing_from_collection(
+            "/api/categories", "categoryId", [category_id]
+        )
 
     def test_e2e_product_with_category_workflow(self, cleanup_resources):
         """
@@ -187,19 +184,13 @@ class TestProductServiceE2E:
             created_products.append(product)
             cleanup_resources["products"].append(product["productId"])
 
-        # 3. Listar todos los productos
-        all_products_response = make_request("GET", "/api/products")
-        assert all_products_response.status_code == 200
-        products_collection = all_products_response.json()
-        assert "collection" in products_collection
-        assert isinstance(products_collection["collection"], list)
-
-        # 4. Verificar que todos los productos creados están en la lista
-        all_product_ids = [
-            prod["productId"] for prod in products_collection["collection"]
-        ]
-        for created_product in created_products:
-            assert created_product["productId"] in all_product_ids
+        # 3-4. Listar todos los productos y verificar que los creados están en la lista
+        missing_products = missing_from_collection(
+            "/api/products",
+            "productId",
+            [product["productId"] for product in created_products],
+        )
+        assert not missing_products, f"Productos no encontrados: {missing_products}"
 
         # 5. Verificar productos individualmente
         for created_product in created_products:
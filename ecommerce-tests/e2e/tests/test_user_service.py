@@ -3,7 +3,12 @@ Pruebas E2E para el User Service.
 """
 
 import pytest
-from conftest import make_request, set_current_service, generate_unique_id
+from conftest import (
+    make_request,
+    missing_from_collection,
+    set_current_service,
+    generate_unique_id,
+)
 
 
 class TestUserServiceE2E:
@@ -305,17 +310,11 @@ class TestUserServiceE2E:
             created_users.append(user)
             cleanup_resources["users"].append(user["userId"])
 
-        # 2. Obtener lista de todos los usuarios
-        all_users_response = make_request("GET", "/api/users")
-        assert all_users_response.status_code == 200
-        users_collection = all_users_response.json()
-        assert "collection" in users_collection
-        assert isinstance(users_collection["collection"], list)
-
-        # 3. Verificar que todos los usuarios creados están en la lista
-        all_user_ids = [user["userId"] for user in users_collection["collection"]]
-        for created_user in created_users:
-            assert created_user["userId"] in all_user_ids
+        # 2-3. Obtener la lista de usuarios y verificar que los creados están en ella
+        missing_users = missing_from_collection(
+            "/api/users", "userId", [user["userId"] for user in created_users]
+        )
+        assert not missing_users, f"Usuarios no encontrados: {missing_users}"
 
         # 4. Buscar usuarios específicos por ID
         for created_user in created_users:
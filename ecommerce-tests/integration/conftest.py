@@ -2,12 +2,57 @@
 Archivo de inicio para las pruebas de integración.
 """
 
+import os
+import uuid
+from collections import Counter
+
 import pytest
 from utils.api_utils import (
+    make_request,
     wait_for_services,
-    reset_auth_token,
+    get_session_pool,
+    get_token_manager,
+    get_retry_policy,
+    get_adaptive_timeouts,
+    get_request_timings,
+    get_tracer,
+)
+from config.config import AUTH_ENDPOINT
+from common.http_client import merge_pool_stats, format_pool_stats
+from common.log import flush_logs
+from common.phase_timing import merge_phase_stats, format_phase_stats
+from common.retry import merge_retry_stats, format_retry_stats
+from common.timeouts import format_timeout_stats
+from common.timings import (
+    set_current_node,
+    node_summary,
+    timings_from_export,
+    format_endpoint_summary,
+    html_header_cells,
+    html_row_cells,
+    html_endpoint_summary,
+)
+
+# Estadísticas del pool recibidas de los workers de pytest-xdist
+_worker_pool_stats = []
+_worker_auth_calls = []
+_worker_shared_stats = []
+_worker_retry_stats = []
+_worker_request_timings = []
+_worker_phase_stats = []
+
+# Fixtures de sesión con padres compartidos por las pruebas de solo lectura
+SHARED_FIXTURES = (
+    "shared_category",
+    "shared_user",
+    "shared_credential",
+    "shared_cart",
+    "shared_order",
 )
 
+# Recursos compartidos creados y pruebas que los usaron en este proceso
+_shared_stats = {"created": 0, "uses": Counter()}
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
@@ -29,7 +74,188 @@ def setup_test_environment():
     yield
 
     print("\n=== Limpieza del entorno de pruebas ===")
-    reset_auth_token()
+    # El token no se resetea: se comparte con los demás workers de xdist y se
+    # renueva automáticamente antes de expirar
+    get_session_pool().close()
+
+
+def _worker_tag():
+    """Identificador del worker de xdist actual ('master' sin xdist)."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def _create_shared_resource(service_name, endpoint, data, id_field):
+    """
+    Crea un recurso padre compartido por todas las pruebas del worker.
+
+    Args:
+        service_name (str): Servicio que expone el endpoint.
+        endpoint (str): Endpoint de creación (ej: '/api/users').
+        data (dict): Datos del recurso.
+        id_field (str): Campo con el ID del recurso creado.
+
+    Returns:
+        dict: {"id": ..., "data": ...} con el mismo formato que los fixtures por prueba.
+    """
+    response = make_request("POST", endpoint, data=data, service_name=service_name)
+    if response.status_code != 200:
+        pytest.fail(f"Error al crear recurso compartido {endpoint}: {response.text}")
+
+    created = response.json()
+    _shared_stats["created"] += 1
+    return {"id": created.get(id_field), "data": created}
+
+
+def _delete_shared_resource(service_name, endpoint, resource_id):
+    """Elimina un recurso compartido al terminar la sesión, ignorando errores."""
+    try:
+        make_request("DELETE", f"{endpoint}/{resource_id}", service_name=service_name)
+    except Exception as e:
+        print(f"⚠️ No se pudo eliminar {endpoint}/{resource_id}: {e}")
+
+
+@pytest.fixture(scope="session")
+def shared_category(setup_test_environment):
+    """
+    Categoría creada una vez por worker para las pruebas que solo la usan
+    como padre. Las pruebas que la modifican deben usar create_test_category.
+    """
+    category = _create_shared_resource(
+        "product-service",
+        "/api/categories",
+        {
+            "categoryTitle": f"Shared_Category_{_worker_tag()}_{uuid.uuid4().hex[:8]}",
+            "imageUrl": "https://example.com/test-category.jpg",
+        },
+        "categoryId",
+    )
+    yield category
+    _delete_shared_resource("product-service", "/api/categories", category["id"])
+
+
+@pytest.fixture(scope="session")
+def shared_user(setup_test_environment):
+    """
+    Usuario creado una vez por worker para las pruebas que solo lo usan como
+    padre. Las pruebas que lo modifican deben usar create_test_user.
+    """
+    unique_suffix = f"{_worker_tag()}_{uuid.uuid4().hex[:8]}"
+    user = _create_shared_resource(
+        "user-service",
+        "/api/users",
+        {
+            "firstName": f"Shared_{unique_suffix}",
+            "lastName": "Test",
+            "email": f"shared_{unique_suffix}@example.com",
+            "phone": "+57123456789",
+            "imageUrl": "https://example.com/avatar.jpg",
+        },
+        "userId",
+    )
+    yield user
+    _delete_shared_resource("user-service", "/api/users", user["id"])
+
+
+@pytest.fixture(scope="session")
+def shared_credential(shared_user):
+    """
+    Credencial del usuario compartido. Como la relación usuario-credencial es
+    uno a uno, las pruebas que crean credenciales no deben usar shared_user.
+    """
+    credential = _create_shared_resource(
+        "user-service",
+        "/api/credentials",
+        {
+            "username": f"shared_cred_{_worker_tag()}_{uuid.uuid4().hex[:8]}",
+            "password": "$2a$10$LK9Oiyv1vw3fIAHDrRGdXuIfizqoov6xGfq7QQFG1xzGyXwEy0z8u",
+            "roleBasedAuthority": "ROLE_USER",
+            "isEnabled": True,
+            "isAccountNonExpired": True,
+            "isAccountNonLocked": True,
+            "isCredentialsNonExpired": True,
+            "userDto": {"userId": shared_user["id"]},
+        },
+        "credentialId",
+    )
+    yield credential
+    _delete_shared_resource("user-service", "/api/credentials", credential["id"])
+
+
+@pytest.fixture(scope="session")
+def shared_cart(setup_test_environment):
+    """
+    Carrito creado una vez por worker para las pruebas que solo lo usan como
+    padre. Las pruebas que lo modifican deben usar create_test_cart.
+    """
+    cart = _create_shared_resource(
+        "order-service", "/api/carts", {"userId": 1}, "cartId"
+    )
+    yield cart
+    _delete_shared_resource("order-service", "/api/carts", cart["id"])
+
+
+@pytest.fixture(scope="session")
+def shared_order(shared_cart):
+    """
+    Orden del carrito compartido para las pruebas que solo la leen. Las
+    pruebas que la modifican deben usar create_test_order.
+    """
+    order = _create_shared_resource(
+        "order-service",
+        "/api/orders",
+        {
+            "orderDesc": f"Shared_Order_{_worker_tag()}_{uuid.uuid4().hex[:8]}",
+            "orderFee": 199.99,
+            "cartDto": {"cartId": shared_cart["id"]},
+        },
+        "orderId",
+    )
+    yield order
+    _delete_shared_resource("order-service", "/api/orders", order["id"])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Asocia las solicitudes HTTP hechas durante la prueba (setup, llamada y
+    teardown) a su node ID.
+    """
+    set_current_node(item.nodeid)
+    yield
+    set_current_node(None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Adjunta al reporte de cada fase el resumen de las solicitudes de la prueba.
+    """
+    outcome = yield
+    outcome.get_result().request_timing = node_summary(
+        get_request_timings().for_node(item.nodeid)
+    )
+
+
+@pytest.fixture
+def request_timings(request):
+    """
+    Solicitudes HTTP de la prueba en curso.
+
+    Returns:
+        list: RequestTiming (method, template, service, status, duration,
+            node_id, trace_id) en orden; la lista crece con cada nueva solicitud.
+    """
+    return get_request_timings().for_node(request.node.nodeid)
+
+
+def pytest_runtest_setup(item):
+    """
+    Cuenta las pruebas que usan cada recurso compartido (directa o
+    indirectamente) para estimar las llamadas HTTP ahorradas.
+    """
+    for name in SHARED_FIXTURES:
+        if name in getattr(item, "fixturenames", ()):
+            _shared_stats["uses"][name] += 1
 
 
 @pytest.fixture(scope="function")
@@ -86,3 +312,124 @@ def test_markers():
         "user_service": "Prueba específica del user-service",
         "happy_path": "Prueba de caso feliz",
     }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Publica las estadísticas del pool de conexiones hacia el controlador de xdist
+    y guarda las latencias en el historial y los registros JSONL pendientes.
+    """
+    flush_logs()
+    get_adaptive_timeouts().save()
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["http_pool_stats"] = get_session_pool().stats()
+        workeroutput["auth_calls"] = get_token_manager().authenticate_calls
+        workeroutput["retry_stats"] = get_retry_policy().stats()
+        workeroutput["request_timings"] = get_request_timings().export()
+        workeroutput["phase_stats"] = get_session_pool().phase_stats()
+        workeroutput["shared_fixture_stats"] = {
+            "created": _shared_stats["created"],
+            "uses": dict(_shared_stats["uses"]),
+        }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Recoge las estadísticas del pool, de autenticación y de reintentos de cada
+    worker de xdist.
+    """
+    workeroutput = getattr(node, "workeroutput", {})
+    stats = workeroutput.get("http_pool_stats")
+    if stats:
+        _worker_pool_stats.append(stats)
+    _worker_auth_calls.append(workeroutput.get("auth_calls", 0))
+    _worker_retry_stats.append(workeroutput.get("retry_stats", {}))
+    _worker_request_timings.extend(
+        timings_from_export(workeroutput.get("request_timings", []))
+    )
+    _worker_phase_stats.append(workeroutput.get("phase_stats", {}))
+    shared_stats = workeroutput.get("shared_fixture_stats")
+    if shared_stats:
+        _worker_shared_stats.append(shared_stats)
+
+
+def _all_request_timings():
+    """Solicitudes de este proceso y de los workers de xdist."""
+    return get_request_timings().all() + _worker_request_timings
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_table_header(cells):
+    """Agrega al reporte HTML las columnas de solicitudes y tiempo HTTP."""
+    cells[3:3] = html_header_cells()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_table_row(report, cells):
+    """Completa las columnas de solicitudes y tiempo HTTP de cada prueba."""
+    cells[3:3] = html_row_cells(
+        getattr(report, "request_timing", None), get_tracer().trace_url
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Agrega al resumen del reporte HTML la latencia por endpoint."""
+    postfix.extend(
+        html_endpoint_summary(_all_request_timings(), trace_link=get_tracer().trace_url)
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Muestra los aciertos y fallos del pool de conexiones, el número de
+    autenticaciones, los reintentos, los timeouts aprendidos, el uso de
+    recursos compartidos, la latencia por endpoint y, con HTTP_PHASE_TIMING,
+    las fases de las solicitudes por servicio al final de la sesión.
+    """
+    stats = merge_pool_stats(get_session_pool().stats(), *_worker_pool_stats)
+    terminalreporter.write_sep("=", "Pool de conexiones HTTP")
+    for line in format_pool_stats(stats):
+        terminalreporter.write_line(line)
+
+    auth_calls = get_token_manager().authenticate_calls + sum(_worker_auth_calls)
+    terminalreporter.write_line(f"🔐 Llamadas a {AUTH_ENDPOINT}: {auth_calls}")
+
+    retry_stats = merge_retry_stats(get_retry_policy().stats(), *_worker_retry_stats)
+    terminalreporter.write_line(format_retry_stats(retry_stats))
+    terminalreporter.write_line(
+        format_timeout_stats(
+            get_adaptive_timeouts(), verbose=terminalreporter.verbosity > 1
+        )
+    )
+
+    created = _shared_stats["created"]
+    uses = Counter(_shared_stats["uses"])
+    for shared_stats in _worker_shared_stats:
+        created += shared_stats["created"]
+        uses.update(shared_stats["uses"])
+    if created:
+        # Cada uso habría creado y eliminado su propio padre (un POST y un DELETE)
+        saved_calls = 2 * max(sum(uses.values()) - created, 0)
+        terminalreporter.write_line(
+            f"♻️ Recursos compartidos: {created} creados, {sum(uses.values())} usos "
+            f"(~{saved_calls} llamadas HTTP evitadas)"
+        )
+
+    endpoint_lines = format_endpoint_summary(
+        _all_request_timings(), trace_link=get_tracer().trace_url
+    )
+    if endpoint_lines:
+        terminalreporter.write_sep("=", "Latencia por endpoint")
+        for line in endpoint_lines:
+            terminalreporter.write_line(line)
+
+    phase_lines = format_phase_stats(
+        merge_phase_stats(get_session_pool().phase_stats(), *_worker_phase_stats)
+    )
+    if phase_lines:
+        terminalreporter.write_sep("=", "Fases de las solicitudes HTTP")
+        for line in phase_lines:
+            terminalreporter.write_line(line)
@@ -70,6 +70,17 @@ def main():
         type=str,
         help="URL del API Gateway (ej: http://localhost:8080)",
     )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Nivel de los mensajes por consola (DEBUG muestra cada solicitud; por defecto INFO, o DEBUG con --verbose)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Guarda un registro estructurado JSONL de la ejecución (ej: logs/run.jsonl)",
+    )
 
     args = parser.parse_args()
 
@@ -78,6 +89,16 @@ def main():
         os.environ["API_GATEWAY_URL"] = args.gateway_url
         print(f"🌐 Usando API Gateway: {args.gateway_url}")
 
+    # Registro del arnés (ver common/log.py): los mensajes de cada solicitud
+    # son DEBUG y solo se muestran en modo detallado
+    if args.log_level:
+        os.environ["TEST_LOG_LEVEL"] = args.log_level
+    elif args.verbose:
+        os.environ["TEST_LOG_LEVEL"] = "DEBUG"
+    if args.log_file:
+        os.environ["TEST_LOG_FILE"] = args.log_file
+        print(f"📝 Registro JSONL en: {args.log_file}")
+
     # Directorio de pruebas
     test_dir = Path(__file__).parent
 
@@ -6,6 +6,13 @@ import pytest
 import uuid
 from datetime import datetime
 from utils.api_utils import make_request, set_current_service
+from common.schema import compile_schema
+
+# Esquemas de los elementos de las colecciones (se validan todos los elementos)
+CART_SCHEMA = compile_schema({"cartId": int, "userId": int})
+ORDER_SCHEMA = compile_schema(
+    {"orderId": int, "orderDesc": str, "orderFee": (int, float)}
+)
 
 
 class TestOrderServiceComplete:
@@ -43,10 +50,11 @@ class TestOrderServiceComplete:
         result = response.json()
         assert "collection" in result
         assert isinstance(result["collection"], list)
+        CART_SCHEMA.validate(result)
 
-    def test_cart_find_by_id(self, create_test_cart):
+    def test_cart_find_by_id(self, shared_cart):
         """Prueba para obtener carrito por ID."""
-        cart = create_test_cart
+        cart = shared_cart
         response = make_request("GET", f'/api/carts/{cart["id"]}')
 
         assert response.status_code == 200
@@ -102,9 +110,9 @@ class TestOrderServiceComplete:
     # ==================== PRUEBAS PARA ÓRDENES ====================
 
     @pytest.fixture
-    def create_test_order(self, create_test_cart):
+    def create_test_order(self, shared_cart):
         """Fixture para crear una orden de prueba."""
-        cart = create_test_cart
+        cart = shared_cart
         unique_suffix = uuid.uuid4().hex[:8]
         order_data = {
             "orderDesc": f"Test_Order_{unique_suffix}",
@@ -130,10 +138,11 @@ class TestOrderServiceComplete:
         result = response.json()
         assert "collection" in result
         assert isinstance(result["collection"], list)
+        ORDER_SCHEMA.validate(result)
 
-    def test_order_find_by_id(self, create_test_order):
+    def test_order_find_by_id(self, shared_order):
         """Prueba para obtener orden por ID."""
-        order = create_test_order
+        order = shared_order
         response = make_request("GET", f'/api/orders/{order["id"]}')
 
         assert response.status_code == 200
@@ -141,9 +150,9 @@ class TestOrderServiceComplete:
         assert result["orderId"] == order["id"]
         assert result["orderDesc"] == order["data"]["orderDesc"]
 
-    def test_order_save(self, create_test_cart):
+    def test_order_save(self, shared_cart):
         """Prueba para crear una nueva orden."""
-        cart = create_test_cart
+        cart = shared_cart
         unique_suffix = uuid.uuid4().hex[:8]
         order_data = {
             "orderDesc": f"Save_Order_{unique_suffix}",
@@ -187,9 +196,9 @@ class TestOrderServiceComplete:
 
         assert response.status_code == 200
 
-    def test_order_delete_by_id(self, create_test_cart):
+    def test_order_delete_by_id(self, shared_cart):
         """Prueba para eliminar orden."""
-        cart = create_test_cart
+        cart = shared_cart
         unique_suffix = uuid.uuid4().hex[:8]
         order_data = {
             "orderDesc": f"Delete_Order_{unique_suffix}",
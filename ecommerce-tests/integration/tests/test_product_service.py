@@ -5,6 +5,23 @@ Pruebas de integración para el Product Service.
 import pytest
 import uuid
 from utils.api_utils import make_request, set_current_service
+from common.schema import compile_schema
+
+# Esquemas de los elementos de las colecciones (se validan todos los elementos).
+# El product-service omite los campos nulos al serializar, por eso son opcionales.
+CATEGORY_SCHEMA = compile_schema(
+    {"categoryId": int, "categoryTitle": str}, optional=("categoryTitle",)
+)
+PRODUCT_SCHEMA = compile_schema(
+    {
+        "productId": int,
+        "productTitle": str,
+        "sku": str,
+        "priceUnit": (int, float),
+        "quantity": int,
+    },
+    optional=("productTitle", "sku", "priceUnit", "quantity"),
+)
 
 
 class TestProductServiceComplete:
@@ -61,10 +78,11 @@ class TestProductServiceComplete:
         result = response.json()
         assert "collection" in result
         assert isinstance(result["collection"], list)
+        CATEGORY_SCHEMA.validate(result)
 
-    def test_category_find_by_id(self, create_test_category):
+    def test_category_find_by_id(self, shared_category):
         """Prueba para obtener categoría por ID."""
-        category = create_test_category
+        category = shared_category
         response = make_request("GET", f'/api/categories/{category["id"]}')
 
         assert response.status_code == 200
@@ -134,9 +152,9 @@ class TestProductServiceComplete:
     # ==================== PRUEBAS PARA PRODUCTOS ====================
 
     @pytest.fixture
-    def create_test_product(self, create_test_category):
+    def create_test_product(self, shared_category):
         """Fixture para crear un producto de prueba."""
-        category = create_test_category
+        category = shared_category
         unique_suffix = uuid.uuid4().hex[:8]
         product_data = {
             "productTitle": f"Test_Product_{unique_suffix}",
@@ -165,6 +183,7 @@ class TestProductServiceComplete:
         result = response.json()
         assert "collection" in result
         assert isinstance(result["collection"], list)
+        PRODUCT_SCHEMA.validate(result)
 
     def test_product_find_by_id(self, create_test_product):
         """Prueba para obtener producto por ID."""
@@ -176,9 +195,9 @@ class TestProductServiceComplete:
         assert result["productId"] == product["id"]
         assert result["productTitle"] == product["data"]["productTitle"]
 
-    def test_product_save(self, create_test_category):
+    def test_product_save(self, shared_category):
         """Prueba para crear un nuevo producto."""
-        category = create_test_category
+        category = shared_category
         unique_suffix = uuid.uuid4().hex[:8]
         product_data = {
             "productTitle": f"Save_Product_{unique_suffix}",
@@ -231,9 +250,9 @@ class TestProductServiceComplete:
 
         assert response.status_code == 200
 
-    def test_product_delete_by_id(self, create_test_category):
+    def test_product_delete_by_id(self, shared_category):
         """Prueba para eliminar producto."""
-        category = create_test_category
+        category = shared_category
         unique_suffix = uuid.uuid4().hex[:8]
         product_data = {
             "productTitle": f"Delete_Product_{unique_suffix}",
@@ -5,6 +5,14 @@ Pruebas de integración para el servicio de usuarios.
 import pytest
 import uuid
 from utils.api_utils import make_request, set_current_service
+from common.schema import compile_schema
+
+# Esquemas de los elementos de las colecciones (se validan todos los elementos).
+# El user-service omite los campos nulos al serializar, por eso son opcionales.
+USER_SCHEMA = compile_schema(
+    {"userId": int, "firstName": str, "lastName": str, "email": str},
+    optional=("firstName", "lastName", "email"),
+)
 
 
 class TestUserServiceComplete:
@@ -48,10 +56,11 @@ class TestUserServiceComplete:
         result = response.json()
         assert "collection" in result
         assert isinstance(result["collection"], list)
+        USER_SCHEMA.validate(result)
 
-    def test_user_find_by_id(self, create_test_user):
+    def test_user_find_by_id(self, shared_user):
         """Prueba para obtener usuario por ID."""
-        user = create_test_user
+        user = shared_user
         response = make_request("GET", f'/api/users/{user["id"]}')
 
         assert response.status_code == 200
@@ -134,9 +143,9 @@ class TestUserServiceComplete:
     # ==================== PRUEBAS PARA DIRECCIONES ====================
 
     @pytest.fixture
-    def create_test_address(self, create_test_user):
+    def create_test_address(self, shared_user):
         """Fixture para crear una dirección de prueba."""
-        user = create_test_user
+        user = shared_user
         address_data = {
             "fullAddress": f"Test Address {uuid.uuid4().hex[:6]}",
             "postalCode": "54321",
@@ -172,9 +181,9 @@ class TestUserServiceComplete:
         result = response.json()
         assert result["addressId"] == address["id"]
 
-    def test_address_save(self, create_test_user):
+    def test_address_save(self, shared_user):
         """Prueba para crear una nueva dirección."""
-        user = create_test_user
+        user = shared_user
         address_data = {
             "fullAddress": f"Save Address {uuid.uuid4().hex[:6]}",
             "postalCode": "98765",
@@ -218,9 +227,9 @@ class TestUserServiceComplete:
 
         assert response.status_code == 200
 
-    def test_address_delete_by_id(self, create_test_user):
+    def test_address_delete_by_id(self, shared_user):
         """Prueba para eliminar dirección."""
-        user = create_test_user
+        user = shared_user
         address_data = {
             "fullAddress": f"Delete Address {uuid.uuid4().hex[:6]}",
             "postalCode": "99999",
@@ -275,9 +284,9 @@ class TestUserServiceComplete:
         assert "collection" in result
         assert isinstance(result["collection"], list)
 
-    def test_credential_find_by_id(self, create_test_credential):
+    def test_credential_find_by_id(self, shared_credential):
         """Prueba para obtener credencial por ID."""
-        credential = create_test_credential
+        credential = shared_credential
         response = make_request("GET", f'/api/credentials/{credential["id"]}')
 
         assert response.status_code == 200
@@ -374,9 +383,9 @@ class TestUserServiceComplete:
     # ==================== PRUEBAS PARA TOKENS DE VERIFICACIÓN ====================
 
     @pytest.fixture
-    def create_test_verification_token(self, create_test_credential):
+    def create_test_verification_token(self, shared_credential):
         """Fixture para crear un token de verificación de prueba."""
-        credential = create_test_credential
+        credential = shared_credential
         token_data = {
             "token": f"test_token_{uuid.uuid4().hex[:8]}",
             "expireDate": "31-12-2024",
@@ -411,9 +420,9 @@ class TestUserServiceComplete:
         result = response.json()
         assert result["verificationTokenId"] == token["id"]
 
-    def test_verification_token_save(self, create_test_credential):
+    def test_verification_token_save(self, shared_credential):
         """Prueba para crear un nuevo token de verificación."""
-        credential = create_test_credential
+        credential = shared_credential
         token_data = {
             "token": f"save_token_{uuid.uuid4().hex[:8]}",
             "expireDate": "31-01-2025",
@@ -457,9 +466,9 @@ class TestUserServiceComplete:
 
         assert response.status_code == 200
 
-    def test_verification_token_delete_by_id(self, create_test_credential):
+    def test_verification_token_delete_by_id(self, shared_credential):
         """Prueba para eliminar token de verificación."""
-        credential = create_test_credential
+        credential = shared_credential
         token_data = {
             "token": f"delete_token_{uuid.uuid4().hex[:8]}",
             "expireDate": "31-03-2025",
@@ -3,51 +3,178 @@ Utilidades para pruebas de integración para todos los servicios.
 Soporte para servicios de infraestructura y microservicios de negocio.
 """
 
+import sys
+import asyncio
+import aiohttp
 import requests
 import time
+from pathlib import Path
 from config.config import (
     API_GATEWAY_URL,
     AUTH_ENDPOINT,
     TEST_USER,
     REQUEST_TIMEOUT,
     SERVICES_CONFIG,
+    HTTP_POOL_CONFIG,
+    ASYNC_POOL_CONFIG,
+    READINESS_MODE,
+    TOKEN_CACHE_CONFIG,
+    BATCH_MAX_CONCURRENCY,
+    LOG_CONFIG,
+    RETRY_CONFIG,
+    TIMEOUT_CONFIG,
+    TRACING_CONFIG,
 )
 
-_jwt_token = None
-_current_service = ""
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.http_client import (
+    SessionPool,
+    JSONResponse,
+    build_url,
+    build_headers,
+    encode_json_body,
+)
+from common.async_client import AsyncSessionPool
+from common.backoff import exponential_backoff
+from common.auth import TokenManager, default_cache_path
+from common.context import ServiceContext, ServiceClient
+from common.batch import run_many
+from common.json_stream import iter_response_collection, find_first, missing_ids
+from common.schema import compile_schema, SchemaValidationError
+from common.collection_index import CollectionIndex
+from common.log import configure_logging, get_logger
+from common.timeouts import AdaptiveTimeouts, endpoint_template, is_read_timeout
+from common.timings import TimingRecorder
+from common.tracing import Tracer
+from common.retry import RetryPolicy
+
+# Espera inicial del backoff de wait_for_services (en segundos)
+WAIT_INITIAL_DELAY = 0.25
+
+# Registro de aplicaciones del Service Discovery
+EUREKA_APPS_ENDPOINT = "eureka/apps"
+
+configure_logging(LOG_CONFIG)
+_log = get_logger("integration")
+
+_service_context = ServiceContext(SERVICES_CONFIG)
+_session_pool = SessionPool(SERVICES_CONFIG, HTTP_POOL_CONFIG)
+_token_manager = TokenManager(
+    TOKEN_CACHE_CONFIG["cache_path"]
+    or default_cache_path(
+        AUTH_ENDPOINT, TEST_USER["username"], TOKEN_CACHE_CONFIG["cache_dir"]
+    ),
+    refresh_margin=TOKEN_CACHE_CONFIG["refresh_margin"],
+)
+_async_session_pool = AsyncSessionPool(SERVICES_CONFIG, ASYNC_POOL_CONFIG)
+_retry_policy = RetryPolicy.from_config(RETRY_CONFIG)
+_adaptive_timeouts = AdaptiveTimeouts(REQUEST_TIMEOUT, TIMEOUT_CONFIG)
+_request_timings = TimingRecorder()
+_tracer = Tracer(TRACING_CONFIG)
+
+
+def get_session_pool():
+    """
+    Obtiene el pool de sesiones keep-alive compartido por las pruebas.
+
+    Returns:
+        SessionPool: Pool de sesiones por servicio.
+    """
+    return _session_pool
+
+
+def get_retry_policy():
+    """
+    Obtiene la política de reintentos de make_request() y make_request_async().
+
+    Returns:
+        RetryPolicy: Política con su presupuesto global (ver stats()).
+    """
+    return _retry_policy
+
+
+def get_adaptive_timeouts():
+    """
+    Obtiene los timeouts por plantilla de endpoint aprendidos del historial.
+
+    Returns:
+        AdaptiveTimeouts: Timeouts de la sesión (save() guarda las latencias nuevas).
+    """
+    return _adaptive_timeouts
+
+
+def get_tracer():
+    """
+    Obtiene el generador de contexto de traza de make_request().
+
+    Returns:
+        Tracer: Trace IDs de las solicitudes y enlaces a Zipkin (ver trace_url()).
+    """
+    return _tracer
+
+
+def get_request_timings():
+    """
+    Obtiene el registro de duraciones de las solicitudes HTTP de este proceso.
+
+    Returns:
+        TimingRecorder: Solicitudes agrupadas por node ID de la prueba.
+    """
+    return _request_timings
+
+
+def get_service_context():
+    """
+    Obtiene el contexto que guarda el servicio actual.
+
+    El servicio actual es propio de cada hilo y de cada tarea de asyncio.
+
+    Returns:
+        ServiceContext: Contexto del servicio actual.
+    """
+    return _service_context
 
 
 def set_current_service(service_name):
     """
     Establece el servicio actual para las pruebas.
 
+    El valor solo afecta al hilo (o tarea de asyncio) que lo establece.
+
     Args:
         service_name (str): Nombre del servicio (ej: 'user-service', 'api-gateway', etc.)
     """
-    global _current_service
-    if service_name in SERVICES_CONFIG:
-        _current_service = service_name
-        print(f"🔧 Servicio actual establecido: {service_name}")
-    else:
-        raise ValueError(
-            f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(SERVICES_CONFIG.keys())}"
-        )
+    _service_context.set(service_name)
+    _log.debug("🔧 Servicio actual establecido: %s", service_name)
 
 
-def get_auth_token():
+def service_client(service_name):
     """
-    Obtiene un token JWT de autenticación.
+    Crea un cliente explícito para un servicio, independiente del servicio actual.
+
+    Args:
+        service_name (str): Nombre del servicio.
 
     Returns:
-        str: Token JWT.
+        ServiceClient: Cliente con request(), get(), post(), put() y delete().
     """
-    global _jwt_token
+    _service_context.validate(service_name)
+    return ServiceClient(service_name, make_request, make_request_async)
+
 
-    if _jwt_token:
-        return _jwt_token
+def _authenticate():
+    """
+    Llama al endpoint de autenticación y devuelve un token JWT nuevo.
 
+    Returns:
+        str: Token JWT.
+    """
     try:
-        response = requests.post(
+        response = _session_pool.request(
+            "api-gateway",
+            "POST",
             AUTH_ENDPOINT,
             json={"username": TEST_USER["username"], "password": TEST_USER["password"]},
             headers={"Content-Type": "application/json", "Accept": "application/json"},
@@ -56,10 +183,10 @@ def get_auth_token():
 
         if response.status_code == 200:
             auth_data = response.json()
-            _jwt_token = auth_data.get("jwtToken")
-            if _jwt_token:
-                print(f"✅ Token JWT obtenido exitosamente")
-                return _jwt_token
+            token = auth_data.get("jwtToken")
+            if token:
+                _log.info("✅ Token JWT obtenido exitosamente")
+                return token
             else:
                 raise Exception(f"Token no encontrado en la respuesta: {auth_data}")
         else:
@@ -71,6 +198,76 @@ def get_auth_token():
         raise Exception(f"Error de conexión al obtener token: {e}")
 
 
+async def _authenticate_async():
+    """
+    Versión asíncrona de _authenticate().
+
+    Returns:
+        str: Token JWT.
+    """
+    try:
+        response = await _async_session_pool.request(
+            "api-gateway",
+            "POST",
+            AUTH_ENDPOINT,
+            json={"username": TEST_USER["username"], "password": TEST_USER["password"]},
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            timeout=REQUEST_TIMEOUT,
+        )
+    except aiohttp.ClientError as e:
+        raise Exception(f"Error de conexión al obtener token: {e}")
+
+    if response.status_code != 200:
+        raise Exception(
+            f"Error {response.status_code} al obtener token: {response.text}"
+        )
+
+    auth_data = response.json()
+    token = auth_data.get("jwtToken")
+    if not token:
+        raise Exception(f"Token no encontrado en la respuesta: {auth_data}")
+
+    _log.info("✅ Token JWT obtenido exitosamente")
+    return token
+
+
+def get_auth_token():
+    """
+    Obtiene un token JWT de autenticación.
+
+    El token se comparte entre los workers de xdist y se renueva antes de
+    que expire (ver common/auth.py).
+
+    Returns:
+        str: Token JWT.
+    """
+    return _token_manager.get_token(_authenticate)
+
+
+async def get_auth_token_async():
+    """
+    Obtiene un token JWT de autenticación sin bloquear el event loop.
+
+    Comparte la caché del token con get_auth_token().
+
+    Returns:
+        str: Token JWT.
+    """
+    return await _token_manager.get_token_async(
+        _authenticate_async, _async_session_pool.lock("auth")
+    )
+
+
+def get_token_manager():
+    """
+    Obtiene el gestor del token JWT (incluye el contador authenticate_calls).
+
+    Returns:
+        TokenManager: Gestor del token.
+    """
+    return _token_manager
+
+
 def get_headers(service_name=None, token=None):
     """
     Genera headers para las solicitudes según el servicio.
@@ -82,23 +279,14 @@ def get_headers(service_name=None, token=None):
     Returns:
         dict: Headers para las solicitudes.
     """
-    if service_name is None:
-        service_name = _current_service
+    service_name = _service_context.resolve(service_name)
 
     service_config = SERVICES_CONFIG.get(service_name, {})
-    requires_auth = service_config.get("requires_auth", True)
-
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
 
-    if requires_auth:
-        if token is None:
-            token = get_auth_token()
-        headers["Authorization"] = f"Bearer {token}"
+    if service_config.get("requires_auth", True) and token is None:
+        token = get_auth_token()
 
-    return headers
+    return build_headers(service_config, token)
 
 
 def make_request(
@@ -118,11 +306,7 @@ def make_request(
     Returns:
         Response: Objeto de respuesta.
     """
-    if service_name is None:
-        service_name = _current_service
-
-    # Debug: mostrar qué servicio se está usando
-    print(f"🔧 Usando servicio: {service_name}")
+    service_name = _service_context.resolve(service_name)
 
     service_config = SERVICES_CONFIG.get(service_name)
     if not service_config:
@@ -131,99 +315,342 @@ def make_request(
         )
 
     # Construir URL completa
-    if endpoint.startswith("/"):
-        endpoint = endpoint[1:]  # Remover / inicial si existe
-
-    base_url = service_config["url"]
-    path_prefix = service_config["path_prefix"]
+    url = build_url(service_config, endpoint)
 
-    if path_prefix:
-        url = f"{base_url}/{path_prefix}/{endpoint}"
-    else:
-        url = f"{base_url}/{endpoint}"
-
-    print(f"🌐 {method} {url} (servicio: {service_name})")
+    trace_id = _tracer.new_trace()
+    _log.debug(
+        "🌐 %s %s (servicio: %s, traza: %s)", method, url, service_name, trace_id
+    )
 
     # Headers según el servicio
     request_headers = get_headers(service_name)
     if headers:
         request_headers.update(headers)
 
+    session = _session_pool.session(service_name)
+
+    method = method.upper()
+    kwargs = {}
+    if method == "GET":
+        kwargs["params"] = params
+    elif method == "POST" and isinstance(data, str):
+        # Para endpoints como /encrypt que esperan texto plano
+        request_headers["Content-Type"] = "text/plain"
+        kwargs["data"] = data
+    elif method in ("POST", "PUT"):
+        kwargs["data"] = encode_json_body(data)
+    elif method != "DELETE":
+        raise ValueError(f"Método HTTP no soportado: {method}")
+
+    # Timeouts (conexión, lectura) de la plantilla del endpoint
+    template = endpoint_template(service_name, method, endpoint)
+    timeout = _adaptive_timeouts.timeout_for(template)
+
+    # Reintentos según la política compartida (ver common/retry.py)
+    start = time.perf_counter()
     try:
-        if method.upper() == "GET":
-            return requests.get(
-                url, headers=request_headers, params=params, timeout=REQUEST_TIMEOUT
-            )
-        elif method.upper() == "POST":
-            if isinstance(data, str):
-                # Para endpoints como /encrypt que esperan texto plano
-                request_headers["Content-Type"] = "text/plain"
-                return requests.post(
-                    url, headers=request_headers, data=data, timeout=REQUEST_TIMEOUT
-                )
-            else:
-                return requests.post(
-                    url, headers=request_headers, json=data, timeout=REQUEST_TIMEOUT
-                )
-        elif method.upper() == "PUT":
-            return requests.put(
-                url, headers=request_headers, json=data, timeout=REQUEST_TIMEOUT
-            )
-        elif method.upper() == "DELETE":
-            return requests.delete(
-                url, headers=request_headers, timeout=REQUEST_TIMEOUT
-            )
-        else:
-            raise ValueError(f"Método HTTP no soportado: {method}")
+        response = _retry_policy.execute(
+            method,
+            _adaptive_timeouts.track(
+                template,
+                lambda: session.request(
+                    method,
+                    url,
+                    headers=_tracer.inject(request_headers, trace_id),
+                    timeout=timeout,
+                    **kwargs,
+                ),
+            ),
+            url=url,
+        )
+    except requests.exceptions.RequestException as e:
+        _request_timings.record(
+            method,
+            template,
+            service_name,
+            None,
+            time.perf_counter() - start,
+            trace_id,
+        )
+        _log.error("❌ Error en la solicitud a %s (traza: %s): %s", url, trace_id, e)
+        raise
+
+    _request_timings.record(
+        method,
+        template,
+        service_name,
+        response.status_code,
+        time.perf_counter() - start,
+        trace_id,
+    )
+    _adaptive_timeouts.record_response(template, response)
+    return JSONResponse(response)
+
+
+def make_request_many(requests, max_concurrency=None, raise_on_error=True):
+    """
+    Realiza un lote de solicitudes independientes de forma concurrente.
+
+    Args:
+        requests (list): Solicitudes como dicts con los argumentos de
+            make_request() o tuplas (método, endpoint[, data]).
+        max_concurrency (int, optional): Solicitudes simultáneas. Por defecto, BATCH_MAX_CONCURRENCY.
+        raise_on_error (bool): Si es True, lanza BatchRequestError si alguna falla;
+            si es False, la excepción ocupa la posición de su respuesta.
+
+    Returns:
+        list: Respuestas en el mismo orden que las solicitudes.
+    """
+    return run_many(
+        make_request,
+        requests,
+        max_concurrency=max_concurrency or BATCH_MAX_CONCURRENCY,
+        raise_on_error=raise_on_error,
+    )
+
+
+def iter_collection(
+    endpoint, params=None, service_name=None, key="collection", chunk_size=None
+):
+    """
+    Recorre la colección de un endpoint findAll sin cargarla completa.
+
+    La respuesta se lee por fragmentos y se entrega un elemento cada vez; si el
+    recorrido se interrumpe, la conexión se cierra sin leer el resto.
+
+    Args:
+        endpoint (str): Endpoint relativo (ej: '/api/products').
+        params (dict, optional): Parámetros de consulta.
+        service_name (str, optional): Nombre del servicio. Si es None, usa el servicio actual.
+        key (str): Clave del arreglo en la respuesta.
+        chunk_size (int, optional): Bytes leídos por fragmento.
+
+    Yields:
+        dict: Cada elemento de la colección.
+    """
+    service_name = _service_context.resolve(service_name)
+    service_config = SERVICES_CONFIG.get(service_name)
+    if not service_config:
+        raise ValueError(
+            f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(SERVICES_CONFIG.keys())}"
+        )
 
+    url = build_url(service_config, endpoint)
+    template = endpoint_template(service_name, "GET", endpoint)
+    trace_id = _tracer.new_trace()
+    # La duración cubre la lectura completa (o hasta que se interrumpe el
+    # recorrido); el estado queda en None si la respuesta no llega o se corta
+    start = time.perf_counter()
+    response = None
+    status = None
+    try:
+        response = _session_pool.session(service_name).get(
+            url,
+            headers=_tracer.inject(get_headers(service_name), trace_id),
+            params=params,
+            timeout=_adaptive_timeouts.timeout_for(template),
+            stream=True,
+        )
+        status = response.status_code
+        response.raise_for_status()
+        yield from iter_response_collection(response, key, chunk_size)
+    except requests.exceptions.HTTPError:
+        raise
     except requests.exceptions.RequestException as e:
-        print(f"❌ Error en la solicitud a {url}: {e}")
+        status = None
+        # Un corte por el timeout de lectura cuenta como muestra del endpoint
+        if is_read_timeout(e):
+            _adaptive_timeouts.record_timeout(template)
         raise
+    finally:
+        if response is not None:
+            response.close()
+            if status is not None:
+                _adaptive_timeouts.record_response(template, response)
+        _request_timings.record(
+            "GET",
+            template,
+            service_name,
+            status,
+            time.perf_counter() - start,
+            trace_id,
+        )
 
 
-def validate_response_schema(response, schema):
+def find_in_collection(endpoint, predicate, **kwargs):
     """
-    Valida que la respuesta cumpla con un esquema esperado.
+    Busca el primer elemento de una colección que cumple `predicate`.
+
+    Deja de leer la respuesta en cuanto lo encuentra.
 
     Args:
-        response (Response): Respuesta HTTP.
-        schema (dict): Esquema esperado con tipos de datos.
+        endpoint (str): Endpoint findAll relativo.
+        predicate (callable): Función que recibe un elemento y devuelve bool.
+        **kwargs: Argumentos adicionales de iter_collection().
 
     Returns:
-        bool: True si la validación es exitosa, False en caso contrario.
+        dict: Elemento encontrado, o None.
+    """
+    return find_first(iter_collection(endpoint, **kwargs), predicate)
+
+
+def missing_from_collection(endpoint, id_field, ids, **kwargs):
+    """
+    Comprueba que unos IDs estén en una colección, deteniéndose al encontrarlos.
+
+    Args:
+        endpoint (str): Endpoint findAll relativo.
+        id_field (str): Campo con el ID de cada elemento (ej: 'cartId').
+        ids (iterable): IDs esperados.
+        **kwargs: Argumentos adicionales de iter_collection().
+
+    Returns:
+        set: IDs que no aparecieron (vacío si estaban todos).
+    """
+    return missing_ids(iter_collection(endpoint, **kwargs), id_field, ids)
+
+
+def index_collection(endpoint, key, only=None, **kwargs):
+    """
+    Indexa por clave primaria la colección de un endpoint findAll.
+
+    Args:
+        endpoint (str): Endpoint findAll relativo.
+        key (str | tuple): Clave primaria, simple o compuesta (ej: ('userId', 'productId', 'likeDate')).
+        only (iterable, optional): Claves que interesa conservar; el resto se descarta al leer.
+        **kwargs: Argumentos adicionales de iter_collection().
+
+    Returns:
+        CollectionIndex: Índice con comprobaciones de pertenencia y diferencias.
+    """
+    return CollectionIndex(iter_collection(endpoint, **kwargs), key, only)
+
+
+async def make_request_async(
+    method, endpoint, data=None, params=None, headers=None, service_name=None
+):
     """
+    Realiza una solicitud HTTP asíncrona al servicio especificado.
+
+    Usa la misma construcción de URL y headers que make_request().
+
+    Args:
+        method (str): Método HTTP ('GET', 'POST', 'PUT', 'DELETE').
+        endpoint (str): Endpoint relativo del servicio (ej: '/api/users' o '/actuator/health').
+        data (dict, optional): Datos para la solicitud.
+        params (dict, optional): Parámetros de consulta.
+        headers (dict, optional): Headers adicionales.
+        service_name (str, optional): Nombre del servicio. Si es None, usa el servicio actual.
+
+    Returns:
+        AsyncResponse: Objeto de respuesta con el cuerpo ya leído.
+    """
+    service_name = _service_context.resolve(service_name)
+
+    service_config = SERVICES_CONFIG.get(service_name)
+    if not service_config:
+        raise ValueError(
+            f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(SERVICES_CONFIG.keys())}"
+        )
+
+    url = build_url(service_config, endpoint)
+    trace_id = _tracer.new_trace()
+    _log.debug(
+        "🌐 %s %s (servicio: %s, traza: %s)", method, url, service_name, trace_id
+    )
+
+    token = None
+    if service_config.get("requires_auth", True):
+        token = await get_auth_token_async()
+    request_headers = build_headers(service_config, token, headers)
+
+    kwargs = {}
+    if method.upper() == "GET":
+        kwargs["params"] = params
+    elif method.upper() in ("POST", "PUT"):
+        if isinstance(data, str):
+            # Para endpoints como /encrypt que esperan texto plano
+            request_headers["Content-Type"] = "text/plain"
+            kwargs["data"] = data
+        else:
+            kwargs["data"] = encode_json_body(data)
+    elif method.upper() != "DELETE":
+        raise ValueError(f"Método HTTP no soportado: {method}")
+
+    template = endpoint_template(service_name, method, endpoint)
+    timeout = _adaptive_timeouts.timeout_for(template)
+
+    # Reintentos según la política compartida (ver common/retry.py)
+    start = time.perf_counter()
     try:
-        response_data = response.json()
+        response = await _retry_policy.execute_async(
+            method.upper(),
+            _adaptive_timeouts.track_async(
+                template,
+                lambda: _async_session_pool.request(
+                    service_name,
+                    method.upper(),
+                    url,
+                    headers=_tracer.inject(request_headers, trace_id),
+                    timeout=timeout,
+                    **kwargs,
+                ),
+            ),
+            url=url,
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        _request_timings.record(
+            method.upper(),
+            template,
+            service_name,
+            None,
+            time.perf_counter() - start,
+            trace_id,
+        )
+        _log.error("❌ Error en la solicitud a %s (traza: %s): %s", url, trace_id, e)
+        raise
 
-        # Si es una colección, extraemos el primer elemento
-        if isinstance(response_data, dict) and "collection" in response_data:
-            if len(response_data["collection"]) > 0:
-                response_data = response_data["collection"][0]
-            else:
-                return True  # Colección vacía es válida
+    _request_timings.record(
+        method.upper(),
+        template,
+        service_name,
+        response.status_code,
+        time.perf_counter() - start,
+        trace_id,
+    )
+    _adaptive_timeouts.record_response(template, response)
+    return response
 
-        # Si es una lista directa, validamos el primer elemento
-        elif isinstance(response_data, list) and len(response_data) > 0:
-            response_data = response_data[0]
 
-        for key, expected_type in schema.items():
-            if key not in response_data:
-                print(f"❌ La clave '{key}' no está presente en la respuesta")
-                return False
+async def close_async_sessions():
+    """
+    Cierra las sesiones del cliente asíncrono en el loop actual.
+    """
+    await _async_session_pool.close()
+
+
+def validate_response_schema(response, schema):
+    """
+    Valida que la respuesta cumpla con un esquema esperado.
 
-            # Permitir que los campos sean None
-            if response_data[key] is None:
-                continue
+    En las colecciones se validan todos los elementos, no solo el primero. El
+    esquema se compila una sola vez (ver common.schema.compile_schema).
 
-            if not isinstance(response_data[key], expected_type):
-                print(
-                    f"❌ La clave '{key}' no es del tipo esperado {expected_type}, es {type(response_data[key])}"
-                )
-                return False
+    Args:
+        response (Response): Respuesta HTTP.
+        schema (dict | CompiledSchema): Esquema esperado con tipos de datos.
 
+    Returns:
+        bool: True si la validación es exitosa, False en caso contrario.
+    """
+    try:
+        compile_schema(schema).validate(response.json())
         return True
+    except SchemaValidationError as e:
+        _log.error("❌ %s", e)
+        return False
     except Exception as e:
-        print(f"❌ Error al validar el esquema: {e}")
+        _log.error("❌ Error al validar el esquema: %s", e)
         return False
 
 
@@ -238,9 +665,6 @@ def check_service_health(service_name):
         bool: True si el servicio está disponible, False en caso contrario.
     """
     try:
-        old_service = _current_service
-        set_current_service(service_name)
-
         # Para servicios de infraestructura, usar actuator/health
         if service_name in [
             "service-discovery",
@@ -268,55 +692,304 @@ def check_service_health(service_name):
                 403,
             ]  # Incluir códigos de autenticación
 
-        set_current_service(old_service)
         return result
     except Exception as e:
         print(f"❌ Error verificando {service_name}: {e}")
         return False
 
 
-def wait_for_services(services=None, max_retries=30, delay=2):
+async def check_service_health_async(service_name):
     """
-    Espera a que los servicios estén disponibles.
+    Verifica de forma asíncrona que un servicio específico esté disponible.
+
+    No modifica el servicio actual, por lo que puede ejecutarse en paralelo
+    para varios servicios.
+
+    Args:
+        service_name (str): Nombre del servicio a verificar.
+
+    Returns:
+        bool: True si el servicio está disponible, False en caso contrario.
+    """
+    try:
+        if service_name in [
+            "service-discovery",
+            "cloud-config",
+            "api-gateway",
+            "proxy-client",
+        ]:
+            response = await make_request_async(
+                "GET", "actuator/health", service_name=service_name
+            )
+            return response.status_code in [200, 404]
+
+        endpoint_map = {
+            "user-service": "api/users",
+            "product-service": "api/products",
+            "order-service": "api/orders",
+            "payment-service": "api/payments",
+            "favourite-service": "api/favourites",
+            "shipping-service": "api/shippings",
+        }
+        endpoint = endpoint_map.get(service_name, "actuator/health")
+        response = await make_request_async("GET", endpoint, service_name=service_name)
+        return response.status_code in [200, 401, 403]
+    except Exception as e:
+        print(f"❌ Error verificando {service_name}: {e}")
+        return False
+
+
+async def check_actuator_health_async(service_name):
+    """
+    Verifica un servicio con su endpoint actuator/health (sin consultar datos).
+
+    Args:
+        service_name (str): Nombre del servicio a verificar.
+
+    Returns:
+        bool: True si el servicio responde, False en caso contrario.
+    """
+    try:
+        response = await make_request_async(
+            "GET", "actuator/health", service_name=service_name
+        )
+        # 401/403 indican que el servicio responde aunque proteja el endpoint; un
+        # 404 puede venir del gateway cuando la ruta al servicio aún no existe
+        return response.status_code in [200, 401, 403]
+    except Exception as e:
+        print(f"❌ Error verificando {service_name}: {e}")
+        return False
+
+
+def parse_eureka_registry(payload):
+    """
+    Extrae el estado de las instancias de la respuesta JSON de /eureka/apps.
+
+    Args:
+        payload (dict): Cuerpo JSON del registro de Eureka.
+
+    Returns:
+        dict: {NOMBRE-APLICACION: [estado de cada instancia]}
+    """
+    applications = (payload or {}).get("applications") or {}
+    apps = applications.get("application") or []
+    # Eureka serializa como objeto las listas de un solo elemento
+    if isinstance(apps, dict):
+        apps = [apps]
+
+    registry = {}
+    for app in apps:
+        instances = app.get("instance") or []
+        if isinstance(instances, dict):
+            instances = [instances]
+        registry[app.get("name", "").upper()] = [
+            instance.get("status", "UNKNOWN") for instance in instances
+        ]
+    return registry
+
+
+async def get_eureka_registry_async():
+    """
+    Consulta una sola vez el registro de aplicaciones del Service Discovery.
+
+    Returns:
+        dict: Estados por aplicación (ver parse_eureka_registry), o None si el
+            registro no está disponible.
+    """
+    try:
+        response = await make_request_async(
+            "GET", EUREKA_APPS_ENDPOINT, service_name="service-discovery"
+        )
+        if response.status_code != 200:
+            return None
+        return parse_eureka_registry(response.json())
+    except Exception as e:
+        print(f"❌ Error consultando el registro de Eureka: {e}")
+        return None
+
+
+class _EurekaRegistryCache:
+    """
+    Comparte una misma consulta al registro entre los sondeos concurrentes.
+    """
+
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._registry = None
+        self._fetched_at = None
+        self._lock = asyncio.Lock()
+
+    async def get(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._fetched_at is None or now - self._fetched_at >= self.max_age:
+                self._registry = await get_eureka_registry_async()
+                self._fetched_at = time.monotonic()
+            return self._registry
+
+
+async def _check_service_registry_async(service_name, registry_cache):
+    """
+    Verifica un servicio a partir del registro de Eureka.
+
+    Los servicios registrados se consideran disponibles si alguna instancia
+    está UP; los no registrados se verifican con actuator/health.
+    """
+    registry = await registry_cache.get()
+
+    if service_name == "service-discovery":
+        return registry is not None
+
+    statuses = (registry or {}).get(service_name.upper())
+    if statuses:
+        return "UP" in statuses
+
+    return await check_actuator_health_async(service_name)
+
+
+async def _wait_for_service_async(
+    service, check, max_retries, delay, deadline_at, start
+):
+    """
+    Sondea un servicio con backoff exponencial hasta que esté disponible.
+
+    Returns:
+        tuple: (disponible, segundos hasta el resultado, intentos realizados)
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline_at - time.monotonic()
+        try:
+            available = await asyncio.wait_for(
+                check(service), timeout=max(remaining, 0.1)
+            )
+        except asyncio.TimeoutError:
+            available = False
+
+        elapsed = time.monotonic() - start
+        if available:
+            print(f"✅ {service} disponible en {elapsed:.1f}s (intento {attempt})")
+            return True, elapsed, attempt
+
+        remaining = deadline_at - time.monotonic()
+        if attempt >= max_retries or remaining <= 0:
+            print(
+                f"❌ {service} no disponible después de {attempt} intentos ({elapsed:.1f}s)"
+            )
+            return False, elapsed, attempt
+
+        wait = min(
+            exponential_backoff(attempt - 1, WAIT_INITIAL_DELAY, delay), remaining
+        )
+        print(
+            f"⏳ {service} no disponible... intento {attempt}/{max_retries}, "
+            f"reintento en {wait:.1f}s"
+        )
+        await asyncio.sleep(wait)
+
+
+async def wait_for_services_async(
+    services=None, max_retries=30, delay=2, deadline=None, mode=None
+):
+    """
+    Espera de forma concurrente a que los servicios estén disponibles.
+
+    Todos los servicios se sondean a la vez, cada uno con su propio backoff
+    exponencial con jitter, de modo que el tiempo total lo marca el servicio
+    más lento y no la suma de todos.
 
     Args:
         services (list, optional): Lista de servicios a verificar. Si es None, verifica todos.
-        max_retries (int): Número máximo de reintentos.
-        delay (int): Delay entre reintentos en segundos.
+        max_retries (int): Número máximo de intentos por servicio.
+        delay (float): Espera máxima entre intentos en segundos.
+        deadline (float, optional): Tiempo límite global en segundos. Si es None,
+            se usa max_retries * delay.
+        mode (str, optional): 'eureka' usa el registro del Service Discovery y
+            actuator/health para los no registrados; 'probe' consulta un
+            endpoint de negocio por servicio. Si es None, usa READINESS_MODE.
 
     Returns:
         dict: Estado de cada servicio.
     """
     if services is None:
         services = list(SERVICES_CONFIG.keys())
+    if deadline is None:
+        deadline = max_retries * delay
+    if mode is None:
+        mode = READINESS_MODE
 
-    print(f"🔍 Verificando disponibilidad de servicios: {', '.join(services)}")
+    if mode == "eureka":
+        # Una consulta al registro por intervalo de sondeo, compartida por
+        # todos los servicios en lugar de una por servicio y reintento
+        registry_cache = _EurekaRegistryCache(max_age=delay)
 
-    results = {}
+        async def check(service):
+            return await _check_service_registry_async(service, registry_cache)
 
-    for service in services:
-        print(f"\n🔍 Verificando {service}...")
-        for i in range(max_retries):
-            if check_service_health(service):
-                print(f"✅ {service} disponible")
-                results[service] = True
-                break
-            else:
-                print(f"⏳ {service} no disponible... intento {i+1}/{max_retries}")
-                time.sleep(delay)
-        else:
-            print(f"❌ {service} no disponible después de {max_retries} intentos")
-            results[service] = False
+    elif mode == "probe":
+        check = check_service_health_async
+    else:
+        raise ValueError(f"Modo de verificación no soportado: {mode}")
+
+    print(f"🔍 Verificando disponibilidad de servicios ({mode}): {', '.join(services)}")
+
+    start = time.monotonic()
+    deadline_at = start + deadline
+    outcomes = await asyncio.gather(
+        *[
+            _wait_for_service_async(
+                service, check, max_retries, delay, deadline_at, start
+            )
+            for service in services
+        ]
+    )
+
+    results = {}
+    print(f"\n⏱️ Tiempo hasta disponibilidad (límite global {deadline:.0f}s):")
+    for service, (available, elapsed, attempts) in zip(services, outcomes):
+        results[service] = available
+        status = "✅" if available else "❌"
+        print(f"  {status} {service}: {elapsed:.1f}s ({attempts} intentos)")
+    print(f"  Total: {time.monotonic() - start:.1f}s")
 
     return results
 
 
+def wait_for_services(services=None, max_retries=30, delay=2, deadline=None, mode=None):
+    """
+    Espera a que los servicios estén disponibles.
+
+    Versión bloqueante de wait_for_services_async(); no debe llamarse desde
+    un event loop en ejecución.
+
+    Args:
+        services (list, optional): Lista de servicios a verificar. Si es None, verifica todos.
+        max_retries (int): Número máximo de intentos por servicio.
+        delay (float): Espera máxima entre intentos en segundos.
+        deadline (float, optional): Tiempo límite global en segundos.
+        mode (str, optional): 'eureka' o 'probe'. Si es None, usa READINESS_MODE.
+
+    Returns:
+        dict: Estado de cada servicio.
+    """
+
+    async def _run():
+        try:
+            return await wait_for_services_async(
+                services, max_retries, delay, deadline, mode
+            )
+        finally:
+            await close_async_sessions()
+
+    return asyncio.run(_run())
+
+
 def reset_auth_token():
     """
     Resetea el token de autenticación para forzar una nueva autenticación.
     """
-    global _jwt_token
-    _jwt_token = None
+    _token_manager.invalidate()
     print("🔄 Token de autenticación reseteado")
 
 
@@ -0,0 +1,266 @@
+"""
+Patrones de llegada de las pruebas de carga (modelo abierto).
+
+Un patrón define la tasa de llegadas (solicitudes por segundo) en cada
+instante, no un número de usuarios. Las llegadas se programan de antemano según
+esa tasa y no dependen de lo que tarden las respuestas: si el sistema se
+degrada, las solicitudes se acumulan en vuelo en lugar de frenar la carga, que
+es como se comporta el tráfico real de un gateway.
+
+El instante de la n-ésima llegada se obtiene invirtiendo el número esperado de
+llegadas hasta t, Λ(t) = ∫ tasa. Con llegadas regulares las llegadas caen en
+Λ(t) = 1, 2, 3, ...; con llegadas de Poisson, en una suma de exponenciales de
+media 1 (un proceso de Poisson de tasa variable).
+"""
+
+import math
+import random
+
+
+class ArrivalPattern:
+    """
+    Patrón de llegadas de duración finita.
+
+    Las subclases implementan rate(), expected() e inverse().
+    """
+
+    duration = 0.0
+
+    def rate(self, t):
+        """Tasa de llegadas (por segundo) en el instante t."""
+        raise NotImplementedError
+
+    def expected(self, t):
+        """Número esperado de llegadas entre 0 y t (Λ(t))."""
+        raise NotImplementedError
+
+    def inverse(self, n):
+        """Instante t en el que Λ(t) = n."""
+        raise NotImplementedError
+
+    def total(self):
+        """Número esperado de llegadas del patrón."""
+        return self.expected(self.duration)
+
+    def arrivals(self, poisson=False, rng=None):
+        """
+        Genera los instantes de llegada.
+
+        Args:
+            poisson (bool): Si es True, las llegadas siguen un proceso de Poisson;
+                si no, están espaciadas regularmente.
+            rng (random.Random, optional): Generador para las llegadas de Poisson.
+
+        Yields:
+            float: Segundos desde el inicio del patrón, en orden creciente.
+        """
+        rng = rng or random.Random()
+        total = self.total()
+        n = 0.0
+        while True:
+            n += rng.expovariate(1.0) if poisson else 1.0
+            if n > total:
+                return
+            yield self.inverse(n)
+
+    def describe(self):
+        """Descripción legible del patrón."""
+        raise NotImplementedError
+
+
+class ConstantRate(ArrivalPattern):
+    """Tasa de llegadas constante."""
+
+    def __init__(self, rate, duration):
+        """
+        Args:
+            rate (float): Solicitudes por segundo.
+            duration (float): Duración en segundos.
+        """
+        if rate <= 0 or duration <= 0:
+            raise ValueError("La tasa y la duración deben ser positivas")
+        self._rate = float(rate)
+        self.duration = float(duration)
+
+    def rate(self, t):
+        return self._rate
+
+    def expected(self, t):
+        return self._rate * min(max(t, 0.0), self.duration)
+
+    def inverse(self, n):
+        return n / self._rate
+
+    def describe(self):
+        return f"{self._rate:g} sol/s durante {self.duration:g}s"
+
+
+class Ramp(ArrivalPattern):
+    """Tasa de llegadas que varía linealmente entre dos valores."""
+
+    def __init__(self, start_rate, end_rate, duration):
+        """
+        Args:
+            start_rate (float): Solicitudes por segundo al inicio.
+            end_rate (float): Solicitudes por segundo al final.
+            duration (float): Duración en segundos.
+        """
+        if start_rate < 0 or end_rate < 0 or start_rate + end_rate == 0:
+            raise ValueError("Las tasas no pueden ser negativas ni ambas cero")
+        if duration <= 0:
+            raise ValueError("La duración debe ser positiva")
+        self.start_rate = float(start_rate)
+        self.end_rate = float(end_rate)
+        self.duration = float(duration)
+        # Λ(t) = start_rate * t + slope * t² / 2
+        self._slope = (self.end_rate - self.start_rate) / self.duration
+
+    def rate(self, t):
+        return self.start_rate + self._slope * min(max(t, 0.0), self.duration)
+
+    def expected(self, t):
+        t = min(max(t, 0.0), self.duration)
+        return self.start_rate * t + self._slope * t * t / 2
+
+    def inverse(self, n):
+        if self._slope == 0:
+            return n / self.start_rate
+        # Raíz positiva de slope/2 * t² + start_rate * t - n = 0
+        discriminant = self.start_rate**2 + 2 * self._slope * n
+        return (math.sqrt(max(discriminant, 0.0)) - self.start_rate) / self._slope
+
+    def describe(self):
+        return (
+            f"rampa de {self.start_rate:g} a {self.end_rate:g} sol/s "
+            f"durante {self.duration:g}s"
+        )
+
+
+class Stages(ArrivalPattern):
+    """Varios patrones seguidos (ej: rampa de subida, meseta y rampa de bajada)."""
+
+    def __init__(self, stages):
+        """
+        Args:
+            stages (list): ArrivalPattern en el orden en que se ejecutan.
+        """
+        if not stages:
+            raise ValueError("Se necesita al menos una etapa")
+        self.stages = list(stages)
+        self.duration = sum(stage.duration for stage in self.stages)
+
+    def _locate(self, t):
+        """Etapa que contiene el instante t y el inicio de esa etapa."""
+        start = 0.0
+        for stage in self.stages:
+            if t < start + stage.duration:
+                return stage, start
+            start += stage.duration
+        return self.stages[-1], start - self.stages[-1].duration
+
+    def rate(self, t):
+        stage, start = self._locate(t)
+        return stage.rate(t - start)
+
+    def expected(self, t):
+        count = 0.0
+        start = 0.0
+        for stage in self.stages:
+            if t <= start:
+                break
+            count += stage.expected(t - start)
+            start += stage.duration
+        return count
+
+    def inverse(self, n):
+        start = 0.0
+        for stage in self.stages:
+            stage_total = stage.total()
+            if n <= stage_total:
+                return start + stage.inverse(n)
+            n -= stage_total
+            start += stage.duration
+        return self.duration
+
+    def describe(self):
+        return ", luego ".join(stage.describe() for stage in self.stages)
+
+
+class WorkerShare(ArrivalPattern):
+    """
+    Parte de un patrón que genera un proceso trabajador de entre varios.
+
+    Con llegadas regulares, el trabajador i de N toma las llegadas i+1, i+1+N,
+    i+1+2N, ... del patrón completo: la unión de todos los trabajadores es
+    exactamente la secuencia original, sin ráfagas de N llegadas simultáneas.
+    Con llegadas de Poisson, cada trabajador genera un proceso de tasa/N; la
+    superposición de procesos de Poisson independientes es un proceso de
+    Poisson de la tasa completa.
+    """
+
+    def __init__(self, pattern, index, workers):
+        """
+        Args:
+            pattern (ArrivalPattern): Patrón completo.
+            index (int): Número del trabajador, desde 0.
+            workers (int): Número de trabajadores.
+        """
+        if not 0 <= index < workers:
+            raise ValueError("El índice del trabajador debe estar entre 0 y workers-1")
+        self.pattern = pattern
+        self.index = index
+        self.workers = workers
+        self.duration = pattern.duration
+
+    def rate(self, t):
+        return self.pattern.rate(t) / self.workers
+
+    def expected(self, t):
+        return self.pattern.expected(t) / self.workers
+
+    def inverse(self, n):
+        return self.pattern.inverse(n * self.workers)
+
+    def arrivals(self, poisson=False, rng=None):
+        if poisson:
+            yield from super().arrivals(True, rng)
+            return
+        total = self.pattern.total()
+        n = self.index + 1
+        while n <= total:
+            yield self.pattern.inverse(n)
+            n += self.workers
+
+    def describe(self):
+        return f"{self.pattern.describe()} (parte {self.index + 1} de {self.workers})"
+
+
+def parse_stages(spec):
+    """
+    Interpreta una lista de etapas en texto.
+
+    Cada etapa es 'tasa:duración' (tasa constante) o 'inicio-fin:duración'
+    (rampa), separadas por comas. Ejemplo: '0-50:60,50:300,50-0:30' sube de 0 a
+    50 sol/s en un minuto, mantiene 50 sol/s cinco minutos y baja en 30 s.
+
+    Args:
+        spec (str): Etapas separadas por comas.
+
+    Returns:
+        ArrivalPattern: La única etapa, o Stages si hay varias.
+
+    Raises:
+        ValueError: Si alguna etapa no tiene el formato esperado.
+    """
+    stages = []
+    for part in spec.split(","):
+        try:
+            rates, duration = part.strip().split(":")
+            if "-" in rates:
+                start_rate, end_rate = rates.split("-")
+                stages.append(Ramp(float(start_rate), float(end_rate), float(duration)))
+            else:
+                stages.append(ConstantRate(float(rates), float(duration)))
+        except ValueError as e:
+            raise ValueError(f"Etapa inválida '{part}': {e}") from None
+    return stages[0] if len(stages) == 1 else Stages(stages)
@@ -0,0 +1,239 @@
+"""
+Catálogo de endpoints de las pruebas de carga.
+
+El catálogo se lee de api-endpoints.md, la documentación de la API, para no
+mantener una segunda lista de endpoints: cada fila de las tablas se convierte
+en un CatalogEndpoint con su servicio, método y ruta. Los endpoints con
+parámetros de ruta ({userId}, {productId}/{likeDate}, ...) se rellenan con
+elementos reales de la colección del recurso, obtenidos antes de la carga.
+
+El documento no siempre coincide con los controladores (ej: /api/addresses se
+sirve en /api/address); las diferencias se corrigen con una tabla de rutas
+(CATALOG_PATH_OVERRIDES en config.py), y los endpoints cuya colección responde
+404 se omiten en lugar de contar como errores en cada llamada.
+"""
+
+import random
+import re
+from collections import namedtuple
+
+from common.log import get_logger
+from common.timeouts import endpoint_template
+
+# Endpoint documentado; resource es la "Base URL" de su sección
+CatalogEndpoint = namedtuple(
+    "CatalogEndpoint", ["service", "method", "path", "resource", "description"]
+)
+
+# Parámetros de ruta cuyo nombre no coincide con el campo del JSON
+PLACEHOLDER_FIELDS = {
+    "tokenId": "verificationTokenId",
+}
+
+# Endpoints que leen un objeto del cuerpo de un GET o DELETE; no se usan en la carga
+BODY_ENDPOINTS = frozenset({"/api/favourites/find", "/api/favourites/delete"})
+
+_BASE_URL = re.compile(r"^Base URL:\s*`([^`]+)`")
+_ROW = re.compile(r"^\|\s*(GET|POST|PUT|DELETE)\s*\|\s*`([^`]+)`\s*\|\s*(.*?)\s*\|\s*$")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+_log = get_logger("load.catalog")
+
+
+def load_catalog(path, resource_services, path_overrides=None):
+    """
+    Lee los endpoints de api-endpoints.md.
+
+    Args:
+        path (str): Ruta del documento.
+        resource_services (dict): Servicio de cada "Base URL" (RESOURCE_SERVICES).
+            Las secciones sin servicio (autenticación) se omiten.
+        path_overrides (dict, optional): Ruta real de cada ruta documentada
+            (tanto de las filas como de las "Base URL"), o None para excluirla.
+
+    Returns:
+        list: CatalogEndpoint en el orden del documento, con las rutas reales.
+    """
+    path_overrides = path_overrides or {}
+    endpoints = []
+    resource = None
+    with open(path, encoding="utf-8") as catalog_file:
+        for line in catalog_file:
+            line = line.strip()
+            match = _BASE_URL.match(line)
+            if match:
+                resource = match.group(1)
+                continue
+            match = _ROW.match(line)
+            if match and resource in resource_services:
+                method, endpoint_path, description = match.groups()
+                real_path = path_overrides.get(endpoint_path, endpoint_path)
+                real_resource = path_overrides.get(resource, resource)
+                if real_path is None or real_resource is None:
+                    _log.debug("⏭️ %s %s excluido del catálogo", method, endpoint_path)
+                    continue
+                endpoints.append(
+                    CatalogEndpoint(
+                        resource_services[resource],
+                        method,
+                        real_path,
+                        real_resource,
+                        description,
+                    )
+                )
+    return endpoints
+
+
+def placeholders(path):
+    """
+    Obtiene los parámetros de ruta de un endpoint.
+
+    Args:
+        path (str): Ruta, ej: '/api/favourites/{userId}/{productId}/{likeDate}'.
+
+    Returns:
+        list: Nombres de los parámetros, en orden.
+    """
+    return _PLACEHOLDER.findall(path)
+
+
+def read_endpoints(catalog, services=None, patterns=None):
+    """
+    Selecciona los endpoints de lectura (GET) que admite la carga.
+
+    Args:
+        catalog (list): CatalogEndpoint de load_catalog().
+        services (iterable, optional): Servicios incluidos; None incluye todos.
+        patterns (iterable, optional): Subcadenas de la ruta; se incluyen los
+            endpoints que contengan alguna. None incluye todos.
+
+    Returns:
+        list: CatalogEndpoint seleccionados.
+    """
+    services = set(services) if services else None
+    patterns = list(patterns) if patterns else None
+    return [
+        endpoint
+        for endpoint in catalog
+        if endpoint.method == "GET"
+        and endpoint.path not in BODY_ENDPOINTS
+        and (services is None or endpoint.service in services)
+        and (patterns is None or any(p in endpoint.path for p in patterns))
+    ]
+
+
+class LoadTarget:
+    """
+    Endpoint listo para enviarse durante la carga.
+
+    Los parámetros de ruta se rellenan en cada llamada a endpoint() con un
+    elemento elegido al azar de los datos de ejemplo.
+    """
+
+    def __init__(self, catalog_endpoint, samples=None, weight=1.0):
+        """
+        Args:
+            catalog_endpoint (CatalogEndpoint): Endpoint del catálogo.
+            samples (list, optional): Valores de los parámetros de ruta, un dict
+                {parámetro: valor} por elemento. Obligatorio si la ruta tiene parámetros.
+            weight (float): Peso relativo en la mezcla de solicitudes.
+        """
+        self.service = catalog_endpoint.service
+        self.method = catalog_endpoint.method
+        self.path = catalog_endpoint.path
+        self.weight = weight
+        self.samples = samples or []
+        self.template = endpoint_template(self.service, self.method, self.path)
+
+    def endpoint(self, rng=random):
+        """
+        Genera la ruta de una solicitud.
+
+        Args:
+            rng (random.Random): Generador de números aleatorios.
+
+        Returns:
+            str: Ruta con los parámetros rellenados.
+        """
+        if not self.samples:
+            return self.path
+        return self.path.format(**rng.choice(self.samples))
+
+    def __repr__(self):
+        return f"LoadTarget({self.template!r}, weight={self.weight})"
+
+
+def path_samples(path, items, limit=None):
+    """
+    Extrae de los elementos de una colección los valores de los parámetros de una ruta.
+
+    Args:
+        path (str): Ruta con parámetros.
+        items (list): Elementos de la colección del recurso.
+        limit (int, optional): Máximo de muestras.
+
+    Returns:
+        list: Un dict {parámetro: valor} por elemento que tiene todos los campos.
+    """
+    names = placeholders(path)
+    samples = []
+    for item in items:
+        try:
+            samples.append(
+                {name: item[PLACEHOLDER_FIELDS.get(name, name)] for name in names}
+            )
+        except (KeyError, TypeError):
+            continue
+        if limit and len(samples) >= limit:
+            break
+    return samples
+
+
+async def build_targets(endpoints, fetch_collection, seed_limit=100, weights=None):
+    """
+    Prepara los endpoints seleccionados para la carga.
+
+    La colección de cada recurso se descarga una vez: si responde 404 el
+    recurso no existe en el servicio y sus endpoints se omiten con un aviso.
+    Con ella se rellenan los endpoints con parámetros de ruta; los que no se
+    pueden rellenar (colección vacía o sin los campos) también se omiten.
+
+    Args:
+        endpoints (list): CatalogEndpoint de read_endpoints().
+        fetch_collection (callable): Corrutina (servicio, recurso) -> lista de
+            elementos, o None si la colección responde 404.
+        seed_limit (int): Elementos usados por endpoint.
+        weights (dict, optional): Peso por ruta del catálogo; por defecto 1.
+
+    Returns:
+        list: LoadTarget listos para la carga.
+    """
+    weights = weights or {}
+    collections = {}
+    targets = []
+    for endpoint in endpoints:
+        key = (endpoint.service, endpoint.resource)
+        if key not in collections:
+            collections[key] = await fetch_collection(*key)
+        if collections[key] is None:
+            _log.warning(
+                "⚠️ %s no existe en %s (404); el endpoint %s %s se omite",
+                endpoint.resource,
+                endpoint.service,
+                endpoint.method,
+                endpoint.path,
+            )
+            continue
+
+        samples = None
+        if placeholders(endpoint.path):
+            samples = path_samples(endpoint.path, collections[key], seed_limit)
+            if not samples:
+                _log.warning(
+                    "⚠️ Sin datos para rellenar %s %s; el endpoint se omite",
+                    endpoint.method,
+                    endpoint.path,
+                )
+                continue
+        targets.append(LoadTarget(endpoint, samples, weights.get(endpoint.path, 1.0)))
+    return targets
@@ -0,0 +1,172 @@
+"""
+Cliente del API Gateway para las pruebas de carga.
+
+Reúne las piezas compartidas con las suites de integración y E2E: el pool de
+sesiones aiohttp por servicio (common.async_client), la construcción de URLs
+y headers de SERVICES_CONFIG (common.http_client) y el token JWT cacheado
+(common.auth), de modo que un proceso de carga se autentica una sola vez.
+"""
+
+import aiohttp
+
+from common.async_client import AsyncSessionPool
+from common.http_client import build_url, build_headers, encode_json_body
+from common.log import get_logger
+
+_log = get_logger("load.client")
+
+
+class GatewayClient:
+    """
+    Cliente asíncrono de los servicios de SERVICES_CONFIG.
+
+    Debe usarse dentro de un único event loop; close() cierra sus sesiones.
+    """
+
+    def __init__(
+        self,
+        services_config,
+        auth_endpoint,
+        credentials,
+        token_manager,
+        pool_config=None,
+        timeout=15,
+    ):
+        """
+        Args:
+            services_config (dict): SERVICES_CONFIG de la suite.
+            auth_endpoint (str): URL de autenticación.
+            credentials (dict): Usuario de prueba ({"username", "password"}).
+            token_manager (TokenManager): Caché del token JWT.
+            pool_config (dict, optional): Límites de conexión (ver DEFAULT_ASYNC_POOL_CONFIG).
+            timeout (float | tuple): Timeout de cada solicitud.
+        """
+        self.services_config = services_config
+        self.auth_endpoint = auth_endpoint
+        self.credentials = credentials
+        self.token_manager = token_manager
+        self.timeout = timeout
+        self.pool = AsyncSessionPool(services_config, pool_config)
+        self._rejected_token = None
+
+    async def _authenticate(self):
+        """Llama al endpoint de autenticación y devuelve un token JWT nuevo."""
+        try:
+            response = await self.pool.request(
+                "api-gateway",
+                "POST",
+                self.auth_endpoint,
+                json=self.credentials,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                },
+                timeout=self.timeout,
+            )
+        except aiohttp.ClientError as e:
+            raise Exception(f"Error de conexión al obtener token: {e}")
+
+        if response.status_code != 200:
+            raise Exception(
+                f"Error {response.status_code} al obtener token: {response.text}"
+            )
+
+        auth_data = response.json()
+        token = auth_data.get("jwtToken")
+        if not token:
+            raise Exception(f"Token no encontrado en la respuesta: {auth_data}")
+
+        _log.info("✅ Token JWT obtenido exitosamente")
+        return token
+
+    async def token(self):
+        """
+        Obtiene un token JWT vigente sin bloquear el event loop.
+
+        Returns:
+            str: Token JWT.
+        """
+        return await self.token_manager.get_token_async(
+            self._authenticate, self.pool.lock("auth")
+        )
+
+    async def request(
+        self, service_name, method, endpoint, data=None, params=None, headers=None
+    ):
+        """
+        Realiza una solicitud a un servicio.
+
+        Si el gateway responde 401, el token se descarta (una sola vez por
+        token) para que las solicitudes siguientes obtengan uno nuevo.
+
+        Args:
+            service_name (str): Nombre del servicio en SERVICES_CONFIG.
+            method (str): Método HTTP.
+            endpoint (str): Endpoint relativo del servicio.
+            data (object, optional): Cuerpo JSON.
+            params (dict, optional): Parámetros de consulta.
+            headers (dict, optional): Headers adicionales.
+
+        Returns:
+            AsyncResponse: Respuesta con el cuerpo ya leído.
+        """
+        service_config = self.services_config.get(service_name)
+        if not service_config:
+            raise ValueError(
+                f"Servicio '{service_name}' no está configurado. Servicios disponibles: {list(self.services_config.keys())}"
+            )
+
+        token = None
+        if service_config.get("requires_auth", True):
+            token = await self.token()
+
+        kwargs = {}
+        if params:
+            kwargs["params"] = params
+        if data is not None:
+            kwargs["data"] = encode_json_body(data)
+
+        response = await self.pool.request(
+            service_name,
+            method,
+            build_url(service_config, endpoint),
+            headers=build_headers(service_config, token, headers),
+            timeout=self.timeout,
+            **kwargs,
+        )
+        if response.status_code == 401 and token and token != self._rejected_token:
+            self._rejected_token = token
+            self.token_manager.invalidate()
+        return response
+
+    async def fetch_collection(self, service_name, endpoint, key="collection"):
+        """
+        Descarga la colección de un endpoint findAll.
+
+        Args:
+            service_name (str): Nombre del servicio.
+            endpoint (str): Endpoint de la colección (ej: '/api/users').
+            key (str): Clave del arreglo en la respuesta.
+
+        Returns:
+            list: Elementos de la colección (vacía si la respuesta no es 200),
+                o None si responde 404: el recurso no existe en el servicio.
+        """
+        try:
+            response = await self.request(service_name, "GET", endpoint)
+        except aiohttp.ClientError as e:
+            _log.warning("⚠️ No se pudo obtener %s: %s", endpoint, e)
+            return []
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            _log.warning("⚠️ %s respondió %s", endpoint, response.status_code)
+            return []
+        payload = response.json()
+        if isinstance(payload, dict):
+            payload = payload.get(key, [])
+        return payload if isinstance(payload, list) else []
+
+    async def close(self):
+        """Cierra las sesiones abiertas."""
+        await self.pool.close()
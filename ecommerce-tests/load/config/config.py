@@ -0,0 +1,115 @@
+"""
+Configuración para las pruebas de carga.
+"""
+
+import os
+from pathlib import Path
+
+from common.services import gateway_services_config
+
+# URLs de servicios de infraestructura
+API_GATEWAY_URL = os.getenv("API_GATEWAY_URL", "http://localhost:8222")
+
+# Configuración de servicios: solo los que se exponen a través del API Gateway,
+# con las mismas rutas que las suites de integración y E2E (common/services.py)
+SERVICES_CONFIG = gateway_services_config(API_GATEWAY_URL)
+
+# Configuración de autenticación
+AUTH_ENDPOINT = f"{API_GATEWAY_URL}/app/api/authenticate"
+
+# Caché del token JWT compartida con las suites de integración y E2E
+TOKEN_CACHE_CONFIG = {
+    # Segundos antes de la expiración (claim exp) en los que se renueva el token
+    "refresh_margin": int(os.getenv("TOKEN_REFRESH_MARGIN", "60")),
+    # Archivo de caché explícito; si no se indica se genera en cache_dir
+    "cache_path": os.getenv("TOKEN_CACHE_PATH"),
+    # Directorio de la caché; por defecto, el temporal del sistema
+    "cache_dir": os.getenv("TOKEN_CACHE_DIR"),
+}
+
+# Tiempo de espera total de cada solicitud (en segundos); las que lo superan
+# cuentan como error
+REQUEST_TIMEOUT = float(os.getenv("LOAD_REQUEST_TIMEOUT", "15"))
+
+# Límites de conexiones del cliente asíncrono (por servicio)
+ASYNC_POOL_CONFIG = {
+    "limit_per_service": int(os.getenv("LOAD_CONNECTIONS_PER_SERVICE", "200")),
+    # Límites específicos, ej: {"favourite-service": 20}
+    "service_limits": {},
+}
+
+# Registro estructurado del arnés (ver common/log.py)
+LOG_CONFIG = {
+    # Nivel de la consola: DEBUG muestra cada solicitud, WARNING solo avisos y errores
+    "console_level": os.getenv("TEST_LOG_LEVEL", "INFO"),
+    # Archivo JSONL con un registro por línea; vacío lo desactiva
+    "jsonl_path": os.getenv("TEST_LOG_FILE") or None,
+    "jsonl_level": os.getenv("TEST_LOG_FILE_LEVEL", "DEBUG"),
+    # Registros acumulados en memoria antes de escribirlos en el archivo
+    "buffer_size": int(os.getenv("TEST_LOG_BUFFER", "512")),
+}
+
+# Usuario de prueba para autenticación
+TEST_USER = {
+    "username": "selimhorri",
+    "password": "12345",
+}
+
+# Servicio que atiende cada recurso del catálogo de endpoints (api-endpoints.md)
+RESOURCE_SERVICES = {
+    "/api/users": "user-service",
+    "/api/credentials": "user-service",
+    "/api/addresses": "user-service",
+    "/api/verification-tokens": "user-service",
+    "/api/products": "product-service",
+    "/api/categories": "product-service",
+    "/api/orders": "order-service",
+    "/api/carts": "order-service",
+    "/api/payments": "payment-service",
+    "/api/shippings": "shipping-service",
+    "/api/order-items": "shipping-service",
+    "/api/favourites": "favourite-service",
+    # Rutas reales de los controladores (ver CATALOG_PATH_OVERRIDES)
+    "/api/address": "user-service",
+    "/api/verificationTokens": "user-service",
+}
+
+# Rutas de api-endpoints.md que no coinciden con los controladores: la ruta
+# real de cada una, o None si ningún servicio la expone y se excluye de la carga
+CATALOG_PATH_OVERRIDES = {
+    "/api/addresses": "/api/address",
+    "/api/addresses/{addressId}": "/api/address/{addressId}",
+    "/api/verification-tokens": "/api/verificationTokens",
+    "/api/verification-tokens/{tokenId}": "/api/verificationTokens/{tokenId}",
+    "/api/shippings/{shippingId}": "/api/shippings/{orderId}/{productId}",
+    "/api/order-items": None,
+    "/api/order-items/{orderItemId}": None,
+}
+
+# Configuración específica de las pruebas de carga
+LOAD_CONFIG = {
+    # Catálogo de endpoints del que se obtiene la carga de trabajo
+    "catalog_path": os.getenv(
+        "LOAD_CATALOG_PATH",
+        str(Path(__file__).resolve().parents[2] / "api-endpoints.md"),
+    ),
+    # Patrón de llegadas por defecto: solicitudes por segundo y duración en segundos
+    "rate": float(os.getenv("LOAD_RATE", "10")),
+    "duration": float(os.getenv("LOAD_DURATION", "60")),
+    # Llegadas de Poisson en lugar de intervalos regulares
+    "poisson": os.getenv("LOAD_POISSON", "false").lower() == "true",
+    # Solicitudes en vuelo máximas; las llegadas por encima se descartan y se cuentan
+    "max_in_flight": int(os.getenv("LOAD_MAX_IN_FLIGHT", "1000")),
+    # Elementos de cada colección que se usan para rellenar los {id} de los endpoints
+    "seed_limit": int(os.getenv("LOAD_SEED_LIMIT", "100")),
+    # Directorio de los resultados JSON
+    "reports_dir": os.getenv("LOAD_REPORTS_DIR", "reports"),
+    # Escenarios por recorridos (--scenario): usuarios virtuales, segundos en
+    # que se incorporan y factor de las pausas entre pasos (0 las desactiva)
+    "users": int(os.getenv("LOAD_USERS", "10")),
+    "ramp_up": float(os.getenv("LOAD_RAMP_UP", "0")),
+    "think_scale": float(os.getenv("LOAD_THINK_SCALE", "1")),
+    # Procesos generadores del modelo abierto ('auto': uno por núcleo); la tasa
+    # y max_in_flight se reparten entre ellos
+    "workers": os.getenv("LOAD_WORKERS", "1"),
+}
@@ -0,0 +1,423 @@
+"""
+Pruebas E2E como tareas de carga.
+
+Para no mantener dos versiones de los mismos flujos, las pruebas de
+e2e/tests/test_*.py se pueden ejecutar repetidamente como tareas de usuarios
+virtuales. La selección la hace pytest (rutas, node IDs, -k, -m) con
+--collect-only; después cada iteración instancia la clase de la prueba,
+llama a setup_method, ejecuta la función con un registro cleanup_resources
+nuevo y libera sus recursos con la misma lógica que el fixture
+(release_cleanup_resources del conftest de e2e).
+
+Se registran dos niveles: cada iteración de una prueba, como un recorrido
+(latencia y tasa de fallos por prueba), y cada solicitud HTTP que hacen las
+pruebas, como un endpoint, a través de un listener del TimingRecorder del
+conftest.
+
+Las pruebas E2E son síncronas, así que los usuarios virtuales son hilos.
+Este módulo usa la configuración de e2e (config.config de e2e), por lo que
+no debe importarse en el mismo proceso que load/config.
+"""
+
+import importlib
+import inspect
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from common.log import get_logger
+from common.timings import set_current_node
+from results import LoadRecorder, summarize_load
+
+# Directorio de la suite E2E
+E2E_DIR = Path(__file__).resolve().parents[1] / "e2e"
+
+# Fixtures que el adaptador sabe proporcionar a las pruebas
+SUPPORTED_FIXTURES = frozenset({"cleanup_resources"})
+
+# Segundos entre los mensajes de progreso
+PROGRESS_INTERVAL = 10.0
+
+# Motivos de fallo distintos que se conservan por prueba
+MAX_FAILURE_REASONS = 5
+
+_log = get_logger("load.e2e_tasks")
+
+
+def _failure_reason(error):
+    """Primera línea del error, para agrupar los fallos repetidos."""
+    lines = str(error).strip().splitlines()
+    if not lines:
+        return type(error).__name__
+    return f"{type(error).__name__}: {lines[0]}"
+
+
+def _call_xunit(hook, function):
+    """Llama a setup_method/teardown_method con o sin el método, como hace pytest."""
+    if inspect.signature(hook).parameters:
+        hook(function)
+    else:
+        hook()
+
+
+class _Collector:
+    """Plugin de pytest que guarda los items seleccionados."""
+
+    def __init__(self):
+        self.items = []
+
+    def pytest_collection_finish(self, session):
+        self.items = list(session.items)
+
+
+class E2ETask:
+    """Prueba E2E ejecutable fuera de pytest."""
+
+    def __init__(self, item):
+        """
+        Args:
+            item (pytest.Function): Item recolectado por pytest.
+
+        Raises:
+            ValueError: Si la prueba pide fixtures que el adaptador no proporciona.
+        """
+        self.nodeid = item.nodeid
+        self.cls = item.cls
+        self.function = item.function
+        callspec = getattr(item, "callspec", None)
+        self.params = dict(callspec.params) if callspec else {}
+
+        requested = [
+            name
+            for name in inspect.signature(self.function).parameters
+            if name != "self"
+        ]
+        unsupported = set(requested) - SUPPORTED_FIXTURES - set(self.params)
+        if unsupported:
+            raise ValueError(f"usa fixtures no soportados {sorted(unsupported)}")
+        self.uses_cleanup = "cleanup_resources" in requested
+
+    def run(self, conftest):
+        """
+        Ejecuta una iteración de la prueba.
+
+        La limpieza de recursos se hace al final y no cuenta en la duración.
+
+        Args:
+            conftest (module): conftest de e2e.
+
+        Returns:
+            tuple: (resultado 'passed', 'failed' o 'skipped', motivo del fallo
+                o None, segundos de la prueba sin la limpieza).
+        """
+        instance = self.cls() if self.cls is not None else None
+        kwargs = dict(self.params)
+        resources = None
+        if self.uses_cleanup:
+            resources = kwargs["cleanup_resources"] = conftest.new_cleanup_resources()
+        args = (instance,) if instance is not None else ()
+
+        outcome, reason = "passed", None
+        start = time.perf_counter()
+        try:
+            if hasattr(instance, "setup_method"):
+                _call_xunit(instance.setup_method, self.function)
+            self.function(*args, **kwargs)
+        except pytest.skip.Exception:
+            outcome = "skipped"
+        except Exception as e:
+            outcome = "failed"
+            reason = _failure_reason(e)
+        elapsed = time.perf_counter() - start
+
+        try:
+            if hasattr(instance, "teardown_method"):
+                _call_xunit(instance.teardown_method, self.function)
+        finally:
+            if resources is not None:
+                conftest.release_cleanup_resources(resources)
+        return outcome, reason, elapsed
+
+    def __repr__(self):
+        return f"E2ETask({self.nodeid!r})"
+
+
+def collect_tests(selection, e2e_dir=E2E_DIR):
+    """
+    Selecciona pruebas E2E con la recolección de pytest.
+
+    Args:
+        selection (list): Argumentos de pytest relativos a e2e/ (rutas,
+            node IDs, -k, -m).
+        e2e_dir (Path): Directorio de la suite E2E.
+
+    Returns:
+        list: E2ETask de las pruebas que se pueden ejecutar; las que piden
+            fixtures no soportados se omiten con un aviso.
+
+    Raises:
+        ValueError: Si la recolección falla.
+    """
+    collector = _Collector()
+    cwd = os.getcwd()
+    os.chdir(e2e_dir)
+    try:
+        exit_code = pytest.main(
+            [
+                "--collect-only",
+                "-qq",
+                "-p",
+                "no:cacheprovider",
+                "--rootdir",
+                str(e2e_dir),
+                *selection,
+            ],
+            plugins=[collector],
+        )
+    finally:
+        os.chdir(cwd)
+    if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        raise ValueError(f"La recolección de pytest falló (código {int(exit_code)})")
+
+    tasks = []
+    for item in collector.items:
+        try:
+            tasks.append(E2ETask(item))
+        except ValueError as e:
+            _log.warning("⚠️ %s se omite: %s", item.nodeid, e)
+    return tasks
+
+
+def load_conftest(e2e_dir=E2E_DIR):
+    """
+    Obtiene el conftest de e2e ya importado por collect_tests().
+
+    Returns:
+        module: Módulo conftest de la suite E2E.
+    """
+    conftest = importlib.import_module("conftest")
+    if Path(conftest.__file__).resolve().parent != Path(e2e_dir).resolve():
+        raise ImportError(f"conftest inesperado: {conftest.__file__}")
+    return conftest
+
+
+class E2ELoadRunner:
+    """
+    Ejecuta pruebas E2E repetidamente con usuarios virtuales o con una tasa
+    de llegadas.
+    """
+
+    def __init__(self, tasks, conftest, seed=None, recorder=None):
+        """
+        Args:
+            tasks (list): E2ETask de collect_tests(); se elige una al azar por iteración.
+            conftest (module): conftest de e2e (ver load_conftest()).
+            seed (int, optional): Semilla de la selección de pruebas y de las llegadas.
+            recorder (LoadRecorder, optional): Registro de resultados.
+        """
+        if not tasks:
+            raise ValueError("No hay pruebas E2E para generar carga")
+        self.tasks = list(tasks)
+        self.conftest = conftest
+        self.rng = random.Random(seed)
+        self.recorder = recorder or LoadRecorder()
+        self.skipped = Counter()
+        self.failure_reasons = {}
+        self._lock = threading.Lock()
+        self._start = None
+        self._iterations = 0
+        conftest.get_request_timings().add_listener(self._on_request)
+
+    def _elapsed(self):
+        return time.perf_counter() - self._start
+
+    def _on_request(self, timing):
+        """Registra una solicitud HTTP hecha por una prueba durante la carga."""
+        if self._start is None:
+            return
+        with self._lock:
+            self.recorder.record(
+                timing.template, timing.status, timing.duration, self._elapsed()
+            )
+
+    def iteration(self, task, node_id, offset=None):
+        """
+        Ejecuta una iteración de una prueba y la registra.
+
+        Args:
+            task (E2ETask): Prueba.
+            node_id (str): Node ID con que se asocian sus solicitudes; se
+                descartan del TimingRecorder del conftest al terminar, para que
+                la memoria no crezca durante la carga.
+            offset (float, optional): Instante programado de la llegada en el
+                modelo abierto. La latencia se mide desde ahí, como en
+                load.engine, para no ocultar la espera hasta que un hilo la
+                atiende (omisión coordinada); la duración real de la prueba
+                se conserva como service_time.
+        """
+        started = self._elapsed()
+        set_current_node(node_id)
+        try:
+            outcome, reason, elapsed = task.run(self.conftest)
+        except Exception as e:
+            # Fallo en teardown_method o en la limpieza
+            outcome, reason, elapsed = "failed", _failure_reason(e), 0.0
+        finally:
+            set_current_node(None)
+            self.conftest.get_request_timings().clear_node(node_id)
+
+        with self._lock:
+            self._iterations += 1
+            if outcome == "skipped":
+                self.skipped[task.nodeid] += 1
+                return
+            if offset is None:
+                self.recorder.record_journey(
+                    task.nodeid, outcome == "passed", elapsed, elapsed
+                )
+            else:
+                self.recorder.record_journey(
+                    task.nodeid,
+                    outcome == "passed",
+                    max(0.0, started - offset) + elapsed,
+                    elapsed,
+                    service_time=elapsed,
+                )
+            if reason:
+                reasons = self.failure_reasons.setdefault(task.nodeid, Counter())
+                if reason in reasons or len(reasons) < MAX_FAILURE_REASONS:
+                    reasons[reason] += 1
+        if outcome == "failed":
+            _log.debug("❌ %s: %s", task.nodeid, reason)
+
+    def _progress(self, stop):
+        """Informa periódicamente del avance hasta que stop se activa."""
+        while not stop.wait(PROGRESS_INTERVAL):
+            with self._lock:
+                failures = sum(
+                    stats.failures for stats in self.recorder.journeys.values()
+                )
+                _log.info(
+                    "⏳ %.0fs: %d iteraciones, %d fallidas",
+                    self._elapsed(),
+                    self._iterations,
+                    failures,
+                )
+
+    def _summary(self, pattern=None):
+        """Resumen de la ejecución con las pruebas omitidas y los motivos de fallo."""
+        summary = summarize_load(self.recorder, self._elapsed(), pattern)
+        summary["skipped"] = dict(self.skipped)
+        summary["failure_reasons"] = {
+            nodeid: dict(reasons.most_common())
+            for nodeid, reasons in self.failure_reasons.items()
+        }
+        return summary
+
+    def run_users(self, users, duration, ramp_up=0.0):
+        """
+        Modelo cerrado: N hilos ejecutan pruebas una tras otra.
+
+        Args:
+            users (int): Usuarios virtuales.
+            duration (float): Segundos durante los que se inician iteraciones,
+                ramp_up incluido.
+            ramp_up (float): Segundos en los que se van incorporando los usuarios.
+
+        Returns:
+            dict: Resumen de summarize_load() con totals["users"].
+        """
+        seeds = [self.rng.random() for _ in range(users)]
+
+        def user(vu):
+            rng = random.Random(seeds[vu])
+            if ramp_up and users > 1:
+                time.sleep(ramp_up * vu / users)
+            while self._elapsed() < duration:
+                task = rng.choice(self.tasks)
+                self.iteration(task, f"{task.nodeid}@vu{vu}")
+
+        self._start = time.perf_counter()
+        stop = threading.Event()
+        threading.Thread(target=self._progress, args=(stop,), daemon=True).start()
+        threads = [
+            threading.Thread(target=user, args=(vu,), name=f"vu-{vu}", daemon=True)
+            for vu in range(users)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop.set()
+
+        summary = self._summary()
+        summary["totals"]["users"] = users
+        return summary
+
+    def run_rate(self, pattern, poisson=False, max_in_flight=100):
+        """
+        Modelo abierto: una iteración por llegada del patrón.
+
+        Args:
+            pattern (ArrivalPattern): Patrón de llegadas (iteraciones por segundo).
+            poisson (bool): Llegadas de Poisson en lugar de regulares.
+            max_in_flight (int): Iteraciones simultáneas (hilos) a partir de
+                las cuales se descartan llegadas.
+
+        Returns:
+            dict: Resumen de summarize_load().
+        """
+        in_flight = threading.Semaphore(max_in_flight)
+
+        def arrival(task, node_id, offset):
+            try:
+                self.iteration(task, node_id, offset)
+            finally:
+                in_flight.release()
+
+        self._start = time.perf_counter()
+        stop = threading.Event()
+        threading.Thread(target=self._progress, args=(stop,), daemon=True).start()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max_in_flight, thread_name_prefix="arrival"
+            ) as executor:
+                for number, offset in enumerate(pattern.arrivals(poisson, self.rng)):
+                    delay = offset - self._elapsed()
+                    if delay > 0:
+                        time.sleep(delay)
+                    with self._lock:
+                        self.recorder.record_arrival(max(0.0, self._elapsed() - offset))
+                    if not in_flight.acquire(blocking=False):
+                        with self._lock:
+                            self.recorder.record_drop()
+                        continue
+                    task = self.rng.choice(self.tasks)
+                    executor.submit(arrival, task, f"{task.nodeid}@{number}", offset)
+        finally:
+            stop.set()
+        return self._summary(pattern)
+
+    def finish(self):
+        """
+        Elimina los recursos diferidos (E2E_CONFIG["cleanup_mode"] == "deferred")
+        y los restos con prefijo de prueba, como al final de una sesión de pytest.
+        """
+        conftest = self.conftest
+        if conftest.E2E_CONFIG["cleanup_mode"] != "deferred":
+            return
+        resources = conftest.pop_deferred_resources()
+        total = sum(len(ids) for ids in resources.values())
+        if total:
+            _log.info("🧹 Eliminando %d recursos registrados durante la carga", total)
+            conftest.cleanup_test_data(resources)
+        if conftest.E2E_CONFIG["sweep_leftovers"]:
+            conftest.sweep_test_data()
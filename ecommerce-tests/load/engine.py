@@ -0,0 +1,150 @@
+"""
+Motor de carga de modelo abierto.
+
+Las llegadas se envían en los instantes que marca el patrón (load.arrivals)
+sin esperar a las respuestas anteriores: cada llegada es una tarea de asyncio
+independiente. Si el sistema se satura, las solicitudes en vuelo crecen en
+lugar de frenar la tasa, y la latencia lo refleja. Para no agotar la memoria
+del generador, las llegadas que superan max_in_flight se descartan y se
+cuentan aparte.
+
+La latencia de cada solicitud se mide desde su instante programado, no desde
+el envío: si el event loop se retrasa (CPU saturada, pausas del recolector),
+las solicitudes afectadas cargan con ese retraso igual que lo haría un
+cliente real que hubiera llegado a su hora. Sin esta corrección, una pausa
+del generador ocultaría justo la cola que intenta medir (omisión coordinada).
+"""
+
+import asyncio
+import itertools
+import random
+import time
+
+from common.log import get_logger
+from results import LoadRecorder, summarize_load
+
+# Segundos entre los mensajes de progreso
+PROGRESS_INTERVAL = 10.0
+
+_log = get_logger("load.engine")
+
+
+class LoadEngine:
+    """
+    Ejecuta un patrón de llegadas sobre una mezcla ponderada de endpoints.
+    """
+
+    def __init__(
+        self,
+        client,
+        targets,
+        pattern,
+        max_in_flight=1000,
+        poisson=False,
+        seed=None,
+        recorder=None,
+        progress_interval=PROGRESS_INTERVAL,
+    ):
+        """
+        Args:
+            client (GatewayClient): Cliente del API Gateway.
+            targets (list): LoadTarget de la mezcla; se elige uno por llegada según su peso.
+            pattern (ArrivalPattern): Patrón de llegadas.
+            max_in_flight (int): Solicitudes en vuelo a partir de las cuales se descartan llegadas.
+            poisson (bool): Llegadas de Poisson en lugar de regulares.
+            seed (int, optional): Semilla de las llegadas y de la mezcla, para repetir una ejecución.
+            recorder (LoadRecorder, optional): Registro de resultados.
+            progress_interval (float, optional): Segundos entre los mensajes de
+                progreso; None los desactiva (ej: en los procesos de load.workers,
+                cuyo progreso informa el coordinador).
+        """
+        if not targets:
+            raise ValueError("No hay endpoints para generar carga")
+        self.client = client
+        self.targets = list(targets)
+        self.pattern = pattern
+        self.max_in_flight = max_in_flight
+        self.poisson = poisson
+        self.rng = random.Random(seed)
+        self.recorder = recorder or LoadRecorder()
+        self.progress_interval = progress_interval
+        self._cum_weights = list(
+            itertools.accumulate(target.weight for target in self.targets)
+        )
+        self._start = None
+
+    async def _send(self, target, endpoint, offset):
+        """Envía una solicitud programada en offset y registra su resultado."""
+        loop = asyncio.get_running_loop()
+        intended = self._start + offset
+        start = loop.time()
+        status = None
+        try:
+            response = await self.client.request(
+                target.service, target.method, endpoint
+            )
+            status = response.status_code
+        except Exception as e:
+            _log.debug("❌ %s %s: %r", target.method, endpoint, e)
+        end = loop.time()
+        self.recorder.record(
+            target.template,
+            status,
+            end - intended,
+            end - self._start,
+            service_time=end - start,
+        )
+
+    async def run(self, start_at=None):
+        """
+        Ejecuta la carga completa y espera a las solicitudes pendientes.
+
+        Args:
+            start_at (float, optional): Instante de reloj (time.time()) en que
+                empieza el patrón; por defecto, al llamar. Si ya pasó, las
+                llegadas vencidas salen de inmediato y su latencia se mide
+                desde su instante previsto.
+
+        Returns:
+            dict: Resumen de summarize_load().
+        """
+        loop = asyncio.get_running_loop()
+        recorder = self.recorder
+        in_flight = set()
+        self._start = loop.time()
+        if start_at is not None:
+            # Origen del patrón en el reloj del event loop
+            self._start += start_at - time.time()
+        next_progress = self.progress_interval or float("inf")
+
+        for offset in self.pattern.arrivals(self.poisson, self.rng):
+            delay = self._start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            recorder.record_arrival(max(0.0, loop.time() - self._start - offset))
+
+            if offset >= next_progress:
+                _log.info(
+                    "⏳ %.0fs: %d llegadas, %d en vuelo, %d descartadas",
+                    offset,
+                    recorder.scheduled,
+                    len(in_flight),
+                    recorder.dropped,
+                )
+                next_progress += self.progress_interval
+
+            if len(in_flight) >= self.max_in_flight:
+                recorder.record_drop()
+                continue
+
+            target = self.rng.choices(self.targets, cum_weights=self._cum_weights)[0]
+            task = asyncio.ensure_future(
+                self._send(target, target.endpoint(self.rng), offset)
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            _log.info("⏳ Esperando %d solicitudes en vuelo", len(in_flight))
+            await asyncio.gather(*in_flight)
+        return summarize_load(recorder, loop.time() - self._start, self.pattern)
@@ -0,0 +1,424 @@
+"""
+Resultados de las pruebas de carga.
+
+Agrupa las solicitudes por plantilla de endpoint (common.timeouts.endpoint_template)
+y calcula para cada una el throughput, los errores y la latencia. También
+lleva una línea de tiempo por segundo, necesaria para leer una rampa: el
+punto en que el throughput deja de seguir a la tasa de llegadas es la
+capacidad del sistema.
+
+En las ejecuciones por escenarios (load.virtual_users) cada paso se registra
+como un endpoint más ('recorrido › paso') y, además, cada recorrido completo
+con su resultado y su tiempo de respuesta acumulado.
+
+Con varios procesos generadores (load.workers), cada uno envía cada segundo
+lo que registró desde el envío anterior (LoadRecorder.take_delta(), con los
+histogramas en forma compacta) y el coordinador lo suma en su propio registro
+(LoadRecorder.merge_delta()): el resumen final es el mismo que si un único
+proceso hubiera generado toda la carga.
+
+Las latencias se acumulan en histogramas (common.histogram), uno por
+plantilla: la memoria no crece con el número de solicitudes y los percentiles
+hasta p99.99 conservan 3 cifras significativas. En el modelo abierto la
+latencia se mide desde el instante programado de la llegada y no desde el
+envío real: si el generador se retrasa, ese retraso es cola que habría
+sufrido un cliente real, y medir desde el envío la ocultaría (omisión
+coordinada). La latencia desde el envío real se conserva aparte como
+"service_time_ms".
+"""
+
+import json
+import os
+from collections import Counter
+
+from common.histogram import LatencyHistogram
+
+# Percentiles de latencia de los resúmenes
+LATENCY_PERCENTILES = (50, 90, 95, 99, 99.9, 99.99)
+
+
+def is_error(status):
+    """Indica si un resultado cuenta como error (sin respuesta, 4xx o 5xx)."""
+    return status is None or status >= 400
+
+
+class EndpointStats:
+    """Solicitudes completadas de un endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.statuses = Counter()
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+
+    def record(self, status, latency, service_time=None):
+        self.count += 1
+        if is_error(status):
+            self.errors += 1
+        self.statuses["error" if status is None else str(status)] += 1
+        self.latency.record(latency)
+        if service_time is not None:
+            self.service_time.record(service_time)
+
+    def to_dict(self):
+        """Serializa las estadísticas para enviarlas a otro proceso."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+        }
+
+    def merge_dict(self, data):
+        """Suma unas estadísticas serializadas con to_dict()."""
+        self.count += data["count"]
+        self.errors += data["errors"]
+        self.statuses.update(data["statuses"])
+        self.latency.merge(LatencyHistogram.from_dict(data["latency"]))
+        self.service_time.merge(LatencyHistogram.from_dict(data["service_time"]))
+
+
+class JourneyStats:
+    """Ejecuciones de un recorrido de negocio."""
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.active = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.total_duration = 0.0
+
+    def record(self, ok, active, duration, service_time=None):
+        self.count += 1
+        if not ok:
+            self.failures += 1
+        self.active.record(active)
+        if service_time is not None:
+            self.service_time.record(service_time)
+        self.total_duration += duration
+
+    def to_dict(self):
+        """Serializa las estadísticas para enviarlas a otro proceso."""
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "active": self.active.to_dict(),
+            "service_time": self.service_time.to_dict(),
+            "total_duration": self.total_duration,
+        }
+
+    def merge_dict(self, data):
+        """Suma unas estadísticas serializadas con to_dict()."""
+        self.count += data["count"]
+        self.failures += data["failures"]
+        self.active.merge(LatencyHistogram.from_dict(data["active"]))
+        self.service_time.merge(LatencyHistogram.from_dict(data["service_time"]))
+        self.total_duration += data["total_duration"]
+
+
+class LoadRecorder:
+    """
+    Registro de una ejecución de carga.
+
+    Lo usan una sola tarea de asyncio por proceso, por lo que no necesita locks.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        """Vacía el registro."""
+        self.endpoints = {}
+        self.journeys = {}
+        self.timeline = {}
+        self.scheduled = 0
+        self.dropped = 0
+        self.max_lag = 0.0
+
+    def record_arrival(self, lag):
+        """
+        Registra una llegada programada.
+
+        Args:
+            lag (float): Segundos de retraso con que se envió respecto a su
+                instante programado (0 si salió a tiempo).
+        """
+        self.scheduled += 1
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def record_drop(self):
+        """Registra una llegada descartada por superar las solicitudes en vuelo."""
+        self.dropped += 1
+
+    def record(self, template, status, latency, finished_at, service_time=None):
+        """
+        Registra una solicitud completada.
+
+        Args:
+            template (str): Plantilla del endpoint.
+            status (int): Estado HTTP, o None si la solicitud falló sin respuesta.
+            latency (float): Segundos hasta leer la respuesta, desde el instante
+                programado en el modelo abierto o desde el envío en los demás.
+            finished_at (float): Segundos desde el inicio de la carga.
+            service_time (float, optional): Segundos desde el envío real, cuando
+                latency se mide desde el instante programado.
+        """
+        stats = self.endpoints.get(template)
+        if stats is None:
+            stats = self.endpoints[template] = EndpointStats()
+        stats.record(status, latency, service_time)
+
+        second = int(finished_at)
+        bucket = self.timeline.get(second)
+        if bucket is None:
+            bucket = self.timeline[second] = [0, 0]
+        bucket[0] += 1
+        if is_error(status):
+            bucket[1] += 1
+
+    def record_journey(self, name, ok, active, duration, service_time=None):
+        """
+        Registra un recorrido terminado.
+
+        Args:
+            name (str): Nombre del recorrido.
+            ok (bool): Si todos sus pasos tuvieron éxito.
+            active (float): Suma de las latencias de sus pasos, en segundos
+                (sin pausas ni limpieza).
+            duration (float): Segundos desde el primer paso hasta el último,
+                pausas incluidas.
+            service_time (float, optional): Segundos desde el inicio real,
+                cuando active se mide desde el instante programado de la
+                llegada (pruebas E2E en modelo abierto).
+        """
+        stats = self.journeys.get(name)
+        if stats is None:
+            stats = self.journeys[name] = JourneyStats()
+        stats.record(ok, active, duration, service_time)
+
+    def take_delta(self):
+        """
+        Exporta lo registrado desde la llamada anterior y vacía el registro.
+
+        Returns:
+            dict: Registro serializable (pickle o JSON) para merge_delta().
+        """
+        delta = {
+            "scheduled": self.scheduled,
+            "dropped": self.dropped,
+            "max_lag": self.max_lag,
+            "endpoints": {
+                template: stats.to_dict() for template, stats in self.endpoints.items()
+            },
+            "journeys": {
+                name: stats.to_dict() for name, stats in self.journeys.items()
+            },
+            "timeline": self.timeline,
+        }
+        self._reset()
+        return delta
+
+    def merge_delta(self, delta):
+        """
+        Suma un registro exportado con take_delta() (ej: el de otro proceso).
+
+        Args:
+            delta (dict): Resultado de take_delta().
+        """
+        self.scheduled += delta["scheduled"]
+        self.dropped += delta["dropped"]
+        self.max_lag = max(self.max_lag, delta["max_lag"])
+        for template, data in delta["endpoints"].items():
+            stats = self.endpoints.get(template)
+            if stats is None:
+                stats = self.endpoints[template] = EndpointStats()
+            stats.merge_dict(data)
+        for name, data in delta["journeys"].items():
+            stats = self.journeys.get(name)
+            if stats is None:
+                stats = self.journeys[name] = JourneyStats()
+            stats.merge_dict(data)
+        for second, (completed, errors) in delta["timeline"].items():
+            bucket = self.timeline.get(second)
+            if bucket is None:
+                bucket = self.timeline[second] = [0, 0]
+            bucket[0] += completed
+            bucket[1] += errors
+
+
+def _latency_summary(histogram):
+    """Latencias en milisegundos: media, percentiles y máximo (None si no hay)."""
+    return histogram.summary_ms(LATENCY_PERCENTILES)
+
+
+def summarize_load(recorder, elapsed, pattern=None):
+    """
+    Resume una ejecución de carga.
+
+    Args:
+        recorder (LoadRecorder): Registro de la ejecución.
+        elapsed (float): Segundos desde la primera llegada hasta la última respuesta.
+        pattern (ArrivalPattern, optional): Patrón de llegadas usado.
+
+    Returns:
+        dict: Resumen serializable en JSON con "totals", "endpoints" (ordenados
+            por p95 descendente), "timeline" (completadas y errores por segundo)
+            y, si se registraron recorridos, "journeys".
+    """
+    elapsed = max(elapsed, 1e-9)
+    endpoints = []
+    all_latency = LatencyHistogram()
+    all_service_time = LatencyHistogram()
+    total_errors = 0
+    for template, stats in recorder.endpoints.items():
+        all_latency.merge(stats.latency)
+        all_service_time.merge(stats.service_time)
+        total_errors += stats.errors
+        entry = {
+            "endpoint": template,
+            "requests": stats.count,
+            "errors": stats.errors,
+            "throughput": stats.count / elapsed,
+            "statuses": dict(stats.statuses),
+            "latency_ms": _latency_summary(stats.latency),
+        }
+        if stats.service_time.count:
+            entry["service_time_ms"] = _latency_summary(stats.service_time)
+        endpoints.append(entry)
+    endpoints.sort(key=lambda entry: entry["latency_ms"]["p95"], reverse=True)
+
+    totals = {
+        "scheduled": recorder.scheduled,
+        "dropped": recorder.dropped,
+        "completed": all_latency.count,
+        "errors": total_errors,
+        "elapsed": elapsed,
+        "throughput": all_latency.count / elapsed,
+        "max_schedule_lag_ms": recorder.max_lag * 1000,
+        "latency_ms": _latency_summary(all_latency),
+    }
+    if all_service_time.count:
+        totals["service_time_ms"] = _latency_summary(all_service_time)
+    if pattern is not None:
+        totals["pattern"] = pattern.describe()
+        totals["target_rate"] = pattern.total() / pattern.duration
+
+    summary = {
+        "totals": totals,
+        "endpoints": endpoints,
+        "timeline": [
+            {"second": second, "completed": bucket[0], "errors": bucket[1]}
+            for second, bucket in sorted(recorder.timeline.items())
+        ],
+    }
+    if recorder.journeys:
+        journeys = []
+        for name, stats in sorted(recorder.journeys.items()):
+            entry = {
+                "journey": name,
+                "runs": stats.count,
+                "failures": stats.failures,
+                "throughput": stats.count / elapsed,
+                "latency_ms": _latency_summary(stats.active),
+                "duration_s": stats.total_duration / stats.count,
+            }
+            if stats.service_time.count:
+                entry["service_time_ms"] = _latency_summary(stats.service_time)
+            journeys.append(entry)
+        summary["journeys"] = journeys
+    return summary
+
+
+def _percentile_line(latency):
+    """Percentiles de un resumen de latencia en una línea."""
+    return (
+        f"p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, "
+        f"p99 {latency['p99']:.0f} ms, p99.9 {latency['p99.9']:.0f} ms, "
+        f"p99.99 {latency['p99.99']:.0f} ms, max {latency['max']:.0f} ms"
+    )
+
+
+def format_load_summary(summary, journey_label="recorrido"):
+    """
+    Genera las líneas del reporte de la terminal.
+
+    Args:
+        summary (dict): Resultado de summarize_load().
+        journey_label (str): Encabezado de la tabla de recorridos (ej: 'prueba'
+            cuando los recorridos son pruebas E2E).
+
+    Returns:
+        list: Líneas de texto.
+    """
+    totals = summary["totals"]
+    lines = []
+    if "pattern" in totals:
+        lines.append(
+            f"📈 Patrón: {totals['pattern']} (media {totals['target_rate']:.1f} sol/s)"
+        )
+    completed = (
+        f"🚀 {totals['completed']} solicitudes completadas en {totals['elapsed']:.1f}s "
+        f"({totals['throughput']:.1f} sol/s), {totals['errors']} errores"
+    )
+    if "users" in totals:
+        lines.append(completed)
+        lines.append(f"👥 Usuarios virtuales: {totals['users']}")
+    else:
+        lines.append(f"{completed}, {totals['dropped']} llegadas descartadas")
+        lines.append(
+            f"⏰ Retraso máximo respecto a la programación: {totals['max_schedule_lag_ms']:.0f} ms"
+        )
+    if "workers" in totals:
+        lines.append(f"🧵 Procesos generadores: {totals['workers']}")
+    if totals["latency_ms"]:
+        lines.append(f"⏱️ Latencia global: {_percentile_line(totals['latency_ms'])}")
+    if totals.get("service_time_ms"):
+        lines.append(
+            f"🧮 Sin corregir (desde el envío real): {_percentile_line(totals['service_time_ms'])}"
+        )
+
+    lines.append("")
+    lines.append(
+        f"{'n':>7} {'err':>5} {'sol/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'p99.9 ms':>9} {'max ms':>8}  endpoint"
+    )
+    for entry in summary["endpoints"]:
+        latency = entry["latency_ms"]
+        lines.append(
+            f"{entry['requests']:>7} {entry['errors']:>5} {entry['throughput']:>7.1f} "
+            f"{latency['p50']:>8.0f} {latency['p95']:>8.0f} {latency['p99']:>8.0f} "
+            f"{latency['p99.9']:>9.0f} {latency['max']:>8.0f}  {entry['endpoint']}"
+        )
+
+    if summary.get("journeys"):
+        lines.append("")
+        lines.append(
+            f"{'n':>7} {'fallos':>6} {'rec/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'dur. s':>7}  {journey_label}"
+        )
+        for entry in summary["journeys"]:
+            latency = entry["latency_ms"]
+            lines.append(
+                f"{entry['runs']:>7} {entry['failures']:>6} {entry['throughput']:>7.2f} "
+                f"{latency['p50']:>8.0f} {latency['p95']:>8.0f} {latency['p99']:>8.0f} "
+                f"{entry['duration_s']:>7.1f}  {entry['journey']}"
+            )
+    return lines
+
+
+def save_summary(summary, path):
+    """
+    Guarda el resumen como JSON.
+
+    Args:
+        summary (dict): Resultado de summarize_load().
+        path (str): Archivo de salida; los directorios se crean si no existen.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as summary_file:
+        json.dump(summary, summary_file, indent=2, ensure_ascii=False)
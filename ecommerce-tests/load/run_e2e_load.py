@@ -0,0 +1,266 @@
+"""
+Script para ejecutar las pruebas E2E como prueba de carga.
+
+Las pruebas seleccionadas de e2e/tests se ejecutan repetidamente con N
+usuarios virtuales (--users) o con una tasa de iteraciones por segundo
+(--rate, --ramp, --stages). Ver load/e2e_tasks.py.
+"""
+
+import argparse
+import datetime
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from run_load_tests import build_pattern, check_thresholds
+
+# Iteraciones simultáneas por defecto en modo de tasa (cada una ocupa un hilo)
+DEFAULT_MAX_IN_FLIGHT = 50
+
+
+def load_defaults():
+    """
+    Lee LOAD_CONFIG de load/config/config.py.
+
+    El módulo se carga por su ruta porque el nombre config.config corresponde,
+    en este proceso, a la configuración de e2e que usa su conftest.
+    """
+    spec = importlib.util.spec_from_file_location(
+        "load_config", Path(__file__).resolve().parent / "config" / "config.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LOAD_CONFIG
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Ejecutar pruebas E2E repetidamente como prueba de carga"
+    )
+    parser.add_argument(
+        "tests",
+        nargs="*",
+        help="Archivos o node IDs de pytest relativos a e2e/ (default: tests)",
+    )
+    parser.add_argument(
+        "-k", dest="keyword", type=str, help="Expresión -k de pytest para filtrar"
+    )
+    parser.add_argument(
+        "-m", dest="markers", type=str, help="Expresión -m de pytest para filtrar"
+    )
+    parser.add_argument(
+        "--users",
+        "-u",
+        type=int,
+        help="Usuarios virtuales (hilos) que ejecutan pruebas una tras otra (default: LOAD_USERS o 10)",
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        help="Segundos en que se incorporan los usuarios virtuales (default: LOAD_RAMP_UP o 0)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Iteraciones por segundo (modelo abierto) en lugar de usuarios virtuales",
+    )
+    parser.add_argument(
+        "--ramp",
+        type=str,
+        metavar="INICIO-FIN",
+        help="Rampa lineal de iteraciones por segundo durante --duration (ej: 1-20)",
+    )
+    parser.add_argument(
+        "--stages",
+        type=str,
+        help="Etapas 'tasa:segundos' o 'inicio-fin:segundos' separadas por comas",
+    )
+    parser.add_argument(
+        "--poisson",
+        action="store_true",
+        help="Llegadas de Poisson en lugar de intervalos regulares",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Duración en segundos (default: LOAD_DURATION o 60)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help=f"Iteraciones simultáneas antes de descartar llegadas (default: {DEFAULT_MAX_IN_FLIGHT})",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Semilla de la selección de pruebas y de las llegadas"
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        help="Porcentaje de solicitudes HTTP con error a partir del cual la ejecución falla",
+    )
+    parser.add_argument(
+        "--max-failure-rate",
+        type=float,
+        default=0.0,
+        help="Porcentaje de iteraciones fallidas a partir del cual la ejecución falla "
+        "(default: 0, cualquier iteración fallida hace fallar la ejecución)",
+    )
+    parser.add_argument(
+        "--max-p95",
+        type=float,
+        help="Latencia p95 global de las solicitudes (ms) a partir de la cual la ejecución falla",
+    )
+    parser.add_argument("--output", "-o", type=str, help="Archivo JSON de resultados")
+    parser.add_argument(
+        "--gateway-url",
+        type=str,
+        help="URL del API Gateway (ej: http://localhost:8222)",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Muestra más información durante la ejecución",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Nivel de los mensajes por consola (DEBUG muestra cada iteración fallida; por defecto INFO, o DEBUG con --verbose)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Guarda un registro estructurado JSONL de la ejecución (ej: logs/e2e_load.jsonl)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Ejecuta las pruebas E2E seleccionadas como prueba de carga.
+    """
+    args = parse_args()
+
+    # Configurar URL del Gateway si se proporciona (antes de importar el conftest)
+    if args.gateway_url:
+        os.environ["API_GATEWAY_URL"] = args.gateway_url
+        print(f"🌐 Usando API Gateway: {args.gateway_url}")
+
+    # Registro del arnés (ver common/log.py)
+    if args.log_level:
+        os.environ["TEST_LOG_LEVEL"] = args.log_level
+    elif args.verbose:
+        os.environ["TEST_LOG_LEVEL"] = "DEBUG"
+    if args.log_file:
+        os.environ["TEST_LOG_FILE"] = args.log_file
+        print(f"📝 Registro JSONL en: {args.log_file}")
+
+    load_config = load_defaults()
+    rate_mode = bool(args.rate or args.ramp or args.stages)
+    pattern = None
+    if rate_mode:
+        try:
+            pattern = build_pattern(args, load_config)
+        except ValueError as e:
+            print(f"❌ Patrón de llegadas inválido: {e}")
+            sys.exit(2)
+    users = args.users or load_config["users"]
+    duration = args.duration or load_config["duration"]
+
+    selection = list(args.tests) or ["tests"]
+    if args.keyword:
+        selection.extend(["-k", args.keyword])
+    if args.markers:
+        selection.extend(["-m", args.markers])
+
+    output = args.output or os.path.join(
+        load_config["reports_dir"],
+        f"e2e_load_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+
+    from e2e_tasks import E2ELoadRunner, collect_tests, load_conftest
+    from results import format_load_summary, save_summary
+
+    print("🔍 Recolectando pruebas E2E...")
+    try:
+        tasks = collect_tests(selection)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    if not tasks:
+        print("❌ No hay pruebas E2E seleccionadas que se puedan ejecutar")
+        sys.exit(1)
+
+    conftest = load_conftest()
+    from common.log import flush_logs
+
+    print("=== Configuración de la Prueba de Carga E2E ===")
+    print(f"🧪 Pruebas en la mezcla: {len(tasks)}")
+    for task in tasks:
+        print(f"  - {task.nodeid}")
+    if rate_mode:
+        print(f"📈 Patrón: {pattern.describe()} (~{pattern.total():.0f} iteraciones)")
+    else:
+        print(f"👥 Usuarios virtuales: {users} durante {duration:g}s")
+    print(f"📊 Resultados en: {output}")
+    print("=" * 50)
+
+    runner = E2ELoadRunner(tasks, conftest, seed=args.seed)
+    print("🚀 Iniciando prueba de carga E2E...")
+    try:
+        if rate_mode:
+            summary = runner.run_rate(
+                pattern,
+                poisson=args.poisson or load_config["poisson"],
+                max_in_flight=args.max_in_flight,
+            )
+        else:
+            summary = runner.run_users(
+                users,
+                duration,
+                ramp_up=(
+                    args.ramp_up if args.ramp_up is not None else load_config["ramp_up"]
+                ),
+            )
+    except KeyboardInterrupt:
+        print("\n⛔ Prueba de carga interrumpida")
+        sys.exit(130)
+    finally:
+        runner.finish()
+        flush_logs()
+        conftest.get_session_pool().close()
+
+    print("\n=== Resultados ===")
+    for line in format_load_summary(summary, journey_label="prueba"):
+        print(line)
+    if summary["skipped"]:
+        print("\n⏭️ Iteraciones omitidas (pytest.skip):")
+        for nodeid, count in summary["skipped"].items():
+            print(f"  - {nodeid}: {count}")
+    if summary["failure_reasons"]:
+        print("\n❌ Motivos de fallo:")
+        for nodeid, reasons in summary["failure_reasons"].items():
+            print(f"  {nodeid}")
+            for reason, count in reasons.items():
+                print(f"    {count:>5}× {reason}")
+    save_summary(summary, output)
+    print(f"\n📊 Resultados guardados en: {output}")
+
+    failures = check_thresholds(summary, args)
+    if failures:
+        print("\n❌ La prueba de carga no cumple los umbrales:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Prueba de carga E2E completada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""
+Script para ejecutar pruebas de carga contra el API Gateway.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+from pathlib import Path
+
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.services import GATEWAY_SERVICES
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Ejecutar pruebas de carga (modelo abierto) contra el API Gateway"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Tasa constante en solicitudes por segundo (default: LOAD_RATE o 10)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Duración en segundos de la tasa constante o de la rampa (default: LOAD_DURATION o 60)",
+    )
+    parser.add_argument(
+        "--ramp",
+        type=str,
+        metavar="INICIO-FIN",
+        help="Rampa lineal de la tasa durante --duration (ej: 10-200)",
+    )
+    parser.add_argument(
+        "--stages",
+        type=str,
+        help="Etapas 'tasa:segundos' o 'inicio-fin:segundos' separadas por comas "
+        "(ej: 0-50:60,50:300,50-0:30)",
+    )
+    parser.add_argument(
+        "--poisson",
+        action="store_true",
+        help="Llegadas de Poisson en lugar de intervalos regulares",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=str,
+        help="Procesos generadores entre los que se reparte la tasa, o 'auto' "
+        "para uno por núcleo (default: LOAD_WORKERS o 1)",
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        help="Escenario de recorridos YAML o Python (ej: journeys/ecommerce.yaml); "
+        "usa usuarios virtuales en lugar de la tasa de llegadas",
+    )
+    parser.add_argument(
+        "--users",
+        "-u",
+        type=int,
+        help="Usuarios virtuales del escenario (default: LOAD_USERS o 10)",
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        help="Segundos en que se incorporan los usuarios virtuales (default: LOAD_RAMP_UP o 0)",
+    )
+    parser.add_argument(
+        "--think-scale",
+        type=float,
+        help="Factor de las pausas entre pasos del escenario; 0 las desactiva (default: LOAD_THINK_SCALE o 1)",
+    )
+    parser.add_argument(
+        "--service",
+        "-s",
+        action="append",
+        choices=GATEWAY_SERVICES,
+        help="Limita la carga a un servicio (se puede repetir)",
+    )
+    parser.add_argument(
+        "--endpoint",
+        "-e",
+        action="append",
+        help="Limita la carga a los endpoints cuya ruta contenga el texto (se puede repetir)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        help="Solicitudes en vuelo máximas antes de descartar llegadas (default: LOAD_MAX_IN_FLIGHT o 1000)",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Semilla para repetir la misma secuencia de llegadas"
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        help="Porcentaje de errores a partir del cual la ejecución falla",
+    )
+    parser.add_argument(
+        "--max-failure-rate",
+        type=float,
+        help="Porcentaje de recorridos fallidos a partir del cual la ejecución falla (escenarios)",
+    )
+    parser.add_argument(
+        "--max-p95",
+        type=float,
+        help="Latencia p95 global (ms) a partir de la cual la ejecución falla",
+    )
+    parser.add_argument("--output", "-o", type=str, help="Archivo JSON de resultados")
+    parser.add_argument(
+        "--gateway-url",
+        type=str,
+        help="URL del API Gateway (ej: http://localhost:8222)",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Muestra más información durante la ejecución",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Nivel de los mensajes por consola (DEBUG muestra cada error de solicitud; por defecto INFO, o DEBUG con --verbose)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Guarda un registro estructurado JSONL de la ejecución (ej: logs/load.jsonl)",
+    )
+    return parser.parse_args()
+
+
+def build_client():
+    """Crea el cliente del API Gateway con la caché de token compartida."""
+    from config.config import (
+        SERVICES_CONFIG,
+        AUTH_ENDPOINT,
+        TEST_USER,
+        TOKEN_CACHE_CONFIG,
+        REQUEST_TIMEOUT,
+        ASYNC_POOL_CONFIG,
+    )
+    from common.auth import TokenManager, default_cache_path
+    from client import GatewayClient
+
+    token_manager = TokenManager(
+        TOKEN_CACHE_CONFIG["cache_path"]
+        or default_cache_path(
+            AUTH_ENDPOINT, TEST_USER["username"], TOKEN_CACHE_CONFIG["cache_dir"]
+        ),
+        refresh_margin=TOKEN_CACHE_CONFIG["refresh_margin"],
+    )
+    return GatewayClient(
+        SERVICES_CONFIG,
+        AUTH_ENDPOINT,
+        TEST_USER,
+        token_manager,
+        ASYNC_POOL_CONFIG,
+        REQUEST_TIMEOUT,
+    )
+
+
+def build_pattern(args, load_config):
+    """Crea el patrón de llegadas a partir de los argumentos."""
+    from arrivals import ConstantRate, Ramp, parse_stages
+
+    duration = args.duration or load_config["duration"]
+    if args.stages:
+        return parse_stages(args.stages)
+    if args.ramp:
+        start_rate, end_rate = args.ramp.split("-")
+        return Ramp(float(start_rate), float(end_rate), duration)
+    return ConstantRate(args.rate or load_config["rate"], duration)
+
+
+async def prepare_targets(args, client):
+    """Lee el catálogo y prepara los endpoints de la mezcla (None si no hay)."""
+    from config.config import RESOURCE_SERVICES, CATALOG_PATH_OVERRIDES, LOAD_CONFIG
+    from catalog import load_catalog, read_endpoints, build_targets
+
+    catalog = load_catalog(
+        LOAD_CONFIG["catalog_path"], RESOURCE_SERVICES, CATALOG_PATH_OVERRIDES
+    )
+    endpoints = read_endpoints(catalog, args.service, args.endpoint)
+    targets = await build_targets(
+        endpoints, client.fetch_collection, LOAD_CONFIG["seed_limit"]
+    )
+    if not targets:
+        print("❌ No hay endpoints disponibles para generar carga")
+        return None
+
+    print(f"🎯 Endpoints en la mezcla: {len(targets)}")
+    for target in targets:
+        print(f"  - {target.template}")
+    return targets
+
+
+async def run_load(args, pattern):
+    """Prepara la carga de trabajo y ejecuta el motor."""
+    from config.config import LOAD_CONFIG
+    from engine import LoadEngine
+
+    client = build_client()
+    try:
+        targets = await prepare_targets(args, client)
+        if targets is None:
+            return None
+
+        engine = LoadEngine(
+            client,
+            targets,
+            pattern,
+            max_in_flight=args.max_in_flight or LOAD_CONFIG["max_in_flight"],
+            poisson=args.poisson or LOAD_CONFIG["poisson"],
+            seed=args.seed,
+        )
+        return await engine.run()
+    finally:
+        await client.close()
+
+
+async def _prepare_targets_once(args):
+    """Prepara los endpoints con un cliente propio que se cierra al terminar."""
+    client = build_client()
+    try:
+        return await prepare_targets(args, client)
+    finally:
+        await client.close()
+
+
+def run_load_distributed(args, pattern, workers):
+    """Prepara la carga de trabajo y la reparte entre varios procesos."""
+    from config.config import LOAD_CONFIG
+    from workers import run_distributed
+
+    # Los datos de ejemplo se leen una sola vez y se envían a los trabajadores
+    targets = asyncio.run(_prepare_targets_once(args))
+    if targets is None:
+        return None
+    return run_distributed(
+        targets,
+        pattern,
+        workers,
+        max_in_flight=args.max_in_flight or LOAD_CONFIG["max_in_flight"],
+        poisson=args.poisson or LOAD_CONFIG["poisson"],
+        seed=args.seed,
+    )
+
+
+async def run_scenario(args, journeys):
+    """Ejecuta un escenario de recorridos con usuarios virtuales."""
+    from config.config import LOAD_CONFIG
+    from virtual_users import VirtualUserRunner
+
+    total_weight = sum(journey.weight for journey in journeys)
+    print(f"🧭 Recorridos en la mezcla: {len(journeys)}")
+    for journey in journeys:
+        print(
+            f"  - {journey.name}: {journey.weight / total_weight:.0%}, "
+            f"{len(journey.steps)} pasos"
+        )
+
+    client = build_client()
+    try:
+        runner = VirtualUserRunner(
+            client,
+            journeys,
+            users=args.users or LOAD_CONFIG["users"],
+            duration=args.duration or LOAD_CONFIG["duration"],
+            ramp_up=(
+                args.ramp_up if args.ramp_up is not None else LOAD_CONFIG["ramp_up"]
+            ),
+            think_scale=(
+                args.think_scale
+                if args.think_scale is not None
+                else LOAD_CONFIG["think_scale"]
+            ),
+            seed=args.seed,
+        )
+        return await runner.run()
+    finally:
+        await client.close()
+
+
+def check_thresholds(summary, args):
+    """Comprueba los umbrales de aceptación; devuelve la lista de incumplimientos."""
+    totals = summary["totals"]
+    failures = []
+    if args.max_error_rate is not None and totals["completed"]:
+        error_rate = totals["errors"] / totals["completed"] * 100
+        if error_rate > args.max_error_rate:
+            failures.append(
+                f"tasa de errores {error_rate:.2f}% > {args.max_error_rate}%"
+            )
+    if args.max_p95 is not None and totals["latency_ms"]:
+        p95 = totals["latency_ms"]["p95"]
+        if p95 > args.max_p95:
+            failures.append(f"p95 {p95:.0f} ms > {args.max_p95:g} ms")
+    max_failure_rate = getattr(args, "max_failure_rate", None)
+    runs = sum(entry["runs"] for entry in summary.get("journeys", []))
+    if max_failure_rate is not None and runs:
+        failures_total = sum(entry["failures"] for entry in summary["journeys"])
+        failure_rate = failures_total / runs * 100
+        if failure_rate > max_failure_rate:
+            failures.append(
+                f"tasa de recorridos fallidos {failure_rate:.2f}% > {max_failure_rate}%"
+            )
+    if totals["dropped"]:
+        failures.append(f"{totals['dropped']} llegadas descartadas")
+    return failures
+
+
+def main():
+    """
+    Ejecuta una prueba de carga contra el API Gateway.
+    """
+    args = parse_args()
+
+    # Configurar URL del Gateway si se proporciona
+    if args.gateway_url:
+        os.environ["API_GATEWAY_URL"] = args.gateway_url
+        print(f"🌐 Usando API Gateway: {args.gateway_url}")
+
+    # Registro del arnés (ver common/log.py)
+    if args.log_level:
+        os.environ["TEST_LOG_LEVEL"] = args.log_level
+    elif args.verbose:
+        os.environ["TEST_LOG_LEVEL"] = "DEBUG"
+    if args.log_file:
+        os.environ["TEST_LOG_FILE"] = args.log_file
+        print(f"📝 Registro JSONL en: {args.log_file}")
+
+    from config.config import LOG_CONFIG, LOAD_CONFIG
+    from common.log import configure_logging, flush_logs
+    from results import format_load_summary, save_summary
+
+    configure_logging(LOG_CONFIG)
+
+    if args.scenario:
+        from config.config import RESOURCE_SERVICES
+        from scenarios import ScenarioError, load_scenario
+
+        try:
+            journeys = load_scenario(args.scenario, RESOURCE_SERVICES)
+        except (OSError, ScenarioError) as e:
+            print(f"❌ Escenario inválido: {e}")
+            sys.exit(2)
+    else:
+        try:
+            pattern = build_pattern(args, LOAD_CONFIG)
+        except ValueError as e:
+            print(f"❌ Patrón de llegadas inválido: {e}")
+            sys.exit(2)
+
+    from workers import resolve_workers
+
+    try:
+        workers = resolve_workers(args.workers or LOAD_CONFIG["workers"])
+    except ValueError as e:
+        print(f"❌ Número de procesos inválido: {e}")
+        sys.exit(2)
+    if args.scenario and workers > 1:
+        print(
+            "⚠️ --workers solo se aplica al modelo abierto; el escenario usa un proceso"
+        )
+        workers = 1
+
+    output = args.output or os.path.join(
+        LOAD_CONFIG["reports_dir"],
+        f"load_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+
+    print("=== Configuración de la Prueba de Carga ===")
+    if args.scenario:
+        print(f"🧭 Escenario: {args.scenario}")
+        print(
+            f"👥 Usuarios virtuales: {args.users or LOAD_CONFIG['users']} "
+            f"durante {args.duration or LOAD_CONFIG['duration']:g}s"
+        )
+    else:
+        print(f"📈 Patrón: {pattern.describe()} (~{pattern.total():.0f} solicitudes)")
+        if workers > 1:
+            print(f"🧵 Procesos generadores: {workers}")
+    print(f"📊 Resultados en: {output}")
+    print("=" * 50)
+
+    print("🚀 Iniciando prueba de carga...")
+    try:
+        if args.scenario:
+            summary = asyncio.run(run_scenario(args, journeys))
+        elif workers > 1:
+            summary = run_load_distributed(args, pattern, workers)
+        else:
+            summary = asyncio.run(run_load(args, pattern))
+    except KeyboardInterrupt:
+        print("\n⛔ Prueba de carga interrumpida")
+        sys.exit(130)
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    finally:
+        flush_logs()
+    if summary is None:
+        sys.exit(1)
+
+    print("\n=== Resultados ===")
+    for line in format_load_summary(summary):
+        print(line)
+    save_summary(summary, output)
+    print(f"\n📊 Resultados guardados en: {output}")
+
+    failures = check_thresholds(summary, args)
+    if failures:
+        print("\n❌ La prueba de carga no cumple los umbrales:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Prueba de carga completada")
+
+
+if __name__ == "__main__":
+    main()
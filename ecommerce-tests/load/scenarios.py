@@ -0,0 +1,449 @@
+"""
+Escenarios de carga: recorridos de negocio encadenados.
+
+Un escenario es una mezcla ponderada de recorridos (Journey); cada recorrido
+es una secuencia de pasos (Step) que reproduce lo que hace un usuario real,
+por ejemplo crear un carrito, crear la orden con ese carrito y pagarla. Los
+pasos comparten variables: extract guarda campos de la respuesta y las
+cadenas "${variable}" de la ruta y del cuerpo de los pasos siguientes se
+rellenan con ellas. Si una cadena es exactamente "${variable}" se sustituye
+por el valor original (número, objeto), no por su texto.
+
+Los escenarios se escriben en YAML o en un módulo de Python (ver README.md):
+
+    think_time: [1, 3]
+    journeys:
+      - name: carrito_a_orden
+        weight: 20
+        steps:
+          - name: crear_carrito
+            method: POST
+            endpoint: /api/carts
+            body: {userId: "${userId}"}
+            extract: {cartId: cartId}
+          - name: crear_orden
+            method: POST
+            endpoint: /api/orders
+            body: {orderDesc: "carga ${unique_id}", cartDto: {cartId: "${cartId}"}}
+        cleanup:
+          - {method: DELETE, endpoint: "/api/carts/${cartId}"}
+"""
+
+import copy
+import datetime
+import importlib.util
+import re
+import uuid
+from pathlib import Path
+
+try:
+    import yaml
+except ImportError:  # PyYAML solo es necesario para los escenarios en YAML
+    yaml = None
+
+# Pausa por defecto entre pasos, en segundos (mínimo, máximo)
+DEFAULT_THINK_TIME = (1.0, 3.0)
+
+# Formato de fecha de los favoritos (likeDate)
+LIKE_DATE_FORMAT = "%d-%m-%Y__%H:%M:%S:%f"
+
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "DELETE"})
+
+_VARIABLE = re.compile(r"\$\{(\w+)\}")
+
+
+class ScenarioError(ValueError):
+    """Escenario mal definido."""
+
+
+def parse_think_time(value, where):
+    """
+    Normaliza una pausa: un número fijo o un rango [mínimo, máximo].
+
+    Args:
+        value (float | list | None): Pausa en segundos.
+        where (str): Elemento al que pertenece, para los mensajes de error.
+
+    Returns:
+        tuple: (mínimo, máximo), o None si no se indicó.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        low = high = float(value)
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        low, high = float(value[0]), float(value[1])
+    else:
+        raise ScenarioError(f"{where}: think_time debe ser un número o [min, max]")
+    if low < 0 or high < low:
+        raise ScenarioError(f"{where}: think_time inválido {value!r}")
+    return (low, high)
+
+
+def render(value, variables):
+    """
+    Sustituye las variables "${nombre}" de un valor.
+
+    Args:
+        value (object): Cadena, dict o lista (se recorre recursivamente).
+        variables (dict): Variables del recorrido.
+
+    Returns:
+        object: Copia del valor con las variables sustituidas.
+
+    Raises:
+        KeyError: Si una variable no está definida.
+    """
+    if isinstance(value, str):
+        match = _VARIABLE.fullmatch(value)
+        if match:
+            return copy.deepcopy(variables[match.group(1)])
+        return _VARIABLE.sub(lambda m: str(variables[m.group(1)]), value)
+    if isinstance(value, dict):
+        return {key: render(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, variables) for item in value]
+    return value
+
+
+def extract_value(payload, path, rng):
+    """
+    Obtiene un campo de una respuesta JSON.
+
+    Args:
+        payload (object): Respuesta decodificada.
+        path (str): Ruta con puntos (ej: 'order.orderId'). '$' devuelve la
+            respuesta completa; '*' elige un elemento al azar de un arreglo
+            (ej: 'collection.*.productId').
+        rng (random.Random): Generador para '*'.
+
+    Returns:
+        object: Valor encontrado.
+
+    Raises:
+        KeyError, IndexError, TypeError: Si la ruta no existe en la respuesta.
+    """
+    if path == "$":
+        return payload
+    value = payload
+    for part in path.split("."):
+        if part == "*":
+            value = rng.choice(value)
+        elif isinstance(value, list):
+            value = value[int(part)]
+        else:
+            value = value[part]
+    return value
+
+
+def referenced_variables(value):
+    """Nombres de las variables "${nombre}" que usa un valor."""
+    if isinstance(value, str):
+        return set(_VARIABLE.findall(value))
+    if isinstance(value, dict):
+        return set().union(*map(referenced_variables, value.values()))
+    if isinstance(value, list):
+        return set().union(*map(referenced_variables, value))
+    return set()
+
+
+def builtin_variables(vu, iteration):
+    """
+    Variables disponibles en todos los recorridos.
+
+    Args:
+        vu (int): Número del usuario virtual.
+        iteration (int): Recorridos completados por el usuario virtual.
+
+    Returns:
+        dict: vu, iteration, unique_id y like_date (fecha actual en el formato
+            de los favoritos).
+    """
+    return {
+        "vu": vu,
+        "iteration": iteration,
+        "unique_id": f"{vu}_{iteration}_{uuid.uuid4().hex[:8]}",
+        "like_date": datetime.datetime.now().strftime(LIKE_DATE_FORMAT),
+    }
+
+
+def _service_for(endpoint, resource_services):
+    """Servicio del recurso más específico que contiene la ruta."""
+    matches = [
+        resource
+        for resource in resource_services
+        if endpoint == resource or endpoint.startswith(resource + "/")
+    ]
+    if not matches:
+        return None
+    return resource_services[max(matches, key=len)]
+
+
+class Step:
+    """Solicitud de un recorrido."""
+
+    def __init__(
+        self,
+        endpoint,
+        method="GET",
+        service=None,
+        name=None,
+        body=None,
+        merge=None,
+        extract=None,
+        expect=None,
+        think_time=None,
+    ):
+        """
+        Args:
+            endpoint (str): Ruta con variables (ej: '/api/orders/${orderId}').
+            method (str): Método HTTP.
+            service (str, optional): Servicio de SERVICES_CONFIG; por defecto se
+                deduce de la ruta (RESOURCE_SERVICES).
+            name (str, optional): Nombre del paso en el reporte; por defecto 'MÉTODO ruta'.
+            body (object, optional): Cuerpo JSON con variables.
+            merge (dict, optional): Campos que se sobrescriben sobre el cuerpo,
+                útil para enviar un objeto extraído con algún cambio.
+            extract (dict, optional): {variable: ruta en la respuesta} (ver extract_value).
+            expect (list, optional): Estados aceptados; por defecto cualquier 2xx.
+            think_time (float | tuple, optional): Pausa tras el paso; por
+                defecto la del recorrido.
+        """
+        self.endpoint = endpoint
+        self.method = method.upper()
+        self.service = service
+        self.name = name or f"{self.method} {endpoint}"
+        self.body = body
+        self.merge = merge
+        self.extract = dict(extract or {})
+        self.expect = set(expect) if expect else None
+        self.think_time = parse_think_time(think_time, self.name)
+
+    @classmethod
+    def from_dict(cls, data, where):
+        """Crea un paso a partir de su definición en YAML o Python."""
+        if not isinstance(data, dict) or "endpoint" not in data:
+            raise ScenarioError(f"{where}: cada paso necesita 'endpoint'")
+        unknown = set(data) - {
+            "endpoint",
+            "method",
+            "service",
+            "name",
+            "body",
+            "merge",
+            "extract",
+            "expect",
+            "think_time",
+        }
+        if unknown:
+            raise ScenarioError(f"{where}: campos desconocidos {sorted(unknown)}")
+        return cls(**data)
+
+    def request_body(self, variables):
+        """
+        Construye el cuerpo de la solicitud.
+
+        Args:
+            variables (dict): Variables del recorrido.
+
+        Returns:
+            object: Cuerpo JSON, o None si el paso no lo tiene.
+        """
+        body = render(self.body, variables)
+        if self.merge:
+            body = dict(body or {})
+            body.update(render(self.merge, variables))
+        return body
+
+    def accepts(self, status):
+        """Indica si el estado HTTP es un resultado válido del paso."""
+        if self.expect is not None:
+            return status in self.expect
+        return 200 <= status < 300
+
+    def __repr__(self):
+        return f"Step({self.name!r})"
+
+
+class Journey:
+    """Recorrido de negocio: pasos en orden y limpieza final."""
+
+    def __init__(
+        self, name, steps, weight=1.0, think_time=None, variables=None, cleanup=None
+    ):
+        """
+        Args:
+            name (str): Nombre del recorrido.
+            steps (list): Step en orden; un paso fallido interrumpe el recorrido.
+            weight (float): Peso relativo en la mezcla.
+            think_time (float | tuple, optional): Pausa entre pasos; por defecto
+                la del escenario.
+            variables (dict, optional): Variables iniciales (pueden usar las
+                predefinidas, ej: 'carga ${unique_id}').
+            cleanup (list, optional): Step que se ejecutan siempre al final,
+                sin pausas; los que usan variables sin definir (el recurso no
+                llegó a crearse) se omiten.
+        """
+        if not steps:
+            raise ScenarioError(f"{name}: el recorrido no tiene pasos")
+        if weight <= 0:
+            raise ScenarioError(f"{name}: el peso debe ser positivo")
+        self.name = name
+        self.steps = list(steps)
+        self.weight = float(weight)
+        self.think_time = parse_think_time(think_time, name)
+        self.variables = dict(variables or {})
+        self.cleanup = list(cleanup or [])
+
+        # El reporte agrupa por nombre de paso: dos pasos iguales deben nombrarse
+        names = [step.name for step in self.all_steps()]
+        duplicated = {step_name for step_name in names if names.count(step_name) > 1}
+        if duplicated:
+            raise ScenarioError(
+                f"{name}: pasos con el mismo nombre {sorted(duplicated)}; use 'name'"
+            )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crea un recorrido a partir de su definición en YAML o Python."""
+        if not isinstance(data, dict) or "name" not in data:
+            raise ScenarioError("Cada recorrido necesita 'name'")
+        name = data["name"]
+        unknown = set(data) - {
+            "name",
+            "steps",
+            "weight",
+            "think_time",
+            "variables",
+            "cleanup",
+        }
+        if unknown:
+            raise ScenarioError(f"{name}: campos desconocidos {sorted(unknown)}")
+        return cls(
+            name,
+            [
+                Step.from_dict(step, f"{name}[{index}]")
+                for index, step in enumerate(data.get("steps") or [])
+            ],
+            weight=data.get("weight", 1.0),
+            think_time=data.get("think_time"),
+            variables=data.get("variables"),
+            cleanup=[
+                Step.from_dict(step, f"{name}.cleanup[{index}]")
+                for index, step in enumerate(data.get("cleanup") or [])
+            ],
+        )
+
+    def check_variables(self):
+        """
+        Comprueba que cada paso solo usa variables definidas antes.
+
+        Raises:
+            ScenarioError: Si un paso usa una variable que ningún paso anterior
+                extrae. La limpieza puede usar cualquier variable del recorrido.
+        """
+        defined = set(builtin_variables(0, 0)) | set(self.variables)
+        for step in self.steps:
+            missing = (
+                referenced_variables([step.endpoint, step.body, step.merge]) - defined
+            )
+            if missing:
+                raise ScenarioError(
+                    f"{self.name}: {step.name} usa variables sin definir {sorted(missing)}"
+                )
+            defined.update(step.extract)
+        for step in self.cleanup:
+            missing = (
+                referenced_variables([step.endpoint, step.body, step.merge]) - defined
+            )
+            if missing:
+                raise ScenarioError(
+                    f"{self.name}: {step.name} usa variables sin definir {sorted(missing)}"
+                )
+
+    def all_steps(self):
+        """Pasos y pasos de limpieza."""
+        return self.steps + self.cleanup
+
+    def __repr__(self):
+        return f"Journey({self.name!r}, weight={self.weight}, steps={len(self.steps)})"
+
+
+def _read_definition(path):
+    """Lee un archivo de escenario; devuelve (recorridos, think_time por defecto)."""
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ScenarioError(
+                "Los escenarios en YAML necesitan PyYAML (pip install -r requirements.txt)"
+            )
+        with open(path, encoding="utf-8") as scenario_file:
+            data = yaml.safe_load(scenario_file)
+        if isinstance(data, list):
+            return data, None
+        if not isinstance(data, dict) or "journeys" not in data:
+            raise ScenarioError(f"{path}: se esperaba una lista 'journeys'")
+        return data["journeys"], data.get("think_time")
+
+    if path.suffix == ".py":
+        spec = importlib.util.spec_from_file_location(f"scenario_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, "JOURNEYS"):
+            raise ScenarioError(f"{path}: el módulo debe definir JOURNEYS")
+        return module.JOURNEYS, getattr(module, "THINK_TIME", None)
+
+    raise ScenarioError(f"{path}: formato no soportado (use .yaml, .yml o .py)")
+
+
+def load_scenario(path, resource_services):
+    """
+    Carga un escenario de recorridos.
+
+    Args:
+        path (str): Archivo YAML o módulo de Python con JOURNEYS (una lista de
+            Journey o de dicts con el mismo formato que el YAML) y, opcionalmente,
+            THINK_TIME.
+        resource_services (dict): Servicio de cada recurso (RESOURCE_SERVICES),
+            para los pasos sin 'service'.
+
+    Returns:
+        list: Journey del escenario.
+
+    Raises:
+        ScenarioError: Si el escenario está mal definido.
+    """
+    definitions, default_think = _read_definition(path)
+    default_think = parse_think_time(default_think, str(path)) or DEFAULT_THINK_TIME
+
+    journeys = [
+        item if isinstance(item, Journey) else Journey.from_dict(item)
+        for item in definitions or []
+    ]
+    if not journeys:
+        raise ScenarioError(f"{path}: el escenario no tiene recorridos")
+
+    names = [journey.name for journey in journeys]
+    duplicated = {name for name in names if names.count(name) > 1}
+    if duplicated:
+        raise ScenarioError(f"Recorridos duplicados: {sorted(duplicated)}")
+
+    for journey in journeys:
+        journey.check_variables()
+        if journey.think_time is None:
+            journey.think_time = default_think
+        for step in journey.all_steps():
+            if step.method not in HTTP_METHODS:
+                raise ScenarioError(
+                    f"{journey.name}: método no soportado en {step.name}"
+                )
+            if step.service is None:
+                step.service = _service_for(
+                    _VARIABLE.split(step.endpoint)[0], resource_services
+                )
+            if step.service is None:
+                raise ScenarioError(
+                    f"{journey.name}: no se puede deducir el servicio de {step.endpoint}; "
+                    "indique 'service'"
+                )
+    return journeys
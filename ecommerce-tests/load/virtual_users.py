@@ -0,0 +1,233 @@
+"""
+Ejecución de escenarios con usuarios virtuales (modelo cerrado).
+
+Cada usuario virtual es una tarea de asyncio que, hasta agotar la duración,
+elige un recorrido del escenario según su peso y ejecuta sus pasos uno tras
+otro, con las pausas (think time) entre ellos. A diferencia del motor de
+modelo abierto (load.engine), la carga la fija el número de usuarios: un
+usuario no empieza el paso siguiente hasta recibir la respuesta del actual.
+
+Cada paso se registra como un endpoint 'recorrido › paso' y cada recorrido
+completo con su resultado, para reportar la latencia de ambos.
+"""
+
+import asyncio
+import itertools
+import random
+
+from common.log import get_logger
+from results import LoadRecorder, summarize_load
+from scenarios import builtin_variables, extract_value, render
+
+# Segundos entre los mensajes de progreso
+PROGRESS_INTERVAL = 10.0
+
+_log = get_logger("load.virtual_users")
+
+
+def step_template(journey, step):
+    """Nombre con el que se registra un paso en los resultados."""
+    return f"{journey.name} › {step.name}"
+
+
+class VirtualUserRunner:
+    """
+    Ejecuta una mezcla ponderada de recorridos con N usuarios virtuales.
+    """
+
+    def __init__(
+        self,
+        client,
+        journeys,
+        users,
+        duration,
+        ramp_up=0.0,
+        think_scale=1.0,
+        seed=None,
+        recorder=None,
+    ):
+        """
+        Args:
+            client (GatewayClient): Cliente del API Gateway.
+            journeys (list): Journey del escenario (load.scenarios.load_scenario).
+            users (int): Usuarios virtuales concurrentes.
+            duration (float): Segundos durante los que se inician recorridos,
+                ramp_up incluido; los recorridos en curso terminan (con su
+                limpieza) después.
+            ramp_up (float): Segundos en los que se van incorporando los usuarios.
+            think_scale (float): Factor de las pausas (0 las desactiva).
+            seed (int, optional): Semilla de la mezcla y de las pausas.
+            recorder (LoadRecorder, optional): Registro de resultados.
+        """
+        if not journeys:
+            raise ValueError("No hay recorridos para generar carga")
+        if users < 1:
+            raise ValueError("Se necesita al menos un usuario virtual")
+        self.client = client
+        self.journeys = list(journeys)
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_scale = think_scale
+        self.rng = random.Random(seed)
+        self.recorder = recorder or LoadRecorder()
+        self._cum_weights = list(
+            itertools.accumulate(journey.weight for journey in self.journeys)
+        )
+        self._start = None
+
+    def _elapsed(self):
+        return asyncio.get_running_loop().time() - self._start
+
+    async def _think(self, journey, step, rng):
+        """Pausa del usuario tras un paso (también tras el último, antes del siguiente recorrido)."""
+        low, high = step.think_time or journey.think_time
+        pause = rng.uniform(low, high) * self.think_scale
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def _run_step(self, journey, step, variables, rng):
+        """
+        Envía un paso y guarda las variables que extrae.
+
+        Returns:
+            tuple: (éxito, latencia en segundos).
+        """
+        try:
+            endpoint = render(step.endpoint, variables)
+            body = step.request_body(variables)
+        except KeyError as e:
+            _log.warning(
+                "⚠️ %s: variable %s sin definir", step_template(journey, step), e
+            )
+            return False, 0.0
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = None
+        try:
+            response = await self.client.request(
+                step.service, step.method, endpoint, data=body
+            )
+        except Exception as e:
+            _log.debug("❌ %s %s: %r", step.method, endpoint, e)
+        end = loop.time()
+
+        status = response.status_code if response is not None else None
+        self.recorder.record(
+            step_template(journey, step), status, end - start, end - self._start
+        )
+        if status is None or not step.accepts(status):
+            _log.debug(
+                "❌ %s: %s %s respondió %s",
+                step_template(journey, step),
+                step.method,
+                endpoint,
+                status,
+            )
+            return False, end - start
+
+        if step.extract:
+            try:
+                payload = response.json()
+                for name, path in step.extract.items():
+                    variables[name] = extract_value(payload, path, rng)
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                _log.debug(
+                    "❌ %s: no se pudo extraer %s: %r",
+                    step_template(journey, step),
+                    step.extract,
+                    e,
+                )
+                return False, end - start
+        return True, end - start
+
+    async def _run_cleanup(self, journey, variables, rng):
+        """Ejecuta la limpieza del recorrido; omite los recursos que no se crearon."""
+        for step in journey.cleanup:
+            try:
+                render(step.endpoint, variables)
+                step.request_body(variables)
+            except KeyError:
+                continue
+            ok, _ = await self._run_step(journey, step, variables, rng)
+            if not ok:
+                _log.warning("⚠️ Falló la limpieza %s", step_template(journey, step))
+
+    async def run_journey(self, journey, vu, iteration, rng):
+        """
+        Ejecuta un recorrido completo y lo registra.
+
+        Args:
+            journey (Journey): Recorrido.
+            vu (int): Número del usuario virtual.
+            iteration (int): Recorridos completados por el usuario virtual.
+            rng (random.Random): Generador del usuario virtual.
+
+        Returns:
+            bool: Si todos los pasos tuvieron éxito.
+        """
+        variables = builtin_variables(vu, iteration)
+        variables.update(render(journey.variables, variables))
+
+        start = self._elapsed()
+        active = 0.0
+        ok = True
+        try:
+            for step in journey.steps:
+                ok, latency = await self._run_step(journey, step, variables, rng)
+                active += latency
+                if not ok:
+                    break
+                await self._think(journey, step, rng)
+            duration = self._elapsed() - start
+        finally:
+            await self._run_cleanup(journey, variables, rng)
+        self.recorder.record_journey(journey.name, ok, active, duration)
+        return ok
+
+    async def _user(self, vu, deadline):
+        """Bucle de un usuario virtual."""
+        rng = random.Random(self.rng.random())
+        if self.ramp_up and self.users > 1:
+            await asyncio.sleep(self.ramp_up * vu / self.users)
+
+        iteration = 0
+        while self._elapsed() < deadline:
+            journey = rng.choices(self.journeys, cum_weights=self._cum_weights)[0]
+            await self.run_journey(journey, vu, iteration, rng)
+            iteration += 1
+
+    async def _progress(self):
+        """Informa periódicamente del avance."""
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            runs = sum(stats.count for stats in self.recorder.journeys.values())
+            failures = sum(stats.failures for stats in self.recorder.journeys.values())
+            _log.info(
+                "⏳ %.0fs: %d recorridos, %d fallidos", self._elapsed(), runs, failures
+            )
+
+    async def run(self):
+        """
+        Ejecuta el escenario completo.
+
+        Returns:
+            dict: Resumen de summarize_load() con "journeys" y totals["users"].
+        """
+        self._start = asyncio.get_running_loop().time()
+        deadline = self.duration
+        progress = asyncio.ensure_future(self._progress())
+        try:
+            await asyncio.gather(
+                *(self._user(vu, deadline) for vu in range(self.users))
+            )
+        finally:
+            progress.cancel()
+
+        summary = summarize_load(self.recorder, self._elapsed())
+        summary["totals"]["users"] = self.users
+        summary["totals"]["scenario"] = {
+            journey.name: journey.weight for journey in self.journeys
+        }
+        return summary
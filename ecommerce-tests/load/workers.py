@@ -0,0 +1,251 @@
+"""
+Generación de carga con varios procesos (uno por núcleo).
+
+Un solo proceso de Python usa un único núcleo: con tasas altas el event loop
+se satura, las llegadas salen tarde y el generador, no el sistema, marca el
+límite. run_distributed() reparte el patrón de llegadas entre N procesos
+trabajadores (arrivals.WorkerShare), cada uno con su propio event loop, su
+cliente del API Gateway y sus pools de conexiones, de modo que el throughput
+de una máquina de carga crece casi linealmente con sus núcleos.
+
+Los trabajadores no devuelven un resumen al final: cada STREAM_INTERVAL
+segundos envían por una cola lo que registraron desde el envío anterior
+(LoadRecorder.take_delta(), con los histogramas en forma compacta) y el
+coordinador lo suma en su propio registro a medida que llega. Así el progreso
+se informa con los datos de todos los procesos y el resumen final, percentiles
+incluidos, es el de la carga completa y no una media de resúmenes parciales.
+
+Todos los trabajadores toman como origen del patrón el mismo instante de reloj
+(start_at), por lo que sus líneas de tiempo por segundo coinciden y se suman
+directamente; un proceso que arranca tarde envía de inmediato las llegadas ya
+vencidas y su retraso cuenta en la latencia. El
+token se comparte a través de la caché de common.auth: el primer proceso que
+lo necesita lo obtiene y los demás lo leen del archivo.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import time
+
+from common.histogram import LatencyHistogram
+from common.log import get_logger
+from results import LoadRecorder, summarize_load
+
+# Segundos entre los envíos de cada trabajador al coordinador
+STREAM_INTERVAL = 1.0
+
+# Segundos entre los mensajes de progreso del coordinador
+PROGRESS_INTERVAL = 10.0
+
+# Margen para que los procesos arranquen e importen sus módulos antes de la
+# primera llegada
+STARTUP_DELAY = 3.0
+
+_log = get_logger("load.workers")
+
+
+def resolve_workers(value):
+    """
+    Interpreta el número de procesos trabajadores.
+
+    Args:
+        value (str or int): Número de procesos, o 'auto' para uno por núcleo.
+
+    Returns:
+        int: Número de procesos (al menos 1).
+
+    Raises:
+        ValueError: Si el valor no es 'auto' ni un entero positivo.
+    """
+    if str(value).lower() == "auto":
+        return os.cpu_count() or 1
+    workers = int(value)
+    if workers < 1:
+        raise ValueError("El número de procesos debe ser al menos 1")
+    return workers
+
+
+async def _stream(recorder, results, index):
+    """Envía periódicamente al coordinador lo registrado por el trabajador."""
+    while True:
+        await asyncio.sleep(STREAM_INTERVAL)
+        results.put(("delta", index, recorder.take_delta()))
+
+
+async def _run_worker(index, workers, targets, pattern, options, results, start_at):
+    """Ejecuta la parte del patrón de un trabajador en su propio event loop."""
+    from arrivals import WorkerShare
+    from engine import LoadEngine
+    from run_load_tests import build_client
+
+    seed = options["seed"]
+    recorder = LoadRecorder()
+    client = build_client()
+    try:
+        engine = LoadEngine(
+            client,
+            targets,
+            WorkerShare(pattern, index, workers),
+            max_in_flight=options["max_in_flight"],
+            poisson=options["poisson"],
+            seed=None if seed is None else seed + index,
+            recorder=recorder,
+            progress_interval=None,
+        )
+        # El origen es start_at aunque el proceso arranque tarde: su retraso
+        # cuenta en la latencia en lugar de desplazar su parte del patrón
+        streamer = asyncio.ensure_future(_stream(recorder, results, index))
+        try:
+            summary = await engine.run(start_at)
+        finally:
+            streamer.cancel()
+        results.put(("delta", index, recorder.take_delta()))
+        results.put(("done", index, summary["totals"]["elapsed"]))
+    finally:
+        await client.close()
+
+
+def worker_main(index, workers, targets, pattern, options, results, start_at):
+    """
+    Punto de entrada de un proceso trabajador.
+
+    Args:
+        index (int): Número del trabajador, desde 0.
+        workers (int): Número de trabajadores.
+        targets (list): LoadTarget de la mezcla, preparados por el coordinador.
+        pattern (ArrivalPattern): Patrón completo; el trabajador genera su parte.
+        options (dict): max_in_flight (por trabajador), poisson y seed.
+        results (multiprocessing.Queue): Cola de mensajes hacia el coordinador.
+        start_at (float): Instante (time.time()) de la primera llegada.
+    """
+    from config.config import LOG_CONFIG
+    from common.log import configure_logging, flush_logs
+
+    configure_logging(LOG_CONFIG)
+    try:
+        asyncio.run(
+            _run_worker(index, workers, targets, pattern, options, results, start_at)
+        )
+    except KeyboardInterrupt:
+        results.put(("error", index, "interrumpido (SIGINT)"))
+    except Exception as e:
+        results.put(("error", index, repr(e)))
+    finally:
+        flush_logs()
+
+
+def _report_progress(recorder, elapsed, last_completed):
+    """Informa el progreso de la carga combinada; devuelve las completadas."""
+    completed = sum(stats.count for stats in recorder.endpoints.values())
+    p99 = None
+    if completed:
+        combined = LatencyHistogram()
+        for stats in recorder.endpoints.values():
+            combined.merge(stats.latency)
+        p99 = combined.value_at_percentile(99) * 1000
+    _log.info(
+        "⏳ %.0fs: %d llegadas, %d completadas (%.0f sol/s en el intervalo), "
+        "%d descartadas, p99 %s",
+        elapsed,
+        recorder.scheduled,
+        completed,
+        (completed - last_completed) / PROGRESS_INTERVAL,
+        recorder.dropped,
+        "-" if p99 is None else f"{p99:.0f} ms",
+    )
+    return completed
+
+
+def _stop(processes):
+    """Termina los trabajadores que sigan vivos."""
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=5)
+
+
+def run_distributed(targets, pattern, workers, max_in_flight, poisson=False, seed=None):
+    """
+    Ejecuta un patrón de llegadas repartido entre varios procesos.
+
+    Args:
+        targets (list): LoadTarget de la mezcla.
+        pattern (ArrivalPattern): Patrón de llegadas completo.
+        workers (int): Número de procesos trabajadores.
+        max_in_flight (int): Solicitudes en vuelo máximas en total; cada
+            trabajador admite su parte.
+        poisson (bool): Llegadas de Poisson en lugar de regulares.
+        seed (int, optional): Semilla base; el trabajador i usa seed + i.
+
+    Returns:
+        dict: Resumen de summarize_load() de la carga completa, con
+            totals["workers"].
+
+    Raises:
+        RuntimeError: Si algún trabajador falla o termina inesperadamente.
+    """
+    # spawn en lugar de fork: cada trabajador arranca sin el estado (event
+    # loop, sesiones, hilos de log) del coordinador
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    options = {
+        "max_in_flight": math.ceil(max_in_flight / workers),
+        "poisson": poisson,
+        "seed": seed,
+    }
+    start_at = time.time() + STARTUP_DELAY
+    processes = [
+        context.Process(
+            target=worker_main,
+            args=(index, workers, targets, pattern, options, results, start_at),
+            name=f"load-worker-{index}",
+            daemon=True,
+        )
+        for index in range(workers)
+    ]
+    _log.info("🧵 Iniciando %d procesos generadores", workers)
+    for process in processes:
+        process.start()
+
+    recorder = LoadRecorder()
+    pending = set(range(workers))
+    elapsed = 0.0
+    next_progress = PROGRESS_INTERVAL
+    last_completed = 0
+    try:
+        while pending:
+            try:
+                kind, index, payload = results.get(timeout=STREAM_INTERVAL)
+            except queue.Empty:
+                # Un proceso que ya terminó tiene sus mensajes en la cola: si
+                # no llegó su "done", terminó sin completar su parte
+                for index in pending:
+                    exitcode = processes[index].exitcode
+                    if exitcode is not None:
+                        raise RuntimeError(
+                            f"El proceso generador {index} terminó (código {exitcode}) "
+                            "sin completar su parte de la carga"
+                        )
+            else:
+                if kind == "delta":
+                    recorder.merge_delta(payload)
+                elif kind == "done":
+                    pending.discard(index)
+                    elapsed = max(elapsed, payload)
+                else:
+                    raise RuntimeError(f"Falló el proceso generador {index}: {payload}")
+
+            running = time.time() - start_at
+            if running >= next_progress:
+                last_completed = _report_progress(recorder, running, last_completed)
+                next_progress += PROGRESS_INTERVAL
+    finally:
+        _stop(processes)
+
+    summary = summarize_load(recorder, elapsed, pattern)
+    summary["totals"]["workers"] = workers
+    return summary
@@ -0,0 +1,15 @@
+"""
+Configuración de las pruebas unitarias del arnés.
+
+Estas pruebas no necesitan el stack de microservicios: ejercitan los módulos
+de ecommerce-tests/common (y los de load) con datos en memoria.
+"""
+
+import sys
+from pathlib import Path
+
+# Permite importar el paquete compartido ecommerce-tests/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Los módulos de load se importan sin paquete, como hacen sus scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "load"))
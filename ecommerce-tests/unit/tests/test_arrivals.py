@@ -0,0 +1,68 @@
+"""
+Pruebas unitarias del reparto de llegadas entre procesos (load/arrivals.py).
+"""
+
+import random
+
+import pytest
+
+from arrivals import ConstantRate, Ramp, WorkerShare, parse_stages
+
+PATTERNS = [
+    ConstantRate(50, 10),
+    Ramp(0, 80, 15),
+    parse_stages("0-40:5,40:10,40-0:5"),
+]
+
+
+class TestWorkerShare:
+    """
+    Las partes de los trabajadores suman exactamente el patrón completo.
+    """
+
+    @pytest.mark.parametrize("pattern", PATTERNS, ids=lambda p: p.describe())
+    @pytest.mark.parametrize("workers", [1, 2, 3, 7])
+    def test_parts_reassemble_full_sequence(self, pattern, workers):
+        """La unión ordenada de las partes es la secuencia regular completa."""
+        full = list(pattern.arrivals())
+        parts = [
+            list(WorkerShare(pattern, index, workers).arrivals())
+            for index in range(workers)
+        ]
+
+        assert sorted(offset for part in parts for offset in part) == full
+        # Sin solapes: cada llegada pertenece a un único trabajador
+        assert sum(len(part) for part in parts) == len(full)
+        # Cada parte está ordenada y toma una de cada N llegadas
+        for index, part in enumerate(parts):
+            assert part == sorted(part)
+            assert part == full[index::workers]
+
+    def test_poisson_parts_keep_the_total_rate(self):
+        """Con Poisson, cada parte genera en promedio 1/N de las llegadas."""
+        pattern = ConstantRate(200, 50)
+        workers = 4
+        counts = [
+            sum(
+                1
+                for _ in WorkerShare(pattern, index, workers).arrivals(
+                    True, random.Random(index)
+                )
+            )
+            for index in range(workers)
+        ]
+
+        assert sum(counts) == pytest.approx(pattern.total(), rel=0.05)
+
+    def test_rate_and_expected_are_divided(self):
+        """La tasa y las llegadas esperadas de una parte son 1/N del total."""
+        pattern = Ramp(0, 80, 15)
+        share = WorkerShare(pattern, 1, 4)
+
+        assert share.rate(7.5) == pytest.approx(pattern.rate(7.5) / 4)
+        assert share.total() == pytest.approx(pattern.total() / 4)
+
+    def test_invalid_index(self):
+        """El índice del trabajador debe estar entre 0 y workers-1."""
+        with pytest.raises(ValueError):
+            WorkerShare(ConstantRate(10, 1), 2, 2)
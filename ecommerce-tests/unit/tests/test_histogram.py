@@ -0,0 +1,122 @@
+"""
+Pruebas unitarias de los histogramas de latencia (common/histogram.py).
+"""
+
+import json
+import math
+import random
+
+import pytest
+
+from common.histogram import LatencyHistogram
+
+
+def exact_percentile(values, percentile):
+    """Percentil exacto por el método del rango más cercano."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(percentile / 100 * len(ordered))) - 1]
+
+
+@pytest.fixture
+def latencies():
+    """Latencias log-normales de 1 ms a unos segundos, reproducibles."""
+    rng = random.Random(42)
+    return [rng.lognormvariate(math.log(0.05), 1.2) for _ in range(20_000)]
+
+
+class TestAccuracy:
+    """
+    Los percentiles tienen el error relativo de la precisión configurada.
+    """
+
+    @pytest.mark.parametrize("significant_figures", [2, 3])
+    def test_percentiles_within_relative_error(self, latencies, significant_figures):
+        """p50 a p99.99 difieren del exacto menos de 10^-cifras (más 1 µs)."""
+        histogram = LatencyHistogram(significant_figures)
+        for seconds in latencies:
+            histogram.record(seconds)
+
+        tolerance = 10**-significant_figures
+        for percentile in (50, 90, 99, 99.9, 99.99):
+            exact = exact_percentile(latencies, percentile)
+            measured = histogram.value_at_percentile(percentile)
+            assert abs(measured - exact) <= exact * tolerance + 1e-6
+
+    def test_exact_totals(self, latencies):
+        """Cuenta, media, mínimo y máximo no se aproximan (salvo el redondeo a µs)."""
+        histogram = LatencyHistogram()
+        for seconds in latencies:
+            histogram.record(seconds)
+
+        assert histogram.count == len(latencies)
+        assert histogram.mean == pytest.approx(sum(latencies) / len(latencies))
+        assert histogram.min == pytest.approx(min(latencies), abs=1e-6)
+        assert histogram.max == pytest.approx(max(latencies), abs=1e-6)
+        assert histogram.value_at_percentile(100) == histogram.max
+
+    def test_empty(self):
+        """Un histograma vacío no tiene percentiles ni resumen."""
+        histogram = LatencyHistogram()
+
+        assert histogram.value_at_percentile(99) is None
+        assert histogram.summary_ms([99]) is None
+
+
+class TestMerge:
+    """
+    Combinar histogramas equivale a registrar todas las latencias en uno.
+    """
+
+    def test_merge_equals_single_histogram(self, latencies):
+        """Los percentiles de los histogramas combinados son los del total."""
+        single = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(4)]
+        for i, seconds in enumerate(latencies):
+            single.record(seconds)
+            parts[i % 4].record(seconds)
+
+        merged = LatencyHistogram()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.counts == single.counts
+        assert merged.count == single.count
+        assert merged.summary_ms([50, 99, 99.9]) == single.summary_ms([50, 99, 99.9])
+
+    def test_merge_requires_same_precision(self):
+        """No se combinan histogramas con distinta precisión."""
+        with pytest.raises(ValueError):
+            LatencyHistogram(3).merge(LatencyHistogram(2))
+
+
+class TestSerialization:
+    """
+    to_dict() y from_dict() conservan el histograma completo.
+    """
+
+    def test_round_trip(self, latencies):
+        """El histograma reconstruido (incluso pasando por JSON) es equivalente."""
+        histogram = LatencyHistogram()
+        for seconds in latencies:
+            histogram.record(seconds)
+
+        restored = LatencyHistogram.from_dict(
+            json.loads(json.dumps(histogram.to_dict()))
+        )
+
+        assert restored.counts == histogram.counts
+        assert restored.count == histogram.count
+        assert (restored.mean, restored.min, restored.max) == (
+            histogram.mean,
+            histogram.min,
+            histogram.max,
+        )
+        assert restored.summary_ms([50, 99.99]) == histogram.summary_ms([50, 99.99])
+
+    def test_round_trip_empty(self):
+        """Un histograma vacío se reconstruye vacío y se puede seguir usando."""
+        restored = LatencyHistogram.from_dict(LatencyHistogram().to_dict())
+
+        assert restored.count == 0
+        restored.record(0.01)
+        assert restored.value_at_percentile(50) == pytest.approx(0.01, rel=1e-3)
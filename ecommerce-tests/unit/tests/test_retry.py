@@ -0,0 +1,112 @@
+"""
+Pruebas unitarias de la política de reintentos (common/retry.py).
+"""
+
+import asyncio
+
+from common.retry import RetryBudget, RetryPolicy
+
+
+class FakeResponse:
+    """Respuesta mínima con el estado y los métodos que usa la política."""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.closed = False
+        self.released = False
+
+    def close(self):
+        self.closed = True
+
+    def release(self):
+        self.released = True
+
+
+def make_policy(budget, max_attempts=3):
+    """Política sin esperas reales, para que las pruebas sean instantáneas."""
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        base_delay=0,
+        max_delay=0,
+        budget=budget,
+        sleep=lambda delay: None,
+    )
+
+
+class TestRetryBudget:
+    """
+    El presupuesto limita los reintentos a min_retries + ratio * solicitudes.
+    """
+
+    def test_budget_exhaustion_stops_retries(self):
+        """Agotado el presupuesto, los fallos se devuelven sin reintentar."""
+        budget = RetryBudget(ratio=0, min_retries=2)
+        policy = make_policy(budget)
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            return FakeResponse(503)
+
+        for _ in range(3):
+            assert policy.execute("GET", send).status_code == 503
+
+        # 1.ª solicitud: 3 intentos (2 reintentos); el resto, sin presupuesto
+        assert len(attempts) == 5
+        assert budget.stats() == {"requests": 3, "retries": 2, "denied": 2}
+
+    def test_budget_refills_with_new_requests(self):
+        """Cada solicitud nueva añade ratio reintentos al presupuesto."""
+        budget = RetryBudget(ratio=0.5, min_retries=0)
+
+        assert not budget.try_spend()
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        assert budget.stats() == {"requests": 2, "retries": 1, "denied": 2}
+
+    def test_no_retry_for_non_idempotent_response(self):
+        """Un POST que recibió respuesta no se repite ni consume presupuesto."""
+        budget = RetryBudget(ratio=0, min_retries=10)
+        policy = make_policy(budget)
+
+        assert policy.execute("POST", lambda: FakeResponse(503)).status_code == 503
+        assert budget.stats()["retries"] == 0
+
+
+class TestExecuteAsync:
+    """
+    execute_async() aplica la misma política que execute().
+    """
+
+    def test_discarded_responses_are_released(self):
+        """Las respuestas de los intentos descartados se liberan antes de esperar."""
+        policy = make_policy(RetryBudget(ratio=0, min_retries=10))
+        responses = [FakeResponse(503), FakeResponse(503), FakeResponse(200)]
+        pending = iter(responses)
+
+        async def send():
+            return next(pending)
+
+        result = asyncio.run(policy.execute_async("GET", send))
+
+        assert result is responses[2]
+        assert [response.released for response in responses] == [True, True, False]
+
+    def test_budget_exhaustion_async(self):
+        """El presupuesto también se agota con execute_async()."""
+        budget = RetryBudget(ratio=0, min_retries=1)
+        policy = make_policy(budget)
+
+        async def send():
+            return FakeResponse(502)
+
+        async def run():
+            return [await policy.execute_async("GET", send) for _ in range(2)]
+
+        asyncio.run(run())
+
+        # 1.ª solicitud: 1 reintento y 1 denegado; la 2.ª, denegado al primer fallo
+        assert budget.stats() == {"requests": 2, "retries": 1, "denied": 2}
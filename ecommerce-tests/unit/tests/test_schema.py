@@ -0,0 +1,63 @@
+"""
+Pruebas unitarias de los esquemas compilados (common/schema.py).
+"""
+
+import pytest
+from common.schema import CompiledSchema, SchemaValidationError
+
+
+class TestFirstError:
+    """
+    first_error() debe informar el primer elemento inválido de la colección,
+    sea cual sea la columna en la que se detecta el fallo.
+    """
+
+    def setup_method(self):
+        """Esquema de dos columnas para las pruebas."""
+        self.schema = CompiledSchema({"a": int, "b": str})
+
+    def test_valid_collection(self):
+        """Una colección válida no tiene errores."""
+        assert (
+            self.schema.first_error([{"a": 1, "b": "x"}, {"a": 2, "b": None}]) is None
+        )
+
+    def test_type_error_before_missing_key(self):
+        """Un error de tipo anterior tiene prioridad sobre una clave que falta después."""
+        error = self.schema.first_error([{"a": 1, "b": 2}, {"b": "x"}])
+
+        assert error[:2] == (0, "b")
+
+    def test_missing_key_before_type_error(self):
+        """Una clave que falta antes tiene prioridad sobre un error de tipo posterior."""
+        error = self.schema.first_error([{"b": "x"}, {"a": 1, "b": 2}])
+
+        assert error[:2] == (0, "a")
+
+    def test_earliest_type_error_across_columns(self):
+        """Entre columnas, gana el error de tipo con el índice más bajo."""
+        error = self.schema.first_error(
+            [{"a": 1, "b": "x"}, {"a": 1, "b": 2}, {"a": "y", "b": "x"}]
+        )
+
+        assert error[:2] == (1, "b")
+
+    def test_non_dict_item(self):
+        """Un elemento que no es un objeto es un fallo en su posición."""
+        schema = CompiledSchema({"a": int, "b": str}, optional=["b"])
+
+        error = schema.first_error([{"a": 1}, {"a": 1, "b": 3}, "texto"])
+
+        assert error[0] == 1
+
+        error = schema.first_error([{"a": 1}, "texto", {"a": 1, "b": 3}])
+
+        assert error[:2] == (1, None)
+
+    def test_validate_items_reports_index(self):
+        """validate_items() lanza SchemaValidationError con el índice del fallo."""
+        with pytest.raises(SchemaValidationError) as error:
+            self.schema.validate_items([{"a": 1, "b": 2}, {"b": "x"}])
+
+        assert error.value.index == 0
+        assert error.value.key == "b"
@@ -0,0 +1,135 @@
+"""
+Pruebas unitarias de los timeouts aprendidos (common/timeouts.py).
+"""
+
+import json
+
+import pytest
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from common.timeouts import AdaptiveTimeouts, endpoint_template, is_read_timeout
+
+TEMPLATE = "user-service GET /api/users/{id}"
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    """Ruta de un historial vacío."""
+    return str(tmp_path / "latency-history.json")
+
+
+def make_timeouts(history_path, target="http://localhost:8222", **config):
+    """Timeouts activados con un historial propio y pocas muestras necesarias."""
+    return AdaptiveTimeouts(
+        2.0,
+        {
+            "enabled": True,
+            "history_path": history_path,
+            "target": target,
+            "min_samples": 5,
+            **config,
+        },
+    )
+
+
+class TestEndpointTemplate:
+    """
+    Los segmentos con dígitos se agrupan como {id}.
+    """
+
+    def test_ids_are_replaced(self):
+        """IDs numéricos, fechas y parámetros de consulta no crean plantillas nuevas."""
+        assert (
+            endpoint_template(
+                "favourite-service", "get", "/api/favourites/1/2/10-06-2025?x=1"
+            )
+            == "favourite-service GET /api/favourites/{id}/{id}/{id}"
+        )
+
+
+class TestAdaptiveTimeouts:
+    """
+    El timeout de lectura se aprende del historial de cada destino.
+    """
+
+    def test_disabled_by_default(self, history_path):
+        """Sin activarlos, se usa siempre el timeout global y no se guarda historial."""
+        timeouts = AdaptiveTimeouts(2.0, {"history_path": history_path})
+        timeouts.record(TEMPLATE, 0.1)
+        timeouts.save()
+
+        assert timeouts.timeout_for(TEMPLATE)[1] == 2.0
+        with pytest.raises(FileNotFoundError):
+            open(history_path)
+
+    def test_learns_percentile_times_multiplier(self, history_path):
+        """Con historial suficiente, el timeout es p99 x 3, con un mínimo de 1 s."""
+        timeouts = make_timeouts(history_path)
+        for _ in range(10):
+            timeouts.record(TEMPLATE, 0.5)
+        timeouts.record("user-service GET /api/users", 0.01)
+        timeouts.save()
+
+        learned = make_timeouts(history_path)
+
+        assert learned.timeout_for(TEMPLATE)[1] == 1.5
+        # Menos de min_samples: timeout global
+        assert learned.timeout_for("user-service GET /api/users")[1] == 2.0
+
+    def test_history_is_keyed_by_target(self, history_path):
+        """Las muestras de un destino no fijan los timeouts de otro."""
+        local = make_timeouts(history_path, target="http://localhost:8222")
+        for _ in range(10):
+            local.record(TEMPLATE, 0.5)
+        local.save()
+
+        assert make_timeouts(history_path).timeout_for(TEMPLATE)[1] == 1.5
+        staging = make_timeouts(history_path, target="http://staging:8222")
+        assert staging.timeout_for(TEMPLATE)[1] == 2.0
+
+        with open(history_path, encoding="utf-8") as history_file:
+            assert list(json.load(history_file)) == ["http://localhost:8222"]
+
+    def test_timeouts_widen_the_learned_timeout(self, history_path):
+        """Los intentos cortados por timeout cuentan con el timeout como duración."""
+        timeouts = make_timeouts(history_path)
+        for _ in range(10):
+            timeouts.record(TEMPLATE, 0.1)
+
+        def send():
+            raise requests.exceptions.ReadTimeout()
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            timeouts.track(TEMPLATE, send)()
+        timeouts.save()
+
+        # El p99 pasa a ser el timeout usado (2 s), que se multiplica por 3
+        assert make_timeouts(history_path).timeout_for(TEMPLATE)[1] == 6.0
+
+    def test_legacy_history_is_ignored(self, history_path):
+        """Un historial sin destino (formato anterior) no se usa."""
+        with open(history_path, "w", encoding="utf-8") as history_file:
+            json.dump({TEMPLATE: [0.1] * 10}, history_file)
+
+        assert make_timeouts(history_path).learned() == {}
+
+
+class TestIsReadTimeout:
+    """
+    Solo los timeouts de lectura indican la latencia del endpoint.
+    """
+
+    def test_read_timeouts(self):
+        """ReadTimeout y un timeout al leer en streaming son timeouts de lectura."""
+        assert is_read_timeout(requests.exceptions.ReadTimeout())
+        assert is_read_timeout(
+            requests.exceptions.ConnectionError(
+                ReadTimeoutError(None, "/api/users", "Read timed out.")
+            )
+        )
+
+    def test_connect_timeouts(self):
+        """Un timeout de conexión no cuenta."""
+        assert not is_read_timeout(requests.exceptions.ConnectTimeout())
+        assert not is_read_timeout(requests.exceptions.ConnectionError())